@@ -0,0 +1,42 @@
+"""
+Benchmark the named operand and result accessors of IRDL operations.
+
+Each accessor is read repeatedly on a single operation: a non-variadic
+operand of `arith.addi`, the variadic operands of `func.call`, and the
+variadic operands of `cf.cond_br`, whose sizes are given by an
+`operand_segment_sizes` attribute.
+
+Usage: python bench/accessor_bench.py [num_accesses ...]
+"""
+
+import sys
+import timeit
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import i1, i32
+from xdsl.dialects.cf import ConditionalBranch
+from xdsl.dialects.func import Call
+from xdsl.ir import Block
+
+
+def main(sizes):
+    cst = Constant.from_int_constant(0, i32)
+    cond = Constant.from_int_constant(1, i1)
+    addi = Addi.get(cst, cst)
+    call = Call.get("f", [[cst, cst, cst]], [[i32]])
+    cond_br = ConditionalBranch.get(cond, Block(), [cst, cst], Block(), [cst])
+
+    accessors = [
+        ("addi.input2", lambda: addi.input2),
+        ("call.arguments", lambda: call.arguments),
+        ("cond_br.else_arguments", lambda: cond_br.else_arguments),
+    ]
+    print(f"{'accesses':>9} {'accessor':>24} {'time (s)':>9}")
+    for num_accesses in sizes:
+        for name, access in accessors:
+            time = timeit.timeit(access, number=num_accesses)
+            print(f"{num_accesses:>9} {name:>24} {time:>9.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000000])
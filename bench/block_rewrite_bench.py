@@ -0,0 +1,62 @@
+"""
+Benchmark rewriting every operation of a large single-block module.
+
+Each `arith.addi` of a long chain is replaced by an `arith.muli`, first
+directly through `Rewriter.replace_op`, then through a
+`PatternRewriteWalker`. Both used to be quadratic in the block size.
+
+Usage: python bench/block_rewrite_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+
+from xdsl.dialects.arith import Addi, Constant, Muli
+from xdsl.dialects.builtin import ModuleOp, i32
+from xdsl.ir import Operation
+from xdsl.pattern_rewriter import (PatternRewriter, PatternRewriteWalker,
+                                   RewritePattern)
+from xdsl.rewriter import Rewriter
+
+
+def build_module(num_ops: int) -> ModuleOp:
+    cst = Constant.from_int_constant(1, i32)
+    ops = [cst]
+    for _ in range(num_ops):
+        ops.append(Addi.get(ops[-1], cst))
+    return ModuleOp.from_region_or_ops(ops)
+
+
+def rewrite_with_rewriter(module: ModuleOp) -> None:
+    for op in list(module.ops):
+        if isinstance(op, Addi):
+            Rewriter.replace_op(op, Muli.get(op.input1, op.input2))
+
+
+class AddiToMuli(RewritePattern):
+
+    def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
+        if isinstance(op, Addi):
+            rewriter.replace_matched_op(Muli.get(op.input1, op.input2))
+
+
+def rewrite_with_walker(module: ModuleOp) -> None:
+    PatternRewriteWalker(AddiToMuli(),
+                         apply_recursively=False).rewrite_module(module)
+
+
+def time_rewrite(num_ops: int, rewrite) -> float:
+    module = build_module(num_ops)
+    return timeit.timeit(lambda: rewrite(module), number=1)
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'Rewriter (s)':>14} {'Walker (s)':>12}")
+    for num_ops in sizes:
+        rewriter_time = time_rewrite(num_ops, rewrite_with_rewriter)
+        walker_time = time_rewrite(num_ops, rewrite_with_walker)
+        print(f"{num_ops:>8} {rewriter_time:>14.3f} {walker_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000, 50000])
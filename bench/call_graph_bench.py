@@ -0,0 +1,44 @@
+"""
+Benchmark building the call graph of a large module.
+
+The module of `symbol_table_bench.py` has `num_funcs` functions forming a
+single cycle of calls. The call graph and its strongly connected components
+are built, then queried again as a later pass would, and updated after a
+call is removed.
+
+Usage: python bench/call_graph_bench.py [num_funcs ...]
+"""
+
+import sys
+import timeit
+
+from symbol_table_bench import build_module
+from xdsl.call_graph import CallGraph
+
+
+def main(sizes):
+    print(f"{'funcs':>7} {'build (s)':>10} {'sccs (s)':>9} "
+          f"{'cached (s)':>11} {'update (s)':>11}")
+    for num_funcs in sizes:
+        module = build_module(num_funcs)
+        build_time = timeit.timeit(lambda: CallGraph.get(module), number=1)
+        graph = CallGraph.get(module)
+        sccs_time = timeit.timeit(graph.get_sccs, number=1)
+        assert len(graph.get_sccs()) == 1
+        cached_time = min(
+            timeit.repeat(lambda: CallGraph.get(module).get_sccs(),
+                          number=1,
+                          repeat=3))
+
+        func = graph.get_functions()[0]
+        call = graph.get_calls(func)[0]
+        start = timeit.default_timer()
+        func.body.blocks[0].erase_op(call)
+        assert len(graph.get_sccs()) == num_funcs
+        update_time = timeit.default_timer() - start
+        print(f"{num_funcs:>7} {build_time:>10.3f} {sccs_time:>9.3f} "
+              f"{cached_time:>11.6f} {update_time:>11.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,45 @@
+"""
+Benchmark cloning a large module.
+
+In the arith-heavy module of `printer_bench.py`, the module is cloned with
+`Operation.clone`, and compared to a round trip through the textual
+format, which was the only way to copy a module with its regions.
+
+Usage: python bench/clone_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+from io import StringIO
+
+from printer_bench import build_module
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import Builtin
+from xdsl.ir import MLContext
+from xdsl.parser import Parser
+from xdsl.printer import Printer
+
+
+def round_trip(ctx, module) -> None:
+    stream = StringIO()
+    Printer(stream=stream).print_op(module)
+    Parser(ctx, stream.getvalue()).parse_op()
+
+
+def main(sizes):
+    ctx = MLContext()
+    Builtin(ctx)
+    Arith(ctx)
+
+    print(f"{'ops':>8} {'clone (s)':>10} {'round trip (s)':>15}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        clone_time = min(
+            timeit.repeat(lambda: module.clone(), number=1, repeat=3))
+        round_trip_time = timeit.timeit(lambda: round_trip(ctx, module),
+                                        number=1)
+        print(f"{num_ops:>8} {clone_time:>10.3f} {round_trip_time:>15.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000])
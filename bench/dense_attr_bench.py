@@ -0,0 +1,62 @@
+"""
+Benchmark the memory and time used by a large dense constant table.
+
+A `DenseIntOrFPElementsAttr` of `num_elements` distinct i32 values is
+created, printed, and parsed back.
+
+Usage: python bench/dense_attr_bench.py [num_elements ...]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from io import StringIO
+
+from xdsl.dialects.builtin import (Builtin, DenseIntOrFPElementsAttr,
+                                   TensorType, i32)
+from xdsl.ir import MLContext
+from xdsl.parser import Parser
+from xdsl.printer import Printer
+
+
+def build_attr(num_elements: int) -> DenseIntOrFPElementsAttr:
+    typ = TensorType.from_type_and_list(i32, [num_elements])
+    return DenseIntOrFPElementsAttr.from_list(typ, list(range(num_elements)))
+
+
+def main(sizes):
+    ctx = MLContext()
+    Builtin(ctx)
+
+    print(f"{'elements':>9} {'memory (MB)':>12} {'build (s)':>10} "
+          f"{'print (s)':>10} {'parse (s)':>10}")
+    for num_elements in sizes:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        attr = build_attr(num_elements)
+        build_time = time.perf_counter() - start
+        gc.collect()
+        memory = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+
+        stream = StringIO()
+        start = time.perf_counter()
+        printer = Printer(stream=stream)
+        printer.print_attribute(attr)
+        printer.flush()
+        print_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = Parser(ctx, stream.getvalue()).parse_attribute()
+        parse_time = time.perf_counter() - start
+        assert parsed == attr
+
+        print(f"{num_elements:>9} {memory:>12.1f} {build_time:>10.2f} "
+              f"{print_time:>10.2f} {parse_time:>10.2f}")
+        del attr, parsed
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000])
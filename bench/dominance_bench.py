@@ -0,0 +1,60 @@
+"""
+Benchmark the dominance analysis of a large control-flow graph.
+
+The region is a chain of `num_diamonds` diamonds, each made of a
+conditional branch to two blocks joining in the next diamond. Every block
+is queried for its dominance over the last block, and for its dominance
+frontier.
+
+Usage: python bench/dominance_bench.py [num_diamonds ...]
+"""
+
+import sys
+import timeit
+
+from xdsl.dialects.builtin import i1
+from xdsl.dialects.cf import Branch, ConditionalBranch
+from xdsl.dominance import DominanceInfo
+from xdsl.ir import Block, Region
+
+
+def build_region(num_diamonds: int) -> Region:
+    entry = Block.from_arg_types([i1])
+    cond = entry.args[0]
+    blocks = [entry]
+    head = entry
+    for _ in range(num_diamonds):
+        then_block, else_block, join = Block(), Block(), Block()
+        head.add_op(ConditionalBranch.get(cond, then_block, [], else_block,
+                                          []))
+        then_block.add_op(Branch.get(join))
+        else_block.add_op(Branch.get(join))
+        blocks += [then_block, else_block, join]
+        head = join
+    return Region.from_block_list(blocks)
+
+
+def main(sizes):
+    print(f"{'blocks':>7} {'tree (s)':>9} {'dominates (s)':>14} "
+          f"{'frontiers (s)':>14}")
+    for num_diamonds in sizes:
+        region = build_region(num_diamonds)
+        dom = DominanceInfo(region)
+        tree_time = timeit.timeit(lambda: dom.get_idom(region.blocks[-1]),
+                                  number=1)
+        last = region.blocks[-1]
+        dominates_time = timeit.timeit(
+            lambda: sum(dom.dominates(block, last) for block in region.blocks),
+            number=1)
+        assert sum(dom.dominates(block, last)
+                   for block in region.blocks) == num_diamonds + 1
+        frontiers_time = timeit.timeit(
+            lambda:
+            [dom.get_dominance_frontier(block) for block in region.blocks],
+            number=1)
+        print(f"{len(region.blocks):>7} {tree_time:>9.3f} "
+              f"{dominates_time:>14.3f} {frontiers_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
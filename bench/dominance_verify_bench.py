@@ -0,0 +1,41 @@
+"""
+Benchmark the verification of the dominance of uses in a large module.
+
+The module of `verify_bench.py` is verified, and the dominance of its uses
+is checked. The dominance of the uses of the multi-block region of
+`dominance_bench.py`, with the same number of operations, is also checked.
+
+Usage: python bench/dominance_verify_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+
+from dominance_bench import build_region
+from verify_bench import build_module
+from xdsl.dialects.builtin import ModuleOp
+from xdsl.dominance import verify_dominance
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'verify (s)':>11} {'dominance (s)':>14} "
+          f"{'cfg dominance (s)':>18}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        verify_time = timeit.timeit(module.verify, number=1)
+        dominance_time = min(
+            timeit.repeat(lambda: verify_dominance(module), number=1,
+                          repeat=3))
+
+        # Each diamond has 4 operations
+        cfg_module = ModuleOp.from_region_or_ops(build_region(num_ops // 4))
+        cfg_dominance_time = min(
+            timeit.repeat(lambda: verify_dominance(cfg_module),
+                          number=1,
+                          repeat=3))
+        print(f"{num_ops:>8} {verify_time:>11.2f} {dominance_time:>14.2f} "
+              f"{cfg_dominance_time:>18.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
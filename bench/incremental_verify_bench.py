@@ -0,0 +1,44 @@
+"""
+Benchmark verifying a large module after a small local rewrite.
+
+The module is the one of `verify_bench.py`. After a full verification, a
+few `arith.addi` operations are replaced by `arith.muli` operations, and
+the module is verified again, either entirely or incrementally.
+
+Usage: python bench/incremental_verify_bench.py [num_ops ...]
+"""
+
+import sys
+import time
+
+from verify_bench import build_module
+from xdsl.dialects.arith import Addi, Muli
+from xdsl.rewriter import Rewriter
+
+
+def rewrite_some_ops(module, num_rewrites: int) -> None:
+    addis = [op for op in module.ops if isinstance(op, Addi)][:num_rewrites]
+    for addi in addis:
+        Rewriter.replace_op(addi, Muli.get(addi.input1, addi.input2))
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'full (s)':>9} {'incremental (s)':>16}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        module.verify()
+
+        rewrite_some_ops(module, 10)
+        start = time.perf_counter()
+        module.verify()
+        full_time = time.perf_counter() - start
+
+        rewrite_some_ops(module, 10)
+        start = time.perf_counter()
+        module.verify_incremental()
+        incremental_time = time.perf_counter() - start
+        print(f"{num_ops:>8} {full_time:>9.2f} {incremental_time:>16.4f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,36 @@
+"""
+Benchmark the memory used by the IR of a large module.
+
+The arith-heavy module of `printer_bench.py`, alternating `arith.constant`
+and `arith.addi` operations, is built while tracing allocations, and the
+memory it occupies is reported per operation.
+
+Usage: python bench/memory_bench.py [num_ops ...]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from printer_bench import build_module
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'memory (MB)':>12} {'bytes/op':>9} {'build (s)':>10}")
+    for num_ops in sizes:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        module = build_module(num_ops)
+        build_time = time.perf_counter() - start
+        gc.collect()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{num_ops:>8} {memory / 1e6:>12.1f} {memory / num_ops:>9.0f} "
+              f"{build_time:>10.2f}")
+        del module
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,48 @@
+"""
+Benchmark looking up the operations of a kind in a large module.
+
+The `func.call` operations of the module of `verify_bench.py` are listed
+with a generator walk, and with the operation index of the module. The
+time to build the index, and the time to erase and reinsert every
+operation with and without the index, are also reported.
+
+Usage: python bench/op_index_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+
+from verify_bench import build_module
+from xdsl.dialects.func import Call
+
+
+def reinsert_ops(module) -> None:
+    block = module.body.blocks[0]
+    for op in list(block.ops):
+        block.detach_op(op)
+        block.add_op(op)
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'walk (s)':>9} {'index (s)':>10} {'build (s)':>10} "
+          f"{'edit (s)':>9} {'indexed edit (s)':>17}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        walk_time = min(
+            timeit.repeat(lambda: list(module.walk(Call)), number=1, repeat=3))
+        edit_time = min(
+            timeit.repeat(lambda: reinsert_ops(module), number=1, repeat=3))
+
+        build_time = timeit.timeit(module.get_op_index, number=1)
+        assert module.get_ops(Call) == list(module.walk(Call))
+        index_time = min(
+            timeit.repeat(lambda: module.get_ops(Call), number=1, repeat=3))
+        indexed_edit_time = min(
+            timeit.repeat(lambda: reinsert_ops(module), number=1, repeat=3))
+        print(f"{num_ops:>8} {walk_time:>9.3f} {index_time:>10.4f} "
+              f"{build_time:>10.3f} {edit_time:>9.3f} "
+              f"{indexed_edit_time:>17.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,53 @@
+"""
+Benchmark verifying a module of many functions in parallel.
+
+The module contains `num_funcs` functions, each one a chain of 50
+`arith.addi` operations. It is verified sequentially, and with
+`verify_parallel` using each number of workers given after `--workers`.
+
+Usage: python bench/parallel_verify_bench.py [num_funcs ...] [--workers N ...]
+"""
+
+import sys
+import timeit
+
+from xdsl.dialects.arith import Addi
+from xdsl.dialects.builtin import ModuleOp, i32
+from xdsl.dialects.func import FuncOp, Return
+from xdsl.parallel_verifier import verify_parallel
+
+
+def build_func(idx: int) -> FuncOp:
+
+    def body(arg):
+        ops = [Addi.get(arg, arg)]
+        for _ in range(49):
+            ops.append(Addi.get(ops[-1], arg))
+        return ops + [Return.get(ops[-1])]
+
+    return FuncOp.from_callable(f"f{idx}", [i32], [i32], body)
+
+
+def main(sizes, workers):
+    print(f"{'funcs':>7} {'sequential (s)':>15} " +
+          " ".join(f"{f'{n} workers (s)':>15}" for n in workers))
+    for num_funcs in sizes:
+        module = ModuleOp.from_region_or_ops(
+            [build_func(i) for i in range(num_funcs)])
+        sequential_time = timeit.timeit(module.verify, number=1)
+        parallel_times = [
+            timeit.timeit(lambda: verify_parallel(module, num_workers),
+                          number=1) for num_workers in workers
+        ]
+        print(f"{num_funcs:>7} {sequential_time:>15.2f} " +
+              " ".join(f"{time:>15.2f}" for time in parallel_times))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = [2, 4, 8]
+    if "--workers" in args:
+        idx = args.index("--workers")
+        workers = [int(arg) for arg in args[idx + 1:]]
+        args = args[:idx]
+    main([int(arg) for arg in args] or [1000, 10000], workers)
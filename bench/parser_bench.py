@@ -0,0 +1,49 @@
+"""
+Benchmark parsing a large synthetic module.
+
+The module is a single block of alternating `arith.constant` and
+`arith.addi` operations, written in the textual xDSL format. The default
+size is one million operations.
+
+Usage: python bench/parser_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import Builtin
+from xdsl.ir import MLContext
+from xdsl.parser import Parser
+
+
+def build_module_str(num_ops: int) -> str:
+    lines = ["module() {"]
+    lines.append('  %0 : !i32 = arith.constant() ["value" = 0 : !i32]')
+    for i in range(1, num_ops):
+        if i % 2:
+            lines.append(f"  %{i} : !i32 = arith.addi(%{i - 1} : !i32, "
+                         f"%0 : !i32)")
+        else:
+            lines.append(f'  %{i} : !i32 = arith.constant() '
+                         f'["value" = {i} : !i32]')
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def main(sizes):
+    ctx = MLContext()
+    Builtin(ctx)
+    Arith(ctx)
+
+    print(f"{'ops':>8} {'MB':>7} {'time (s)':>10} {'MB/s':>7} {'ops/s':>10}")
+    for num_ops in sizes:
+        text = build_module_str(num_ops)
+        size_mb = len(text) / 1e6
+        time = timeit.timeit(lambda: Parser(ctx, text).parse_op(), number=1)
+        print(f"{num_ops:>8} {size_mb:>7.1f} {time:>10.2f} "
+              f"{size_mb / time:>7.2f} {num_ops / time:>10.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000000])
@@ -0,0 +1,65 @@
+"""
+Benchmark parsing a large module from a file.
+
+The module of `parser_bench.py` is written to a temporary file, and parsed
+from the string read from the file, and from the memory-mapped file. The
+peak memory allocated while loading and parsing the file is measured with
+`tracemalloc`, in a separate run.
+
+Usage: python bench/parser_file_bench.py [num_ops ...]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from parser_bench import build_module_str
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import Builtin
+from xdsl.ir import MLContext
+from xdsl.parser import Parser
+
+
+def parse_read(ctx, path: Path) -> None:
+    with open(path) as f:
+        Parser(ctx, f.read()).parse_op()
+
+
+def parse_mapped(ctx, path: Path) -> None:
+    Parser(ctx, path).parse_op()
+
+
+def get_peak_memory(fun) -> float:
+    tracemalloc.start()
+    fun()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main(sizes):
+    ctx = MLContext()
+    Builtin(ctx)
+    Arith(ctx)
+
+    print(f"{'ops':>8} {'file MB':>8} {'read (s)':>9} {'mmap (s)':>9} "
+          f"{'read peak MB':>13} {'mmap peak MB':>13}")
+    for num_ops in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "module.xdsl"
+            path.write_text(build_module_str(num_ops))
+            size_mb = os.path.getsize(path) / 1e6
+            read_time = timeit.timeit(lambda: parse_read(ctx, path), number=1)
+            mmap_time = timeit.timeit(lambda: parse_mapped(ctx, path),
+                                      number=1)
+            read_peak = get_peak_memory(lambda: parse_read(ctx, path))
+            mmap_peak = get_peak_memory(lambda: parse_mapped(ctx, path))
+        print(f"{num_ops:>8} {size_mb:>8.1f} {read_time:>9.2f} "
+              f"{mmap_time:>9.2f} {read_peak:>13.1f} {mmap_peak:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000])
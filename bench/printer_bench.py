@@ -0,0 +1,55 @@
+"""
+Benchmark printing a large module.
+
+The module is a single block of alternating `arith.constant` and
+`arith.addi` operations. It is printed both to an in-memory stream and to
+a file.
+
+Usage: python bench/printer_bench.py [num_ops ...]
+"""
+
+import sys
+import tempfile
+import timeit
+from io import StringIO
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import ModuleOp, i32
+from xdsl.printer import Printer
+
+
+def build_module(num_ops: int) -> ModuleOp:
+    ops = [Constant.from_int_constant(0, i32)]
+    for i in range(1, num_ops):
+        if i % 2:
+            ops.append(Addi.get(ops[-1], ops[0]))
+        else:
+            ops.append(Constant.from_int_constant(i, i32))
+    return ModuleOp.from_region_or_ops(ops)
+
+
+def print_to_string(module: ModuleOp) -> int:
+    stream = StringIO()
+    Printer(stream=stream).print_op(module)
+    return len(stream.getvalue())
+
+
+def print_to_file(module: ModuleOp) -> None:
+    with tempfile.TemporaryFile("w") as stream:
+        Printer(stream=stream).print_op(module)
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'MB':>7} {'StringIO (s)':>13} {'file (s)':>9} "
+          f"{'MB/s':>7}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        size_mb = print_to_string(module) / 1e6
+        string_time = timeit.timeit(lambda: print_to_string(module), number=1)
+        file_time = timeit.timeit(lambda: print_to_file(module), number=1)
+        print(f"{num_ops:>8} {size_mb:>7.1f} {string_time:>13.2f} "
+              f"{file_time:>9.2f} {size_mb / file_time:>7.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,63 @@
+"""
+Benchmark resolving the callees of the calls of a large module.
+
+The module has `num_funcs` functions, each calling the next one. The callee
+of every call is resolved by scanning the module, and with a symbol table.
+
+Usage: python bench/symbol_table_bench.py [num_funcs ...]
+"""
+
+import sys
+import timeit
+
+from xdsl.dialects.builtin import ModuleOp
+from xdsl.dialects.func import Call, FuncOp, Return
+from xdsl.symbol_table import SymbolTable
+
+
+def build_module(num_funcs: int) -> ModuleOp:
+    return ModuleOp.from_region_or_ops([
+        FuncOp.from_callable(
+            f"f{i}", [], [],
+            lambda i=i:
+            [Call.get(f"f{(i + 1) % num_funcs}", [[]], [[]]),
+             Return.get()]) for i in range(num_funcs)
+    ])
+
+
+def resolve_with_scan(module: ModuleOp) -> int:
+    num_resolved = 0
+    for call in module.walk(Call):
+        for op in module.ops:
+            if op.attributes["sym_name"].data == call.callee.data.data:
+                num_resolved += 1
+                break
+    return num_resolved
+
+
+def resolve_with_table(module: ModuleOp) -> int:
+    table = SymbolTable.get(module)
+    return sum(1 for call in module.walk(Call)
+               if table.lookup(call.callee) is not None)
+
+
+def main(sizes):
+    print(f"{'funcs':>7} {'scan (s)':>9} {'table (s)':>10} {'build (s)':>10}")
+    for num_funcs in sizes:
+        module = build_module(num_funcs)
+        scan_time = min(
+            timeit.repeat(lambda: resolve_with_scan(module),
+                          number=1,
+                          repeat=3))
+        build_time = timeit.timeit(lambda: SymbolTable.get(module), number=1)
+        assert resolve_with_table(module) == resolve_with_scan(module)
+        table_time = min(
+            timeit.repeat(lambda: resolve_with_table(module),
+                          number=1,
+                          repeat=3))
+        print(f"{num_funcs:>7} {scan_time:>9.3f} {table_time:>10.4f} "
+              f"{build_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
@@ -0,0 +1,66 @@
+"""
+Benchmark the updates of the use lists of a large module.
+
+In the arith-heavy module of `printer_bench.py`, the operands of every
+`arith.addi` are swapped, and the first constant, used by every
+`arith.addi`, is replaced by another value and back. Then, every operand
+of a 100-operand `func.return` is replaced in turn.
+
+Usage: python bench/use_list_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+
+from printer_bench import build_module
+from xdsl.dialects.arith import Addi
+from xdsl.dialects.func import Return
+
+
+def swap_operands(addis) -> None:
+    for addi in addis:
+        lhs, rhs = addi.operands
+        addi.operands = [rhs, lhs]
+
+
+def replace_constant(module) -> None:
+    cst, other_cst = module.ops[0].results[0], module.ops[2].results[0]
+    cst.replace_by(other_cst)
+    for use in list(other_cst.uses):
+        if use.operation is not module.ops[1] and use.index == 1:
+            use.operation.replace_operand(use.index, cst)
+
+
+def replace_return_operands(ret, values, num_rounds: int) -> None:
+    for _ in range(num_rounds):
+        for idx, value in enumerate(values):
+            ret.replace_operand(idx, value)
+        values.reverse()
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'swap (s)':>9} {'replace (s)':>12} "
+          f"{'wide replace (s)':>17}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        addis = list(module.walk(Addi))
+        swap_time = min(
+            timeit.repeat(lambda: swap_operands(addis), number=1, repeat=3))
+        replace_time = min(
+            timeit.repeat(lambda: replace_constant(module), number=1,
+                          repeat=3))
+        # Replace the operands of a wide return as many times as there are
+        # operations
+        values = [op.results[0] for op in module.ops[:100]]
+        ret = Return.get(*values)
+        wide_time = min(
+            timeit.repeat(
+                lambda: replace_return_operands(ret, values, num_ops // 100),
+                number=1,
+                repeat=3))
+        print(f"{num_ops:>8} {swap_time:>9.3f} {replace_time:>12.3f} "
+              f"{wide_time:>17.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
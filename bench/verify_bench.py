@@ -0,0 +1,45 @@
+"""
+Benchmark verifying a large module.
+
+The module is a single block of alternating `arith.constant` and
+`arith.addi` operations, followed by `func.call` operations with variadic
+operands, and `memref.alloca` operations with attribute-sized operand
+segments.
+
+Usage: python bench/verify_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import IndexType, ModuleOp, i32
+from xdsl.dialects.func import Call
+from xdsl.dialects.memref import Alloca
+from xdsl.ir import Operation
+
+
+def build_module(num_ops: int) -> ModuleOp:
+    ops = [Constant.from_int_constant(0, i32)]
+    for i in range(1, num_ops):
+        if i % 4 == 1:
+            ops.append(Addi.get(ops[-1], ops[0]))
+        elif i % 4 == 2:
+            ops.append(Call.get("f", [[ops[0], ops[0]]], [[i32]]))
+        elif i % 4 == 3:
+            ops.append(Alloca.get(IndexType(), 0, [1]))
+        else:
+            ops.append(Constant.from_int_constant(i, i32))
+    return ModuleOp.from_region_or_ops(ops)
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'verify (s)':>11}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        verify_time = min(timeit.repeat(module.verify, number=1, repeat=3))
+        print(f"{num_ops:>8} {verify_time:>11.2f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
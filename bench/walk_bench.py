@@ -0,0 +1,51 @@
+"""
+Benchmark walking a large module.
+
+The `arith.addi` operations of the module of `printer_bench.py` are
+counted with a callback walk, and with a generator walk filtering the
+operation type.
+
+Usage: python bench/walk_bench.py [num_ops ...]
+"""
+
+import sys
+import timeit
+
+from printer_bench import build_module
+from xdsl.dialects.arith import Addi
+
+
+def count_with_callback(module) -> int:
+    num_addis = 0
+
+    def count(op):
+        nonlocal num_addis
+        if isinstance(op, Addi):
+            num_addis += 1
+
+    module.walk(count)
+    return num_addis
+
+
+def count_with_generator(module) -> int:
+    return sum(1 for _ in module.walk(Addi))
+
+
+def main(sizes):
+    print(f"{'ops':>8} {'callback (s)':>13} {'generator (s)':>14}")
+    for num_ops in sizes:
+        module = build_module(num_ops)
+        assert count_with_callback(module) == count_with_generator(module)
+        callback_time = min(
+            timeit.repeat(lambda: count_with_callback(module),
+                          number=1,
+                          repeat=3))
+        generator_time = min(
+            timeit.repeat(lambda: count_with_generator(module),
+                          number=1,
+                          repeat=3))
+        print(f"{num_ops:>8} {callback_time:>13.3f} {generator_time:>14.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,216 @@
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple
+import weakref
+
+from xdsl.dialects.func import Call, FuncOp
+from xdsl.ir import (IRListener, Operation, add_ir_listener, get_ir_listeners,
+                     remove_ir_listener)
+from xdsl.symbol_table import SymbolTable
+
+
+class CallGraph(IRListener):
+    """
+    The call graph of the functions defined directly in a root operation,
+    usually a module. The edges are the `func.call` operations nested in the
+    functions, and their callees are resolved with the symbol table of the
+    root.
+    The graph is kept up to date as functions and calls are attached and
+    detached below the root, and its strongly connected components are
+    only recomputed after such a change.
+    """
+
+    _root: weakref.ref[Operation]
+    """
+    The root operation. It is not held strongly, as the graph is kept alive
+    by the root.
+    """
+
+    _symbol_table: SymbolTable
+    """The symbol table of the root, resolving the callees."""
+
+    _calls: Dict[FuncOp, Dict[Call, None]]
+    """
+    The calls nested in each function. Each call set is a dictionary, to keep
+    the calls in insertion order.
+    """
+
+    _sccs: Optional[List[List[FuncOp]]] = None
+    """
+    The strongly connected components of the graph in bottom-up order, or
+    None if they need to be recomputed.
+    """
+
+    _sccs_version: int = -1
+    """
+    The version of the symbol table the strongly connected components were
+    computed with. The components are recomputed when the callees resolve to
+    other functions, for instance after a symbol is renamed.
+    """
+
+    def __init__(self, root: Operation) -> None:
+        self._root = weakref.ref(root)
+        self._symbol_table = SymbolTable.get(root)
+        self._calls = {}
+
+    @staticmethod
+    def get(root: Operation) -> CallGraph:
+        """
+        Get the call graph of the functions of an operation, creating it if
+        it does not exist yet.
+        """
+        for listener in get_ir_listeners(root):
+            if isinstance(listener, CallGraph):
+                return listener
+        graph = CallGraph(root)
+        for region in root.regions:
+            for op in region.walk():
+                graph.operation_added(op)
+        add_ir_listener(root, graph)
+        return graph
+
+    def remove(self) -> None:
+        """Stop maintaining the call graph."""
+        root = self._root()
+        if root is not None:
+            remove_ir_listener(root, self)
+
+    def _get_enclosing_function(self, op: Operation) -> Optional[FuncOp]:
+        """Get the function of the root in which an operation is nested."""
+        root = self._root()
+        parent = op.parent_op()
+        while parent is not None:
+            if parent.parent_op() is root:
+                return parent if isinstance(parent, FuncOp) else None
+            parent = parent.parent_op()
+        return None
+
+    def operation_added(self, op: Operation) -> None:
+        if isinstance(op, FuncOp):
+            if op.parent_op() is self._root():
+                self._calls.setdefault(op, {})
+                self._sccs = None
+        elif isinstance(op, Call):
+            func = self._get_enclosing_function(op)
+            if func is not None:
+                self._calls.setdefault(func, {})[op] = None
+                self._sccs = None
+
+    def operation_removed(self, op: Operation) -> None:
+        if isinstance(op, FuncOp):
+            if self._calls.pop(op, None) is not None:
+                self._sccs = None
+        elif isinstance(op, Call):
+            func = self._get_enclosing_function(op)
+            calls = self._calls.get(func)
+            if calls is not None and op in calls:
+                del calls[op]
+                self._sccs = None
+
+    def get_functions(self) -> List[FuncOp]:
+        """Get the functions of the graph."""
+        return list(self._calls)
+
+    def get_calls(self, func: FuncOp) -> List[Call]:
+        """Get the calls nested in a function."""
+        return list(self._calls.get(func, ()))
+
+    def get_callees(self, func: FuncOp) -> List[FuncOp]:
+        """
+        Get the functions called by a function. Callees that are not defined
+        in the root are not returned.
+        """
+        callees: Dict[FuncOp, None] = {}
+        for call in self._calls.get(func, ()):
+            callee = self._symbol_table.lookup(call.callee)
+            if isinstance(callee, FuncOp):
+                callees[callee] = None
+        return list(callees)
+
+    def get_callers(self, func: FuncOp) -> List[FuncOp]:
+        """Get the functions calling a function."""
+        callers: Dict[FuncOp, None] = {}
+        for user in self._symbol_table.get_users(func.sym_name):
+            if isinstance(user, Call):
+                caller = self._get_enclosing_function(user)
+                if caller is not None:
+                    callers[caller] = None
+        return list(callers)
+
+    def get_sccs(self) -> List[List[FuncOp]]:
+        """
+        Get the strongly connected components of the graph, in bottom-up
+        order: the functions called from a component are in the same
+        component, or in a previous one.
+        """
+        if (self._sccs is None
+                or self._sccs_version != self._symbol_table._version):
+            self._sccs = self._compute_sccs()
+            self._sccs_version = self._symbol_table._version
+        return self._sccs
+
+    def _compute_sccs(self) -> List[List[FuncOp]]:
+        # Tarjan's algorithm, with an explicit stack to support deep call
+        # chains. Components are completed in reverse topological order,
+        # which is the bottom-up order.
+        indices: Dict[FuncOp, int] = {}
+        low_links: Dict[FuncOp, int] = {}
+        on_stack: Dict[FuncOp, None] = {}
+        sccs: List[List[FuncOp]] = []
+
+        for root in self._calls:
+            if root in indices:
+                continue
+            indices[root] = low_links[root] = len(indices)
+            on_stack[root] = None
+            work: List[Tuple[FuncOp, Iterator[FuncOp]]] = [
+                (root, iter(self.get_callees(root)))
+            ]
+            while work:
+                func, callees = work[-1]
+                for callee in callees:
+                    if callee not in indices:
+                        indices[callee] = low_links[callee] = len(indices)
+                        on_stack[callee] = None
+                        work.append((callee, iter(self.get_callees(callee))))
+                        break
+                    if callee in on_stack:
+                        low_links[func] = min(low_links[func], indices[callee])
+                else:
+                    work.pop()
+                    if work:
+                        caller = work[-1][0]
+                        low_links[caller] = min(low_links[caller],
+                                                low_links[func])
+                    if low_links[func] == indices[func]:
+                        scc: List[FuncOp] = []
+                        while True:
+                            member, _ = on_stack.popitem()
+                            scc.append(member)
+                            if member is func:
+                                break
+                        scc.reverse()
+                        sccs.append(scc)
+        return sccs
+
+    def bottom_up(self) -> Iterator[List[FuncOp]]:
+        """
+        Iterate over the strongly connected components, visiting the
+        callees of a component before the component.
+        """
+        return iter(self.get_sccs())
+
+    def top_down(self) -> Iterator[List[FuncOp]]:
+        """
+        Iterate over the strongly connected components, visiting the callers
+        of a component before the component.
+        """
+        return reversed(self.get_sccs())
+
+    def is_recursive(self, func: FuncOp) -> bool:
+        """Can a function call itself, directly or through other functions."""
+        if func in self.get_callees(func):
+            return True
+        for scc in self.get_sccs():
+            if func in scc:
+                return len(scc) > 1
+        return False
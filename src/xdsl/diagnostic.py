@@ -17,19 +17,27 @@ class Diagnostic:
     def raise_exception(self,
                         message,
                         ir: Union[Operation, Block, Region],
-                        exception_type=Exception) -> None:
-        """Raise an exception, that will also print all messages in the IR."""
+                        exception_type=Exception,
+                        name_forward_references: bool = False) -> None:
+        """
+        Raise an exception, that will also print all messages in the IR.
+        If name_forward_references is True, values used before their
+        definition are printed, instead of raising a KeyError.
+        """
         from xdsl.printer import Printer
         f = StringIO()
-        p = Printer(stream=f, diagnostic=self)
+        p = Printer(stream=f,
+                    diagnostic=self,
+                    name_forward_references=name_forward_references)
         toplevel = ir.get_toplevel_object()
-        if isinstance(toplevel, Operation):
-            p.print_op(toplevel)
-        elif isinstance(toplevel, Block):
-            p._print_named_block(toplevel)
-        elif isinstance(toplevel, Region):
-            p._print_region(toplevel)
-        else:
-            assert "xDSL internal error: get_toplevel_object returned unknown construct"
+        with p._buffered():
+            if isinstance(toplevel, Operation):
+                p.print_op(toplevel)
+            elif isinstance(toplevel, Block):
+                p._print_named_block(toplevel)
+            elif isinstance(toplevel, Region):
+                p._print_region(toplevel)
+            else:
+                assert "xDSL internal error: get_toplevel_object returned unknown construct"
 
         raise exception_type(message + "\n\n" + f.getvalue())
@@ -1,14 +1,28 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import array
+from io import StringIO
 
 from xdsl.irdl import *
 from xdsl.ir import *
-from typing import overload
+from typing import Iterable, overload
+from xdsl.op_index import OperationIndex, OperationInvT
 
 if TYPE_CHECKING:
     from xdsl.parser import Parser
     from xdsl.printer import Printer
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DenseBuffer = Union["np.ndarray", array.array, Tuple[int, ...]]
+"""
+The storage of dense elements, a contiguous buffer, or a tuple of Python
+integers if the elements do not fit in a buffer.
+"""
+
 
 @dataclass
 class Builtin:
@@ -156,7 +170,11 @@ class IntegerAttr(ParametrizedAttribute):
 @irdl_attr_definition
 class ArrayAttr(Data):
     name = "array"
-    data: List[Attribute]
+    data: Tuple[Attribute, ...]
+
+    def __post_init__(self):
+        if not isinstance(self.data, tuple):
+            object.__setattr__(self, "data", tuple(self.data))
 
     @staticmethod
     def parse(parser) -> ArrayAttr:
@@ -266,31 +284,186 @@ class TensorType(ParametrizedAttribute):
         return TensorType([shape, referenced_type])
 
 
+_dense_typecodes = "bBhHiIlLqQ"
+"""
+The array typecodes of integers, by increasing size, with the signed
+typecode of each size first.
+"""
+
+
+def _get_dense_typecode(element_type: Attribute,
+                        values: Sequence[int]) -> Optional[str]:
+    """
+    Get the typecode of the smallest array storing dense elements of a given
+    type, or None if the values do not fit in an array.
+    Signless elements may use either their signed or unsigned range.
+    """
+    if isinstance(element_type, IndexType):
+        width = 64
+    elif isinstance(element_type, IntegerType):
+        width = element_type.width.data
+    else:
+        raise Exception(
+            f"Unsupported dense element type {element_type}, expected an "
+            "integer or index type")
+    if len(values) == 0:
+        low, high = 0, 0
+    elif np is not None and isinstance(values, np.ndarray):
+        low, high = int(values.min()), int(values.max())
+    else:
+        low, high = min(values), max(values)
+    for typecode in _dense_typecodes:
+        size = array.array(typecode).itemsize * 8
+        if size < width:
+            continue
+        if typecode.islower():
+            if -2**(size - 1) <= low and high < 2**(size - 1):
+                return typecode
+        elif 0 <= low and high < 2**size:
+            return typecode
+    return None
+
+
+def _make_dense_buffer(values: Iterable[int], typecode: str) -> DenseBuffer:
+    """
+    Store integer values in a contiguous buffer, a read-only NumPy array if
+    NumPy is available, and an array.array otherwise.
+    """
+    if np is None:
+        return array.array(typecode, values)
+    if not isinstance(values, (np.ndarray, array.array)):
+        values = list(values)
+    buffer = np.array(values, dtype=typecode)
+    buffer.flags.writeable = False
+    return buffer
+
+
+class _DenseBufferKey:
+    """
+    Hash and compare dense buffers by their contents, without copying them
+    to the uniquing table.
+    """
+
+    __slots__ = ("buffer", "_hash")
+
+    def __init__(self, buffer: DenseBuffer):
+        self.buffer = buffer
+        self._hash = None
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(memoryview(self.buffer).tobytes())
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _DenseBufferKey) and memoryview(
+            self.buffer) == memoryview(other.buffer)
+
+
 @irdl_attr_definition
-class DenseIntOrFPElementsAttr(ParametrizedAttribute):
+class DenseIntOrFPElementsAttr(Data):
+    """
+    A vector or tensor constant, whose elements are stored in a contiguous
+    NumPy array, or in an array.array if NumPy is not available. Elements
+    that do not fit in 64 bits are stored in a tuple of Python integers.
+    The elements are printed with the element type of the vector or tensor.
+    """
     name = "dense"
     # TODO add support for FPElements
-    type = ParameterDef(AnyOf([VectorType, TensorType]))
+    type: Union[VectorType, TensorType]
     # TODO add support for multi-dimensional data
-    data = ParameterDef(ArrayOfConstraint(IntegerAttr))
+    data: DenseBuffer
+    """The elements, which should not be modified."""
+
+    _lookup_by_arguments = False
+
+    def __post_init__(self):
+        if not isinstance(self.type, (VectorType, TensorType)):
+            raise Exception(
+                f"dense elements expect a vector or tensor type, but got {self.type}"
+            )
+        data = self.data
+        if not isinstance(data, (tuple, array.array)) and not (
+                np is not None and isinstance(data, np.ndarray)):
+            data = list(data)
+        typecode = _get_dense_typecode(self.type.element_type, data)
+        if typecode is None:
+            data = tuple(int(value) for value in data)
+        elif np is not None:
+            if not (isinstance(data, np.ndarray) and data.dtype.char
+                    == typecode and not data.flags.writeable):
+                data = _make_dense_buffer(data, typecode)
+        elif not (isinstance(data, array.array) and data.typecode == typecode):
+            data = _make_dense_buffer(data, typecode)
+        object.__setattr__(self, "data", data)
+        # The typecode only depends on the type and the values, so a tuple
+        # is never equal to a buffer with the same values.
+        object.__setattr__(
+            self, "_data_key",
+            data if isinstance(data, tuple) else _DenseBufferKey(data))
+
+    def _storage_key(self) -> Tuple:
+        return type(self), self.type, self._data_key
+
+    def __reduce__(self):
+        return type(self), (self.type, self.data)
+
+    def get_values(self) -> List[int]:
+        """Get the elements as a list of Python integers."""
+        if isinstance(self.data, tuple):
+            return list(self.data)
+        return self.data.tolist()
+
+    @staticmethod
+    def parse(parser: Parser) -> DenseIntOrFPElementsAttr:
+        typ = parser.parse_attribute()
+        parser.parse_char(",")
+        parser.parse_char("[")
+        values = []
+        value = parser.parse_optional_int_literal()
+        while value is not None:
+            parser.parse_char(":")
+            element_type = parser.parse_attribute()
+            if element_type != typ.element_type:
+                raise Exception(
+                    f"dense element type {element_type} does not match "
+                    f"the type {typ.element_type}")
+            values.append(value)
+            if not parser.parse_optional_char(","):
+                break
+            value = parser.parse_int_literal()
+        parser.parse_char("]")
+        return DenseIntOrFPElementsAttr(typ, values)
+
+    def print(self, printer: Printer) -> None:
+        printer.print_attribute(self.type)
+        printer.print_string(", [")
+        if len(self.data) != 0:
+            # Print the element type once, and reuse it for all elements
+            from xdsl.printer import Printer
+            stream = StringIO()
+            element_printer = Printer(stream=stream)
+            element_printer.print_attribute(self.type.element_type)
+            element_type = stream.getvalue()
+            printer.print_string(", ".join(f"{value} : {element_type}"
+                                           for value in self.get_values()))
+        printer.print_string("]")
 
     @staticmethod
     @builder
-    def from_int_list(type: Union[VectorType, TensorType], data: List[int],
-                      bitwidth) -> DenseIntOrFPElementsAttr:
-        data_attr = [IntegerAttr.from_int_and_width(d, bitwidth) for d in data]
-        return DenseIntOrFPElementsAttr([type, ArrayAttr.from_list(data_attr)])
+    def from_int_list(type: Union[VectorType, TensorType],
+                      data: List[int]) -> DenseIntOrFPElementsAttr:
+        return DenseIntOrFPElementsAttr(type, data)
 
     @staticmethod
     @builder
     def from_list(
             type: Union[VectorType, TensorType],
             data: List[Union[int, IntegerAttr]]) -> DenseIntOrFPElementsAttr:
-        element_type = type.element_type
-        # Only use the element_type if the passed data is an int, o/w use the IntegerAttr
-        data_attr = [(IntegerAttr.from_params(d, element_type) if isinstance(
-            d, int) else d) for d in data]
-        return DenseIntOrFPElementsAttr([type, ArrayAttr.from_list(data_attr)])
+        values = [
+            d.value.data if isinstance(d, IntegerAttr) else d for d in data
+        ]
+        return DenseIntOrFPElementsAttr(type, values)
 
     @staticmethod
     @builder
@@ -350,7 +523,7 @@ class ModuleOp(Operation):
     body = SingleBlockRegionDef()
 
     @property
-    def ops(self) -> List[Operation]:
+    def ops(self) -> BlockOps:
         return self.regions[0].blocks[0].ops
 
     @staticmethod
@@ -365,3 +538,27 @@ class ModuleOp(Operation):
             )
         op = ModuleOp.create([], [], regions=[region])
         return op
+
+    def get_op_index(self) -> OperationIndex:
+        """
+        Get the index of the operations nested in the module by type,
+        creating it on the first call. The index is then kept up to date as
+        operations are added to and removed from the module.
+        """
+        return OperationIndex.get(self)
+
+    @overload
+    def get_ops(self, kind: typing.Type[OperationInvT]) -> List[OperationInvT]:
+        ...
+
+    @overload
+    def get_ops(self, kind: str) -> List[Operation]:
+        ...
+
+    def get_ops(self, kind: Union[typing.Type[Operation],
+                                  str]) -> List[Operation]:
+        """
+        Get the operations nested at any depth in the module with a given
+        type or name, using the index of the module.
+        """
+        return self.get_op_index().get_ops(kind)
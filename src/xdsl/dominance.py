@@ -0,0 +1,346 @@
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from xdsl.diagnostic import Diagnostic
+from xdsl.ir import Block, BlockArgument, OpResult, Operation, Region, SSAValue
+
+
+def get_block_successors(block: Block) -> List[Block]:
+    """
+    Get the successors of a block in the control-flow graph of its region,
+    which are the successors of its terminator.
+    """
+    terminator = block.last_op
+    if terminator is None:
+        return []
+    return terminator.successors
+
+
+class DominanceInfo:
+    """
+    The dominance information of the blocks of a region, computed with the
+    iterative algorithm of Cooper, Harvey and Kennedy.
+    The dominator tree is computed on the first query, and recomputed on the
+    first query following a change of the control-flow graph of the region.
+    Blocks that are not reachable from the entry block are dominated by
+    every block, and only dominate themselves.
+    """
+
+    region: Region
+    """The region analyzed."""
+
+    _version: int
+    """The control-flow graph version of the region the analysis is valid for."""
+
+    _idoms: Dict[Block, Block]
+    """The immediate dominator of each reachable block. The entry block is its own dominator."""
+
+    _children: Dict[Block, List[Block]]
+    """The children of each reachable block in the dominator tree."""
+
+    _intervals: Dict[Block, Tuple[int, int]]
+    """
+    The preorder index of each reachable block in the dominator tree, and
+    the largest preorder index in its subtree. A block dominates the blocks
+    whose preorder index is in its interval.
+    """
+
+    _predecessors: Dict[Block, List[Block]]
+    """The reachable predecessors of each reachable block."""
+
+    _frontiers: Optional[Dict[Block, List[Block]]]
+    """The dominance frontier of each reachable block, computed on demand."""
+
+    def __init__(self, region: Region) -> None:
+        self.region = region
+        self._version = -1
+
+    def _update(self) -> None:
+        """Recompute the dominator tree if the region has changed."""
+        if self._version == self.region._cfg_version:
+            return
+        self._version = self.region._cfg_version
+        self._frontiers = None
+        self._compute_dominator_tree()
+
+    def _compute_dominator_tree(self) -> None:
+        blocks = self.region.blocks
+        self._idoms = {}
+        self._children = {}
+        self._intervals = {}
+        self._predecessors = {}
+        if not blocks:
+            return
+        entry = blocks[0]
+
+        # Number the reachable blocks in reverse postorder, with an explicit
+        # stack to support long chains of blocks.
+        postorder: List[Block] = []
+        visited: Set[Block] = {entry}
+        stack: List[Tuple[Block, Iterator[Block]]] = [
+            (entry, iter(get_block_successors(entry)))
+        ]
+        while stack:
+            block, successors = stack[-1]
+            for successor in successors:
+                if successor.parent is not self.region:
+                    continue
+                if successor not in visited:
+                    visited.add(successor)
+                    stack.append(
+                        (successor, iter(get_block_successors(successor))))
+                    break
+            else:
+                stack.pop()
+                postorder.append(block)
+        rpo = postorder[::-1]
+        postorder_idx = {block: idx for idx, block in enumerate(postorder)}
+
+        predecessors: Dict[Block, List[Block]] = {block: [] for block in rpo}
+        for block in rpo:
+            for successor in get_block_successors(block):
+                if successor in predecessors:
+                    predecessors[successor].append(block)
+        self._predecessors = predecessors
+
+        # Iterate to a fixpoint, intersecting the dominators of the processed
+        # predecessors of each block.
+        idoms: Dict[Block, Block] = {entry: entry}
+        changed = True
+        while changed:
+            changed = False
+            for block in rpo[1:]:
+                new_idom: Optional[Block] = None
+                for pred in predecessors[block]:
+                    if pred not in idoms:
+                        continue
+                    if new_idom is None:
+                        new_idom = pred
+                        continue
+                    finger1, finger2 = pred, new_idom
+                    while finger1 is not finger2:
+                        while postorder_idx[finger1] < postorder_idx[finger2]:
+                            finger1 = idoms[finger1]
+                        while postorder_idx[finger2] < postorder_idx[finger1]:
+                            finger2 = idoms[finger2]
+                    new_idom = finger1
+                assert new_idom is not None
+                if idoms.get(block) is not new_idom:
+                    idoms[block] = new_idom
+                    changed = True
+        self._idoms = idoms
+
+        children: Dict[Block, List[Block]] = {block: [] for block in rpo}
+        for block in rpo[1:]:
+            children[idoms[block]].append(block)
+        self._children = children
+
+        # Number the dominator tree in preorder
+        intervals: Dict[Block, Tuple[int, int]] = {}
+        counter = 0
+        tree_stack: List[Tuple[Block, bool]] = [(entry, False)]
+        begins: Dict[Block, int] = {}
+        while tree_stack:
+            block, is_exit = tree_stack.pop()
+            if is_exit:
+                intervals[block] = (begins[block], counter - 1)
+                continue
+            begins[block] = counter
+            counter += 1
+            tree_stack.append((block, True))
+            for child in reversed(children[block]):
+                tree_stack.append((child, False))
+        self._intervals = intervals
+
+    def is_reachable(self, block: Block) -> bool:
+        """Is a block of the region reachable from the entry block."""
+        self._update()
+        return block in self._idoms
+
+    def get_idom(self, block: Block) -> Optional[Block]:
+        """
+        Get the immediate dominator of a block. Returns None for the entry
+        block and for unreachable blocks.
+        """
+        self._update()
+        idom = self._idoms.get(block)
+        return None if idom is block else idom
+
+    def get_children(self, block: Block) -> List[Block]:
+        """Get the blocks immediately dominated by a block."""
+        self._update()
+        return self._children.get(block, [])
+
+    def get_predecessors(self, block: Block) -> List[Block]:
+        """Get the reachable predecessors of a block."""
+        self._update()
+        return self._predecessors.get(block, [])
+
+    def _block_dominates(self, a: Block, b: Block) -> bool:
+        self._update()
+        if a is b:
+            return True
+        b_interval = self._intervals.get(b)
+        if b_interval is None:
+            return True
+        a_interval = self._intervals.get(a)
+        if a_interval is None:
+            return False
+        return a_interval[0] <= b_interval[0] <= a_interval[1]
+
+    def _get_ancestor_in_region(self, op: Operation) -> Optional[Operation]:
+        """Get the ancestor of an operation, or the operation itself, that is in the region."""
+        current: Optional[Operation] = op
+        while current is not None:
+            block = current.parent
+            if block is None:
+                return None
+            if block.parent is self.region:
+                return current
+            current = block.parent_op()
+        return None
+
+    def properly_dominates(self, a: Union[Operation, Block],
+                           b: Union[Operation, Block]) -> bool:
+        """
+        Does `a` dominate `b`, and are they different.
+        For blocks, every path from the entry block to `b` goes through `a`.
+        For operations, `a` is in a block of the region and executes before
+        `b` on every path reaching `b`. `b` may be nested in the region at
+        any depth, and is not dominated by its ancestors.
+        """
+        if isinstance(a, Block):
+            assert isinstance(b, Block)
+            return a is not b and self._block_dominates(a, b)
+        assert isinstance(b, Operation)
+        if a.parent is None or a.parent.parent is not self.region:
+            raise Exception("Operation is not in a block of the region")
+        b_ancestor = self._get_ancestor_in_region(b)
+        if b_ancestor is None or b_ancestor is a:
+            return False
+        if a.parent is b_ancestor.parent:
+            return a.is_before_in_block(b_ancestor)
+        return self._block_dominates(a.parent, b_ancestor.parent)
+
+    def dominates(self, a: Union[Operation, Block], b: Union[Operation,
+                                                             Block]) -> bool:
+        """Does `a` dominate `b`. Blocks and operations dominate themselves."""
+        return a is b or self.properly_dominates(a, b)
+
+    def get_dominance_frontier(self, block: Block) -> List[Block]:
+        """
+        Get the dominance frontier of a block: the blocks that are not
+        strictly dominated by it, but that have a predecessor dominated by it.
+        """
+        self._update()
+        if self._frontiers is None:
+            self._frontiers = self._compute_frontiers()
+        return self._frontiers.get(block, [])
+
+    def _compute_frontiers(self) -> Dict[Block, List[Block]]:
+        frontiers: Dict[Block,
+                        Dict[Block,
+                             None]] = {block: {}
+                                       for block in self._idoms}
+        entry = self.region.blocks[0] if self.region.blocks else None
+        for block, predecessors in self._predecessors.items():
+            # The entry block has no immediate dominator, and is in the
+            # frontier of the blocks of the loops it heads.
+            if block is entry:
+                idom = None
+            elif len(predecessors) >= 2:
+                idom = self._idoms[block]
+            else:
+                continue
+            for pred in predecessors:
+                runner: Optional[Block] = pred
+                while runner is not idom:
+                    frontiers[runner][block] = None
+                    runner = None if runner is entry else self._idoms[runner]
+        return {block: list(frontier) for block, frontier in frontiers.items()}
+
+
+def _describe_value(value: SSAValue) -> str:
+    if isinstance(value, OpResult):
+        return f"result #{value.result_index} of '{value.op.name}'"
+    if isinstance(value, BlockArgument):
+        return f"argument #{value.index} of a block"
+    return "an erased value"
+
+
+def _verify_block_dominance(block: Block, visible: Set[int],
+                            diagnostic: Diagnostic) -> None:
+    """
+    Check that the operands of the operations of a block are visible, and
+    add the values defined by the block to the visible values.
+    """
+    for arg in block.args:
+        visible.add(id(arg))
+    for op in block.ops:
+        for idx, operand in enumerate(op.operands):
+            if id(operand) not in visible:
+                diagnostic.add_message(
+                    op, f"operand #{idx} ({_describe_value(operand)}) does "
+                    "not dominate its use")
+        if op.regions:
+            _verify_regions_dominance(op, visible, diagnostic)
+        for result in op.results:
+            visible.add(id(result))
+
+
+def _remove_block_values(block: Block, visible: Set[int]) -> None:
+    """Remove the values defined by a block from the visible values."""
+    for arg in block.args:
+        visible.discard(id(arg))
+    for op in block.ops:
+        for result in op.results:
+            visible.discard(id(result))
+
+
+def _verify_regions_dominance(op: Operation, visible: Set[int],
+                              diagnostic: Diagnostic) -> None:
+    """
+    Check the dominance of the uses in the regions of an operation, given
+    the values visible from the operation.
+    """
+    for region in op.regions:
+        if len(region.blocks) == 1:
+            _verify_block_dominance(region.blocks[0], visible, diagnostic)
+            _remove_block_values(region.blocks[0], visible)
+            continue
+        if not region.blocks:
+            continue
+
+        # Visit the dominator tree in preorder, so that the values defined
+        # by a block are visible in the blocks it dominates. Unreachable
+        # blocks are not checked.
+        dominance = DominanceInfo(region)
+        stack: List[Tuple[Block, bool]] = [(region.blocks[0], False)]
+        while stack:
+            block, is_exit = stack.pop()
+            if is_exit:
+                _remove_block_values(block, visible)
+                continue
+            _verify_block_dominance(block, visible, diagnostic)
+            stack.append((block, True))
+            for child in reversed(dominance.get_children(block)):
+                stack.append((child, False))
+
+
+def verify_dominance(op: Operation) -> None:
+    """
+    Check that the definition of every value used in the regions of an
+    operation dominates its uses, in time linear in the size of the
+    operation. Values defined by an operation are not visible in its
+    regions.
+    All the offending operands are reported in a single exception.
+    """
+    diagnostic = Diagnostic()
+    _verify_regions_dominance(op, set(), diagnostic)
+    if diagnostic.op_messages:
+        num_failures = sum(
+            len(messages) for messages in diagnostic.op_messages.values())
+        diagnostic.raise_exception(
+            f"{num_failures} operand(s) do not dominate their uses",
+            op,
+            name_forward_references=True)
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Dict, List, Callable, Optional, Any, TYPE_CHECKING, TypeVar, Set, Union
+from abc import ABC, ABCMeta, abstractmethod
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Dict, List, Callable, Optional, Any, TYPE_CHECKING, TypeVar, Set, Tuple, Union, ClassVar
+import sys
 import typing
+import weakref
 from frozenlist import FrozenList
 
 # Used for cyclic dependencies in type hints
@@ -12,6 +14,148 @@ if TYPE_CHECKING:
 
 OperationType = TypeVar('OperationType', bound='Operation', covariant=True)
 
+_INVALID_ORDER_IDX = -1
+"""The order index of an operation whose position in its block is not known."""
+
+_ORDER_STRIDE = 5
+"""The default gap between the order indices of consecutive operations."""
+
+_DataclassT = TypeVar('_DataclassT')
+
+
+def _slotted_dataclass(**kwargs: Any):
+    """
+    Define a dataclass with a slot for each of its fields instead of an
+    instance dictionary, as `dataclass(slots=True)` does on recent Python
+    versions. Instances stay weakly referenceable.
+    Dataclasses inheriting from a slotted class should also be defined with
+    this decorator, as a plain dataclass does not initialize the inherited
+    fields that are not set by `__init__`.
+    """
+
+    def wrap(cls: typing.Type[_DataclassT]) -> typing.Type[_DataclassT]:
+        if sys.version_info >= (3, 11):
+            return dataclass(slots=True, weakref_slot=True, **kwargs)(cls)
+        cls = dataclass(**kwargs)(cls)
+
+        base_slots = {
+            slot
+            for base in cls.__mro__[1:]
+            for slot in base.__dict__.get("__slots__", ())
+        }
+        cls_fields = fields(cls)
+        slots = [f.name for f in cls_fields if f.name not in base_slots]
+        if "__weakref__" not in base_slots:
+            slots.append("__weakref__")
+
+        cls_dict = dict(cls.__dict__)
+        cls_dict["__slots__"] = tuple(slots)
+        for name in slots:
+            cls_dict.pop(name, None)
+        cls_dict.pop("__dict__", None)
+        new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+        # The defaults of the fields that are not initialized by `__init__`
+        # can no longer be class attributes.
+        defaults = tuple((f.name, f.default) for f in cls_fields
+                         if not f.init and f.default is not MISSING)
+        if defaults:
+            init = new_cls.__init__
+
+            def __init__(self, *args, **kwargs):
+                for name, value in defaults:
+                    setattr(self, name, value)
+                init(self, *args, **kwargs)
+
+            new_cls.__init__ = __init__
+        return new_cls
+
+    return wrap
+
+
+class IRListener:
+    """
+    A listener notified when operations are added below an operation, or
+    removed from below it. Listeners are registered with `add_ir_listener`.
+    """
+
+    def operation_added(self, op: Operation) -> None:
+        """Called when an operation is attached below the listened operation."""
+        ...
+
+    def operation_removed(self, op: Operation) -> None:
+        """Called when an operation is detached from below the listened operation."""
+        ...
+
+
+_ir_listeners: weakref.WeakKeyDictionary[
+    Operation, List[IRListener]] = weakref.WeakKeyDictionary()
+"""The listeners registered on each operation."""
+
+
+def add_ir_listener(op: Operation, listener: IRListener) -> None:
+    """
+    Register a listener notified of the operations added below an operation,
+    or removed from below it, at any depth.
+    """
+    _ir_listeners.setdefault(op, []).append(listener)
+
+
+def remove_ir_listener(op: Operation, listener: IRListener) -> None:
+    """Unregister a listener registered on an operation."""
+    listeners = _ir_listeners[op]
+    listeners.remove(listener)
+    if not listeners:
+        del _ir_listeners[op]
+
+
+def get_ir_listeners(op: Operation) -> List[IRListener]:
+    """Get the listeners registered on an operation."""
+    return _ir_listeners.get(op, [])
+
+
+def _get_ancestor_listeners(op: Optional[Operation]) -> List[IRListener]:
+    """Get the listeners registered on an operation and its ancestors."""
+    listeners: List[IRListener] = []
+    while op is not None:
+        op_listeners = _ir_listeners.get(op)
+        if op_listeners:
+            listeners.extend(op_listeners)
+        op = op.parent_op()
+    return listeners
+
+
+def _notify_ir_added(ir: Union[Operation, Block, Region]) -> None:
+    """Notify the listeners of the ancestors of IR that was just attached."""
+    if not _ir_listeners:
+        return
+    listeners = _get_ancestor_listeners(ir.parent_op())
+    if not listeners:
+        return
+    if isinstance(ir, Operation) and not ir.regions:
+        for listener in listeners:
+            listener.operation_added(ir)
+        return
+    for op in ir.walk():
+        for listener in listeners:
+            listener.operation_added(op)
+
+
+def _notify_ir_removed(ir: Union[Operation, Block, Region]) -> None:
+    """Notify the listeners of the ancestors of IR that is about to be detached."""
+    if not _ir_listeners:
+        return
+    listeners = _get_ancestor_listeners(ir.parent_op())
+    if not listeners:
+        return
+    if isinstance(ir, Operation) and not ir.regions:
+        for listener in listeners:
+            listener.operation_removed(ir)
+        return
+    for op in ir.walk():
+        for listener in listeners:
+            listener.operation_removed(op)
+
 
 @dataclass
 class MLContext:
@@ -47,9 +191,14 @@ class MLContext:
         return self._registeredAttrs[name]
 
 
-@dataclass(frozen=True)
+@_slotted_dataclass(eq=False)
 class Use:
-    """The use of a SSA value."""
+    """
+    The use of a SSA value by an operand of an operation.
+    Each operand of an operation has a persistent use, that is linked in the
+    intrusive use list of the operand value. Uses are equal if they refer to
+    the same operand of the same operation.
+    """
 
     operation: Operation
     """The operation using the value."""
@@ -57,8 +206,65 @@ class Use:
     index: int
     """The index of the operand using the value in the operation."""
 
+    _value: Optional[SSAValue] = field(default=None, init=False, repr=False)
+    """The value whose use list contains the use, if any."""
 
-@dataclass
+    _prev_use: Optional[Use] = field(default=None, init=False, repr=False)
+    """The previous use in the use list of the value."""
+
+    _next_use: Optional[Use] = field(default=None, init=False, repr=False)
+    """The next use in the use list of the value."""
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Use) and other.operation is self.operation \
+            and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.operation), self.index))
+
+
+class ValueUses:
+    """
+    A read-only, set-like view over the uses of a SSA value.
+    Iteration follows the intrusive use list of the value, and supports
+    removing the current use while iterating.
+    """
+
+    def __init__(self, value: SSAValue):
+        self._value = value
+
+    def __len__(self) -> int:
+        return self._value._num_uses
+
+    def __bool__(self) -> bool:
+        return self._value._first_use is not None
+
+    def __iter__(self) -> typing.Iterator[Use]:
+        use = self._value._first_use
+        while use is not None:
+            next_use = use._next_use
+            yield use
+            use = next_use
+
+    def __contains__(self, use: Any) -> bool:
+        return self._value._find_use(use) is not None
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ValueUses):
+            other = set(other)
+        if not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        return len(self) == len(other) and set(self) == other
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+    def copy(self) -> Set[Use]:
+        """Get the uses in a new set."""
+        return set(self)
+
+
+@_slotted_dataclass()
 class SSAValue(ABC):
     """A reference to an SSA variable.
     An SSA variable is either an operation result, or a basic block argument."""
@@ -66,11 +272,19 @@ class SSAValue(ABC):
     typ: Attribute
     """Each SSA variable is associated to a type."""
 
-    uses: Set[Use] = field(init=False, default_factory=set, repr=False)
-    """All uses of the value."""
-
     name: Optional[str] = field(init=False, default=None)
 
+    _first_use: Optional[Use] = field(init=False, default=None, repr=False)
+    """The first use of the intrusive use list of the value."""
+
+    _num_uses: int = field(init=False, default=0, repr=False)
+    """The number of uses of the value."""
+
+    @property
+    def uses(self) -> ValueUses:
+        """All uses of the value."""
+        return ValueUses(self)
+
     @staticmethod
     def get(arg: SSAValue | Operation) -> SSAValue:
         """Get a new SSAValue from either a SSAValue, or an operation with a single result."""
@@ -85,19 +299,79 @@ class SSAValue(ABC):
             f"Expected SSAValue or Operation for SSAValue.get, but got {arg}")
 
     def add_use(self, use: Use):
-        """Add a new use of the value."""
-        self.uses.add(use)
+        """Link a use that is not linked to any value in the use list of the value."""
+        assert use._value is None, "use is already in a use list"
+        use._value = self
+        next_use = self._first_use
+        use._next_use = next_use
+        if next_use is not None:
+            next_use._prev_use = use
+        self._first_use = use
+        self._num_uses += 1
+
+    def _find_use(self, use: Any) -> Optional[Use]:
+        """
+        Get the use of the value that is equal to a use, if any.
+        The use is either linked itself, or equal to the use of the operand
+        it refers to.
+        """
+        if not isinstance(use, Use):
+            return None
+        if use._value is self:
+            return use
+        operand_uses = use.operation._operand_uses
+        if use.index < len(operand_uses):
+            operand_use = operand_uses[use.index]
+            if operand_use._value is self:
+                return operand_use
+        return None
 
     def remove_use(self, use: Use):
-        """Remove a use of the value."""
-        assert use in self.uses, "use to be removed was not in use list"
-        self.uses.remove(use)
+        """Unlink a use from the use list of the value."""
+        use = self._find_use(use)
+        assert use is not None, "use to be removed was not in use list"
+        prev_use, next_use = use._prev_use, use._next_use
+        if prev_use is None:
+            self._first_use = next_use
+        else:
+            prev_use._next_use = next_use
+        if next_use is not None:
+            next_use._prev_use = prev_use
+        use._prev_use = use._next_use = use._value = None
+        self._num_uses -= 1
+
+    def replace_all_uses_with(self, value: SSAValue) -> None:
+        """
+        Replace the value by another value in all its uses, in time linear
+        in the number of uses. The use list of the value is spliced at the
+        head of the use list of the other value.
+        """
+        if value is self:
+            return
+        first_use = self._first_use
+        if first_use is None:
+            return
+        use = first_use
+        while True:
+            use._value = value
+            operation = use.operation
+            operation._operands[use.index] = value
+            operation._frozen_operands = None
+            operation.mark_dirty()
+            if use._next_use is None:
+                break
+            use = use._next_use
+        use._next_use = value._first_use
+        if value._first_use is not None:
+            value._first_use._prev_use = use
+        value._first_use = first_use
+        value._num_uses += self._num_uses
+        self._first_use = None
+        self._num_uses = 0
 
     def replace_by(self, value: SSAValue) -> None:
         """Replace the value by another value in all its uses."""
-        for use in self.uses.copy():
-            use.operation.replace_operand(use.index, value)
-        assert len(self.uses) == 0, "unexpected error in xdsl"
+        self.replace_all_uses_with(value)
 
     def erase(self, safe_erase: bool = True) -> None:
         """
@@ -105,13 +379,13 @@ class SSAValue(ABC):
         If safe_erase is True, then check that no operations use the value anymore.
         If safe_erase is False, then replace its uses by an ErasedSSAValue.
         """
-        if safe_erase and len(self.uses) != 0:
+        if safe_erase and self._first_use is not None:
             raise Exception(
                 "Attempting to delete SSA value that still has uses.")
         self.replace_by(ErasedSSAValue(self.typ, self))
 
 
-@dataclass
+@_slotted_dataclass()
 class OpResult(SSAValue):
     """A reference to an SSA variable defined by an operation result."""
 
@@ -125,14 +399,11 @@ class OpResult(SSAValue):
         return f"OpResult(typ={repr(self.typ)}, num_uses={repr(len(self.uses))}" + \
             f", op_name={repr(self.op.name)}, result_index={repr(self.result_index)}, name={repr(self.name)})"
 
-    def __eq__(self, other):
-        return self is other
-
-    def __hash__(self):
-        return id(self)
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
 
-@dataclass
+@_slotted_dataclass()
 class BlockArgument(SSAValue):
     """A reference to an SSA variable defined by a basic block argument."""
 
@@ -151,14 +422,11 @@ class BlockArgument(SSAValue):
             f", block={block_repr}," \
             " index={repr(self.index)}"
 
-    def __eq__(self, other):
-        return self is other
-
-    def __hash__(self):
-        return id(self)
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
 
-@dataclass
+@_slotted_dataclass()
 class ErasedSSAValue(SSAValue):
     """
     An erased SSA variable.
@@ -173,25 +441,124 @@ class ErasedSSAValue(SSAValue):
 
 AttrClass = TypeVar('AttrClass', bound='Attribute')
 
+_uniqued_attributes: weakref.WeakValueDictionary[
+    Tuple, Attribute] = weakref.WeakValueDictionary()
+"""
+The attribute uniquing table, mapping attribute storage keys to the live
+attribute with that storage.
+It is global rather than owned by an MLContext, since attributes are
+constructed without a context.
+"""
+
+_attribute_init_fields: Dict[typing.Type[Attribute], Tuple[str, ...]] = {}
+"""The names of the fields of each attribute class set by its constructor."""
+
+
+def _get_attribute_init_fields(cls: typing.Type[Attribute]) -> Tuple[str, ...]:
+    init_fields = _attribute_init_fields.get(cls)
+    if init_fields is None:
+        init_fields = tuple(f.name for f in fields(cls) if f.init)
+        _attribute_init_fields[cls] = init_fields
+    return init_fields
+
+
+class AttributeMeta(ABCMeta):
+    """
+    The attribute metaclass, that uniques attributes on construction.
+    Constructing an attribute structurally equal to a live attribute returns
+    that attribute, so uniqued attributes can be compared by identity.
+    Attributes whose storage is not hashable are not uniqued.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        # Look up the table before constructing (and verifying) the attribute
+        args_key = None
+        init_fields = _attribute_init_fields.get(cls)
+        if init_fields is None:
+            init_fields = _get_attribute_init_fields(cls)
+        if (not kwargs and len(args) == len(init_fields)
+                and cls._lookup_by_arguments):
+            if len(args) == 1:
+                arg = args[0]
+                args_key = (cls, tuple(arg) if type(arg) is list else arg)
+            else:
+                args_key = (cls, *(tuple(arg) if type(arg) is list else arg
+                                   for arg in args))
+            try:
+                attr = _uniqued_attributes.get(args_key)
+            except TypeError:
+                args_key = None
+            else:
+                if attr is not None:
+                    return attr
+
+        attr = super().__call__(*args, **kwargs)
+        key = attr._storage_key()
+        try:
+            uniqued_attr = _uniqued_attributes.setdefault(key, attr)
+        except TypeError:
+            return attr
+        if uniqued_attr is attr:
+            object.__setattr__(attr, "_is_uniqued", True)
+        if args_key is not None and args_key != key:
+            _uniqued_attributes[args_key] = uniqued_attr
+        return uniqued_attr
+
 
 @dataclass(frozen=True)
-class Attribute(ABC):
+class Attribute(ABC, metaclass=AttributeMeta):
     """
     A compile-time value.
     Attributes are used to represent SSA variable types, and can be attached
     on operations to give extra information.
+    Attributes are immutable, and are uniqued on construction.
     """
 
     name: str = field(default="", init=False)
     """The attribute name should be a static field in the attribute classes."""
 
+    _is_uniqued = False
+    """Is the attribute the unique instance of its storage."""
+
+    _lookup_by_arguments = True
+    """
+    Look up the uniquing table with the constructor arguments, before
+    constructing the attribute. This should be disabled for attributes
+    constructed from large arguments, which would be kept alive as keys.
+    """
+
+    def _storage_key(self) -> Tuple:
+        """The values identifying the attribute in the uniquing table."""
+        return (type(self),
+                *(getattr(self, name)
+                  for name in _get_attribute_init_fields(type(self))))
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if type(self) is not type(other):
+            return False
+        # Two different uniqued attributes are never equal
+        if self._is_uniqued and other._is_uniqued:
+            return False
+        return self._storage_key() == other._storage_key()
+
+    def __hash__(self) -> int:
+        if self._is_uniqued:
+            return id(self)
+        return hash(self._storage_key())
+
+    def __reduce__(self):
+        # Go through the constructor, so unpickled attributes are uniqued.
+        return type(self), self._storage_key()[1:]
+
     @classmethod
     def build(cls: typing.Type[AttrClass], *args) -> AttrClass:
         """Create a new attribute using one of the builder defined in IRDL."""
         assert False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Data(Attribute):
     """An attribute represented by a Python structure."""
 
@@ -207,30 +574,40 @@ class Data(Attribute):
         ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class ParametrizedAttribute(Attribute):
     """An attribute parametrized by other attributes."""
 
     name: str = field(default="", init=False)
-    parameters: List[Attribute] = field(default_factory=list)
+    parameters: Tuple[Attribute, ...] = field(default_factory=tuple)
 
     def __post_init__(self):
+        if not isinstance(self.parameters, tuple):
+            object.__setattr__(self, "parameters", tuple(self.parameters))
         self.verify()
 
     def verify(self) -> None:
         ...
 
 
-@dataclass
+@_slotted_dataclass()
 class Operation:
     """A generic operation. Operation definitions inherit this class."""
 
-    name: str = field(default="", init=False)
+    name: ClassVar[str] = ""
     """The operation name. Should be a static member of the class"""
 
-    _operands: FrozenList[SSAValue] = field(default_factory=FrozenList)
+    _operands: List[SSAValue] = field(default_factory=list)
     """The operation operands."""
 
+    _frozen_operands: Optional[FrozenList[SSAValue]] = field(init=False,
+                                                             default=None,
+                                                             repr=False)
+    """
+    A frozen copy of the operands, returned by `operands`. It is rebuilt on
+    the first access after the operands are modified.
+    """
+
     results: List[OpResult] = field(default_factory=list)
     """The results created by the operation."""
 
@@ -249,6 +626,33 @@ class Operation:
     parent: Optional[Block] = field(default=None, repr=False)
     """The block containing this operation."""
 
+    _operand_uses: List[Use] = field(default_factory=list,
+                                     init=False,
+                                     repr=False)
+    """The use of each operand, linked in the use list of the operand value."""
+
+    _prev_op: Optional[Operation] = field(default=None, init=False, repr=False)
+    """The previous operation in the parent block."""
+
+    _next_op: Optional[Operation] = field(default=None, init=False, repr=False)
+    """The next operation in the parent block."""
+
+    _order_idx: int = field(default=_INVALID_ORDER_IDX, init=False, repr=False)
+    """
+    A number that increases along the operations of the parent block.
+    It is assigned lazily, and is only meaningful if the parent block order
+    is valid.
+    """
+
+    _is_dirty: bool = field(default=True, init=False, repr=False)
+    """Was the operation modified since it was last verified."""
+
+    _has_dirty_descendants: bool = field(default=False, init=False, repr=False)
+    """
+    May an operation nested in the operation regions be dirty.
+    The dirty operations are recorded in the `_dirty_ops` of their block.
+    """
+
     def parent_block(self) -> Optional[Block]:
         return self.parent
 
@@ -258,20 +662,106 @@ class Operation:
     def parent_region(self) -> Optional[Region]:
         return self.parent.parent if self.parent else None
 
+    @property
+    def prev_op(self) -> Optional[Operation]:
+        """The operation before this one in the parent block, if any."""
+        return self._prev_op
+
+    @property
+    def next_op(self) -> Optional[Operation]:
+        """The operation after this one in the parent block, if any."""
+        return self._next_op
+
+    def is_before_in_block(self, other_op: Operation) -> bool:
+        """
+        Returns true if this operation is before another operation in the same
+        block. The block order indices are computed lazily, so this is O(1)
+        amortized.
+        """
+        block = self.parent
+        if block is None or other_op.parent is not block:
+            raise Exception(
+                "Expected two operations contained in the same block.")
+        if not block._is_op_order_valid:
+            block._recompute_op_order()
+        else:
+            if self._order_idx == _INVALID_ORDER_IDX:
+                self._update_order_if_necessary()
+            if other_op._order_idx == _INVALID_ORDER_IDX:
+                other_op._update_order_if_necessary()
+        return self._order_idx < other_op._order_idx
+
+    def _update_order_if_necessary(self) -> None:
+        """
+        Assign an order index to the operation from its neighbours indices,
+        or recompute the order of the entire block if there is no room left.
+        The parent block order should be valid.
+        """
+        prev_op, next_op = self._prev_op, self._next_op
+        if prev_op is None and next_op is None:
+            self._order_idx = _ORDER_STRIDE
+            return
+
+        # Last operation of the block
+        if next_op is None:
+            if prev_op._order_idx == _INVALID_ORDER_IDX:
+                return self.parent._recompute_op_order()
+            self._order_idx = prev_op._order_idx + _ORDER_STRIDE
+            return
+
+        # First operation of the block
+        if prev_op is None:
+            next_order = next_op._order_idx
+            if next_order == _INVALID_ORDER_IDX or next_order == 0:
+                return self.parent._recompute_op_order()
+            if next_order <= _ORDER_STRIDE:
+                self._order_idx = next_order // 2
+            else:
+                self._order_idx = _ORDER_STRIDE
+            return
+
+        # Otherwise, use the middle of the previous and next indices
+        prev_order, next_order = prev_op._order_idx, next_op._order_idx
+        if (prev_order == _INVALID_ORDER_IDX
+                or next_order == _INVALID_ORDER_IDX
+                or prev_order + 1 >= next_order):
+            return self.parent._recompute_op_order()
+        self._order_idx = prev_order + (next_order - prev_order) // 2
+
     @property
     def operands(self) -> FrozenList[SSAValue]:
-        return self._operands
+        operands = self._frozen_operands
+        if operands is None:
+            operands = FrozenList(self._operands)
+            operands.freeze()
+            self._frozen_operands = operands
+        return operands
 
     @operands.setter
     def operands(self, new: Union[List[SSAValue], FrozenList[SSAValue]]):
-        if isinstance(new, list):
-            new = FrozenList(new)
-        for idx, operand in enumerate(self._operands):
-            operand.remove_use(Use(self, idx))
+        # Relink the existing uses of the operands, and only allocate uses
+        # for the new operands
+        operand_uses = self._operand_uses
+        num_uses = len(operand_uses)
         for idx, operand in enumerate(new):
-            operand.add_use(Use(self, idx))
-        self._operands = new
-        self._operands.freeze()
+            if idx < num_uses:
+                use = operand_uses[idx]
+                if use._value is operand:
+                    continue
+                if use._value is not None:
+                    use._value.remove_use(use)
+            else:
+                use = Use(self, idx)
+                operand_uses.append(use)
+            operand.add_use(use)
+        if len(new) < num_uses:
+            for use in operand_uses[len(new):]:
+                if use._value is not None:
+                    use._value.remove_use(use)
+            del operand_uses[len(new):]
+        self._operands = list(new)
+        self._frozen_operands = None
+        self.mark_dirty()
 
     def __post_init__(self):
         assert (self.name != "")
@@ -326,10 +816,20 @@ class Operation:
         ...
 
     def replace_operand(self, operand_idx: int, new_operand: SSAValue) -> None:
-        """Replace an operand with another operand."""
-        self.operands = list(self._operands[:operand_idx]) + [
-            new_operand
-        ] + list(self._operands[operand_idx + 1:])
+        """
+        Replace an operand with another operand, only relinking the use of
+        the replaced operand.
+        """
+        use = self._operand_uses[operand_idx]
+        old_operand = use._value
+        if old_operand is new_operand:
+            return
+        if old_operand is not None:
+            old_operand.remove_use(use)
+        new_operand.add_use(use)
+        self._operands[operand_idx] = new_operand
+        self._frozen_operands = None
+        self.mark_dirty()
 
     def add_region(self, region: Region) -> None:
         """Add an unattached region to the operation."""
@@ -338,6 +838,54 @@ class Operation:
                 "Cannot add region that is already attached on an operation.")
         self.regions.append(region)
         region.parent = self
+        self.mark_dirty()
+        self._mark_descendants_dirty()
+        _notify_ir_added(region)
+
+    def mark_dirty(self) -> None:
+        """
+        Mark the operation as modified, so it is verified again by
+        `verify_incremental`.
+        This is done by the IR mutation methods, and should only be called
+        after modifying the operation in place, for instance its attributes.
+        Modifying the successors of an operation in place also invalidates
+        the control-flow analyses of its region, such as dominance, once it
+        is marked.
+        """
+        self._is_dirty = True
+        self._notify_parent_dirty()
+        if self.parent is not None and (self.successors
+                                        or self._next_op is None):
+            self.parent._mark_cfg_changed()
+
+    def _mark_descendants_dirty(self) -> None:
+        """Mark that an operation nested in the operation may be dirty."""
+        self._has_dirty_descendants = True
+        self._notify_parent_dirty()
+
+    def _notify_parent_dirty(self) -> None:
+        """
+        Record the dirty operation in its parent block, and propagate the
+        information to its ancestors. Ancestors are already notified if the
+        operation is already recorded in its block.
+        """
+        op = self
+        while True:
+            block = op.parent
+            if block is None or op in block._dirty_ops:
+                return
+            block._dirty_ops.add(op)
+            region = block.parent
+            if region is None or region.parent is None:
+                return
+            op = region.parent
+            op._has_dirty_descendants = True
+
+    def _mark_users_dirty(self) -> None:
+        """Mark the operations using the operation results as modified."""
+        for result in self.results:
+            for use in result.uses:
+                use.operation.mark_dirty()
 
     def drop_all_references(self) -> None:
         """
@@ -345,25 +893,58 @@ class Operation:
         This function is called prior to deleting an operation.
         """
         self.parent = None
-        for idx, operand in enumerate(self.operands):
-            operand.remove_use(Use(self, idx))
+        for use in self._operand_uses:
+            if use._value is not None:
+                use._value.remove_use(use)
         for region in self.regions:
             region.drop_all_references()
 
-    def walk(self, fun: Callable[[Operation], None]) -> None:
-        """Call a function on all operations contained in the operation (including this one)"""
-        fun(self)
-        for region in self.regions:
-            region.walk(fun)
+    def walk(self,
+             fun: Optional[Union[Callable[[Operation], None],
+                                 WalkOpType]] = None,
+             *,
+             reverse: bool = False,
+             post_order: bool = False) -> Optional[OpWalker]:
+        """
+        Iterate over the operations contained in the operation, including
+        this one. If an operation type or a tuple of operation types is
+        given, only the operations of these types are yielded.
+        If a function is given instead, call it on all the operations.
+        """
+        return _walk(fun, (self, ), reverse, post_order)
 
     def verify(self, verify_nested_ops: bool = True) -> None:
         for operand in self.operands:
             if isinstance(operand, ErasedSSAValue):
                 raise Exception("Erased SSA value is used by the operation")
         self.verify_()
+        self._is_dirty = False
         if verify_nested_ops:
             for region in self.regions:
                 region.verify()
+            self._has_dirty_descendants = False
+
+    def verify_incremental(self) -> None:
+        """
+        Verify only the operations that were modified since they were last
+        verified, and the operations around them: their parent operation,
+        and the users of their results. Operations that were never verified
+        count as modified.
+        Modifications that do not go through the IR methods, such as setting
+        an attribute, are not tracked. Call `mark_dirty` on the modified
+        operation, or `verify` to verify everything.
+        """
+        if self._is_dirty:
+            self.verify(verify_nested_ops=False)
+        if self._has_dirty_descendants:
+            for region in self.regions:
+                for block in region.blocks:
+                    if block.parent is not region:
+                        raise Exception(
+                            "Parent pointer of block does not refer to containing region"
+                        )
+                    block.verify_incremental()
+            self._has_dirty_descendants = False
 
     def verify_(self) -> None:
         pass
@@ -381,6 +962,61 @@ class Operation:
                            successors=successors,
                            regions=regions)
 
+    def clone(
+            self: OperationType,
+            value_mapper: Optional[Dict[SSAValue, SSAValue]] = None,
+            block_mapper: Optional[Dict[Block,
+                                        Block]] = None) -> OperationType:
+        """
+        Clone an operation with its regions, in time linear in the size of
+        the operation. The attributes are shared with the original operation.
+        Operands and successors are replaced by their value in the mappers,
+        and kept otherwise. The mappers are updated with the results, the
+        blocks, and the block arguments of the clone, so that the uses of the
+        original values can be rewired.
+        """
+        if value_mapper is None:
+            value_mapper = {}
+        if block_mapper is None:
+            block_mapper = {}
+        unmapped_operands: List[Tuple[Operation, int, SSAValue]] = []
+        op = self._clone(value_mapper, block_mapper, unmapped_operands)
+        _map_forward_references(value_mapper, unmapped_operands)
+        return op
+
+    def _clone(
+        self: OperationType, value_mapper: Dict[SSAValue, SSAValue],
+        block_mapper: Dict[Block, Block],
+        unmapped_operands: List[Tuple[Operation, int,
+                                      SSAValue]]) -> OperationType:
+        """
+        Clone an operation with its regions, and record the operands that
+        were not mapped yet, as they may be defined later in the clone.
+        """
+        operands = [
+            value_mapper.get(operand, operand) for operand in self._operands
+        ]
+        successors = [
+            block_mapper.get(successor, successor)
+            for successor in self.successors
+        ]
+        op = self.create(operands=operands,
+                         result_types=[result.typ for result in self.results],
+                         attributes=self.attributes.copy(),
+                         successors=successors)
+        for idx, operand in enumerate(self._operands):
+            if operands[idx] is operand:
+                unmapped_operands.append((op, idx, operand))
+        for result, new_result in zip(self.results, op.results):
+            value_mapper[result] = new_result
+        for region in self.regions:
+            new_region = Region()
+            for block in region._clone_blocks(value_mapper, block_mapper,
+                                              unmapped_operands):
+                new_region.add_block(block)
+            op.add_region(new_region)
+        return op
+
     def erase(self, safe_erase=True, drop_references=True) -> None:
         """
         Erase the operation, and remove all its references to other operations.
@@ -412,29 +1048,279 @@ class Operation:
             return False
         return self.is_ancestor(op.parent)
 
-    def __eq__(self, other: Operation) -> bool:
-        return self is other
+    # Compare by identity, using the builtin methods rather than Python
+    # functions, as operations, blocks and values are used as dictionary keys
+    # by most analyses.
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+
+def _map_forward_references(
+        value_mapper: Dict[SSAValue, SSAValue],
+        unmapped_operands: List[Tuple[Operation, int, SSAValue]]) -> None:
+    """
+    Replace the operands of cloned operations that were not mapped when the
+    operations were cloned, as they were defined later in the clone.
+    """
+    for op, idx, operand in unmapped_operands:
+        new_operand = value_mapper.get(operand)
+        if new_operand is not None:
+            op.replace_operand(idx, new_operand)
+
+
+WalkOpType = Union[typing.Type[Operation], Tuple[typing.Type[Operation], ...]]
+
+
+def _region_ops(region: Region, reverse: bool) -> typing.Iterator[Operation]:
+    """Iterate over the operations of the blocks of a region."""
+    if reverse:
+        for block in reversed(region.blocks):
+            yield from reversed(block.ops)
+    else:
+        for block in region.blocks:
+            yield from block.ops
 
-    def __hash__(self) -> int:
-        return id(self)
 
+def _push_nested_blocks(stack: List[Tuple[Optional[Operation],
+                                          typing.Iterator[Operation]]],
+                        op: Operation, reverse: bool) -> None:
+    """
+    Push on a walk stack an iterator over the operations of each block nested
+    in an operation, such that the first block to walk is on top.
+    """
+    blocks = [block for region in op.regions for block in region.blocks]
+    if reverse:
+        for block in blocks:
+            stack.append((None, reversed(block.ops)))
+    else:
+        for block in reversed(blocks):
+            stack.append((None, iter(block.ops)))
+
+
+class OpWalker:
+    """
+    An iterator over nested operations, that walks the IR iteratively.
+    In pre-order, an operation is yielded before its nested operations, and
+    `skip_children` can be called to skip the operations nested in the last
+    yielded operation. In post-order, an operation is yielded after them.
+    The walk can be interrupted at any point by stopping the iteration.
+    The operation being yielded can be detached or erased, but the operations
+    that follow it in the walk should not be.
+    """
+
+    def __init__(self,
+                 roots: typing.Iterable[Operation],
+                 op_type: Optional[WalkOpType] = None,
+                 reverse: bool = False,
+                 post_order: bool = False):
+        self._op_type = op_type
+        self._reverse = reverse
+        self._post_order = post_order
+        self._skip_children = False
+        self._walk = (self._walk_post_order(roots)
+                      if post_order else self._walk_pre_order(roots))
+
+    def __iter__(self) -> OpWalker:
+        return self
+
+    def __next__(self) -> Operation:
+        return next(self._walk)
+
+    def skip_children(self) -> None:
+        """Do not walk the operations nested in the last yielded operation."""
+        if self._post_order:
+            raise ValueError(
+                "Cannot skip the children of an operation in a post-order walk"
+            )
+        self._skip_children = True
+
+    def _walk_pre_order(
+            self,
+            roots: typing.Iterable[Operation]) -> typing.Iterator[Operation]:
+        op_type, reverse = self._op_type, self._reverse
+        stack: List[Tuple[Optional[Operation],
+                          typing.Iterator[Operation]]] = [(None, iter(roots))]
+        while stack:
+            op = next(stack[-1][1], None)
+            if op is None:
+                stack.pop()
+                continue
+            if op_type is None or isinstance(op, op_type):
+                self._skip_children = False
+                yield op
+                if self._skip_children:
+                    continue
+            if op.regions:
+                _push_nested_blocks(stack, op, reverse)
+
+    def _walk_post_order(
+            self,
+            roots: typing.Iterable[Operation]) -> typing.Iterator[Operation]:
+        op_type, reverse = self._op_type, self._reverse
+        # The operations with regions are pushed with an empty iterator, and
+        # yielded when popped, after the iterators of their blocks.
+        stack: List[Tuple[Optional[Operation],
+                          typing.Iterator[Operation]]] = [(None, iter(roots))]
+        while stack:
+            parent, ops = stack[-1]
+            op = next(ops, None)
+            if op is not None:
+                if op.regions:
+                    stack.append((op, iter(())))
+                    _push_nested_blocks(stack, op, reverse)
+                elif op_type is None or isinstance(op, op_type):
+                    yield op
+                continue
+            stack.pop()
+            if parent is not None and (op_type is None
+                                       or isinstance(parent, op_type)):
+                yield parent
+
+
+def _walk(fun: Optional[Union[Callable[[Operation], None],
+                              WalkOpType]], roots: typing.Iterable[Operation],
+          reverse: bool, post_order: bool) -> Optional[OpWalker]:
+    """
+    Walk operations from the given roots. If `fun` is a function, call it on
+    each operation. Otherwise, return an iterator over the operations
+    of type `fun`, or of any type if `fun` is None.
+    """
+    if fun is None or isinstance(fun, (type, tuple)):
+        return OpWalker(roots, fun, reverse, post_order)
+    for op in OpWalker(roots, None, reverse, post_order):
+        fun(op)
+    return None
+
+
+class BlockOps:
+    """
+    A read-only, list-like view over the operations of a block.
+    Iteration follows the intrusive linked list of the block, and supports
+    detaching or erasing the current operation while iterating.
+    Indexing walks the list, and is linear in the index.
+    """
 
-@dataclass(eq=False)
+    def __init__(self, block: Block):
+        self._block = block
+
+    def __len__(self) -> int:
+        return self._block._num_ops
+
+    def __bool__(self) -> bool:
+        return self._block._first_op is not None
+
+    def __iter__(self) -> typing.Iterator[Operation]:
+        op = self._block._first_op
+        while op is not None:
+            next_op = op._next_op
+            yield op
+            op = next_op
+
+    def __reversed__(self) -> typing.Iterator[Operation]:
+        op = self._block._last_op
+        while op is not None:
+            prev_op = op._prev_op
+            yield op
+            op = prev_op
+
+    def __contains__(self, op: Any) -> bool:
+        return isinstance(op, Operation) and op.parent is self._block
+
+    @typing.overload
+    def __getitem__(self, index: int) -> Operation:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> List[Operation]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return list(self)[index]
+        num_ops = self._block._num_ops
+        if index < 0:
+            index += num_ops
+        if index < 0 or index >= num_ops:
+            raise IndexError("block operation index out of range")
+        # Walk from the closest end of the list
+        if index <= num_ops // 2:
+            op = self._block._first_op
+            for _ in range(index):
+                op = op._next_op
+        else:
+            op = self._block._last_op
+            for _ in range(num_ops - index - 1):
+                op = op._prev_op
+        return op
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, BlockOps):
+            other = list(other)
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def index(self, op: Operation) -> int:
+        """Get the operation position in the block."""
+        return self._block.get_operation_index(op)
+
+    def copy(self) -> List[Operation]:
+        """Get the operations in a new list."""
+        return list(self)
+
+
+@_slotted_dataclass(eq=False)
 class Block:
     """A sequence of operations"""
 
     _args: FrozenList[BlockArgument] = field(default_factory=list, init=False)
     """The basic block arguments."""
 
-    ops: List[Operation] = field(default_factory=list, init=False)
-    """Ordered operations contained in the block."""
+    _first_op: Optional[Operation] = field(default=None,
+                                           init=False,
+                                           repr=False)
+    """The first operation of the block."""
+
+    _last_op: Optional[Operation] = field(default=None, init=False, repr=False)
+    """The last operation of the block."""
+
+    _num_ops: int = field(default=0, init=False, repr=False)
+    """The number of operations in the block."""
+
+    _is_op_order_valid: bool = field(default=False, init=False, repr=False)
+    """
+    Are the order indices of the operations valid.
+    Operations inserted in a block with a valid order have an invalid index,
+    that is computed lazily from their neighbours.
+    """
 
     parent: Optional[Region] = field(default=None, init=False, repr=False)
     """Parent region containing the block."""
 
+    _dirty_ops: Set[Operation] = field(default_factory=set,
+                                       init=False,
+                                       repr=False)
+    """
+    The operations of the block that were modified since they were last
+    verified, or that contain such operations.
+    """
+
     def parent_op(self) -> Optional[Operation]:
         return self.parent.parent if self.parent else None
 
+    def _mark_parent_op_dirty(self) -> None:
+        """Mark the operation containing the block as modified."""
+        if self.parent is not None and self.parent.parent is not None:
+            self.parent.parent.mark_dirty()
+
+    def _mark_cfg_changed(self) -> None:
+        """Record that the control-flow graph of the parent region may have changed."""
+        if self.parent is not None:
+            self.parent._cfg_version += 1
+
     def parent_region(self) -> Optional[Region]:
         return self.parent
 
@@ -444,6 +1330,21 @@ class Block:
     def __repr__(self) -> str:
         return f"Block(_args={repr(self._args)}, num_ops={len(self.ops)})"
 
+    @property
+    def ops(self) -> BlockOps:
+        """Ordered operations contained in the block."""
+        return BlockOps(self)
+
+    @property
+    def first_op(self) -> Optional[Operation]:
+        """The first operation of the block, if any."""
+        return self._first_op
+
+    @property
+    def last_op(self) -> Optional[Operation]:
+        """The last operation of the block, if any."""
+        return self._last_op
+
     @property
     def args(self) -> FrozenList[BlockArgument]:
         """Returns the block arguments."""
@@ -497,6 +1398,7 @@ class Block:
         self._args = FrozenList(
             list(self._args[:index]) + [new_arg] + list(self._args[index:]))
         self._args.freeze()
+        self._mark_parent_op_dirty()
         return new_arg
 
     def erase_arg(self, arg: BlockArgument, safe_erase: bool = True) -> None:
@@ -512,6 +1414,7 @@ class Block:
             block_arg.index -= 1
         self._args = FrozenList(
             list(self._args[:arg.index]) + list(self._args[arg.index + 1:]))
+        self._mark_parent_op_dirty()
         arg.erase(safe_erase=safe_erase)
 
     def _attach_op(self, operation: Operation) -> None:
@@ -526,13 +1429,67 @@ class Block:
             )
         operation.parent = self
 
+    def _recompute_op_order(self) -> None:
+        """Assign a new order index to all operations of the block."""
+        order_idx = 0
+        op = self._first_op
+        while op is not None:
+            order_idx += _ORDER_STRIDE
+            op._order_idx = order_idx
+            op = op._next_op
+        self._is_op_order_valid = True
+
+    def _link_op_before(self, operation: Operation,
+                        next_op: Optional[Operation]) -> None:
+        """
+        Link an attached operation in the block operation list, before another
+        operation. If `next_op` is None, link it at the end of the block.
+        """
+        operation._order_idx = _INVALID_ORDER_IDX
+        prev_op = self._last_op if next_op is None else next_op._prev_op
+        operation._prev_op = prev_op
+        operation._next_op = next_op
+        if prev_op is None:
+            self._first_op = operation
+        else:
+            prev_op._next_op = operation
+        if next_op is None:
+            self._last_op = operation
+        else:
+            next_op._prev_op = operation
+        self._num_ops += 1
+        if next_op is None or operation.successors:
+            self._mark_cfg_changed()
+        operation.mark_dirty()
+        operation._mark_users_dirty()
+        self._mark_parent_op_dirty()
+        _notify_ir_added(operation)
+
+    def _insert_ops_before(self, ops: Union[Operation, List[Operation]],
+                           next_op: Optional[Operation],
+                           name: Optional[str]) -> None:
+        """
+        Attach and insert operations before an operation of the block, or at
+        the end of the block if `next_op` is None.
+        """
+        if not isinstance(ops, list):
+            ops = [ops]
+        if name:
+            for curr_op in ops:
+                for res in curr_op.results:
+                    res.name = name
+        for op in ops:
+            self._attach_op(op)
+        for op in ops:
+            self._link_op_before(op, next_op)
+
     def add_op(self, operation: Operation) -> None:
         """
         Add an operation at the end of the block.
         The operation should not be attached to another block already.
         """
         self._attach_op(operation)
-        self.ops.append(operation)
+        self._link_op_before(operation, None)
 
     def add_ops(self, ops: List[Operation]) -> None:
         """
@@ -550,19 +1507,39 @@ class Block:
         Insert one or multiple operations at a given index in the block.
         The operations should not be attached to another block.
         """
-        if index < 0 or index > len(self.ops):
+        if index < 0 or index > self._num_ops:
             raise ValueError(
-                f"Can't insert operation in index {index} in a block with {len(self.ops)} operations."
+                f"Can't insert operation in index {index} in a block with {self._num_ops} operations."
             )
-        if not isinstance(ops, list):
-            ops = [ops]
-        if name:
-            for curr_op in ops:
-                for res in curr_op.results:
-                    res.name = name
-        for op in ops:
-            self._attach_op(op)
-        self.ops = self.ops[:index] + ops + self.ops[index:]
+        next_op = None if index == self._num_ops else self.ops[index]
+        self._insert_ops_before(ops, next_op, name)
+
+    def insert_op_before(self,
+                         ops: Union[Operation, List[Operation]],
+                         existing_op: Operation,
+                         name: Optional[str] = None) -> None:
+        """
+        Insert one or multiple operations before an operation of the block.
+        The operations should not be attached to another block.
+        """
+        if existing_op.parent is not self:
+            raise ValueError(
+                "Can't insert operations before an operation of another block."
+            )
+        self._insert_ops_before(ops, existing_op, name)
+
+    def insert_op_after(self,
+                        ops: Union[Operation, List[Operation]],
+                        existing_op: Operation,
+                        name: Optional[str] = None) -> None:
+        """
+        Insert one or multiple operations after an operation of the block.
+        The operations should not be attached to another block.
+        """
+        if existing_op.parent is not self:
+            raise ValueError(
+                "Can't insert operations after an operation of another block.")
+        self._insert_ops_before(ops, existing_op._next_op, name)
 
     def get_operation_index(self, op: Operation) -> int:
         """Get the operation position in a block."""
@@ -578,15 +1555,29 @@ class Block:
         Detach an operation from the block.
         Returns the detached operation.
         """
-        if isinstance(op, Operation):
-            op_idx = self.get_operation_index(op)
-        else:
-            op_idx = op
-            op = self.ops[op_idx]
+        if not isinstance(op, Operation):
+            op = self.ops[op]
         if op.parent is not self:
             raise Exception("Cannot detach operation from a different block.")
+        _notify_ir_removed(op)
         op.parent = None
-        self.ops = self.ops[:op_idx] + self.ops[op_idx + 1:]
+        prev_op, next_op = op._prev_op, op._next_op
+        if prev_op is None:
+            self._first_op = next_op
+        else:
+            prev_op._next_op = next_op
+        if next_op is None:
+            self._last_op = prev_op
+        else:
+            next_op._prev_op = prev_op
+        op._prev_op = None
+        op._next_op = None
+        self._num_ops -= 1
+        if next_op is None or op.successors:
+            self._mark_cfg_changed()
+        self._dirty_ops.discard(op)
+        op._mark_users_dirty()
+        self._mark_parent_op_dirty()
         return op
 
     def erase_op(self, op: Union[int, Operation], safe_erase=True) -> None:
@@ -597,10 +1588,21 @@ class Block:
         op = self.detach_op(op)
         op.erase(safe_erase=safe_erase)
 
-    def walk(self, fun: Callable[[Operation], None]) -> None:
-        """Call a function on all operations contained in the block."""
-        for op in self.ops:
-            op.walk(fun)
+    def walk(self,
+             fun: Optional[Union[Callable[[Operation], None],
+                                 WalkOpType]] = None,
+             *,
+             reverse: bool = False,
+             post_order: bool = False) -> Optional[OpWalker]:
+        """
+        Iterate over the operations contained in the block. If an operation
+        type or a tuple of operation types is given, only the operations of
+        these types are yielded.
+        If a function is given instead, call it on all the operations.
+        """
+        return _walk(fun,
+                     reversed(self.ops) if reverse else self.ops, reverse,
+                     post_order)
 
     def verify(self) -> None:
         for operation in self.ops:
@@ -609,6 +1611,17 @@ class Block:
                     "Parent pointer of operation does not refer to containing region"
                 )
             operation.verify()
+        self._dirty_ops.clear()
+
+    def verify_incremental(self) -> None:
+        """Verify the operations of the block modified since the last verification."""
+        for operation in list(self._dirty_ops):
+            if operation.parent is not self:
+                raise Exception(
+                    "Parent pointer of operation does not refer to containing region"
+                )
+            operation.verify_incremental()
+            self._dirty_ops.discard(operation)
 
     def drop_all_references(self) -> None:
         """
@@ -635,14 +1648,11 @@ class Block:
             return self
         return self.parent.get_toplevel_object()
 
-    def __eq__(self, other: Block) -> bool:
-        return self is other
-
-    def __hash__(self) -> int:
-        return id(self)
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
 
-@dataclass
+@_slotted_dataclass()
 class Region:
     """A region contains a CFG of blocks. Regions are contained in operations."""
 
@@ -652,6 +1662,13 @@ class Region:
     parent: Optional[Operation] = field(default=None, init=False, repr=False)
     """Operation containing the region."""
 
+    _cfg_version: int = field(default=0, init=False, repr=False)
+    """
+    A counter incremented when the control-flow graph of the region may have
+    changed, that is when its blocks, or the terminators of its blocks, are
+    modified. It is used to invalidate the analyses of the region.
+    """
+
     def parent_block(self) -> Optional[Block]:
         return self.parent.parent if self.parent else None
 
@@ -692,7 +1709,7 @@ class Region:
         raise TypeError(f"Can't build a region with argument {arg}")
 
     @property
-    def ops(self) -> List[Operation]:
+    def ops(self) -> BlockOps:
         """
         Get the operations of a single-block region.
         Returns an exception if the region is not single-block.
@@ -712,7 +1729,7 @@ class Region:
         if len(self.blocks) != 1 or len(self.blocks[0].ops) != 1:
             raise ValueError("'op' property of Region class is only available "
                              "for single-operation single-block regions.")
-        return self.blocks[0].ops[0]
+        return self.blocks[0].first_op
 
     def _attach_block(self, block: Block) -> None:
         """Attach a block to the region, and check that it has no parents."""
@@ -723,11 +1740,23 @@ class Region:
             raise ValueError(
                 "Can't add a block to a region contained in the block.")
         block.parent = self
+        _notify_ir_added(block)
+
+    def _mark_parent_dirty(self) -> None:
+        """
+        Mark the operation containing the region as modified, along with its
+        nested operations that may now be dirty.
+        """
+        if self.parent is not None:
+            self.parent.mark_dirty()
+            self.parent._mark_descendants_dirty()
 
     def add_block(self, block: Block) -> None:
         """Add a block to the region."""
         self._attach_block(block)
         self.blocks.append(block)
+        self._mark_parent_dirty()
+        self._cfg_version += 1
 
     def insert_block(self, blocks: Union[Block, List[Block]],
                      index: int) -> None:
@@ -744,6 +1773,8 @@ class Region:
         for block in blocks:
             self._attach_block(block)
         self.blocks = self.blocks[:index] + blocks + self.blocks[index:]
+        self._mark_parent_dirty()
+        self._cfg_version += 1
 
     def get_block_index(self, block: Block) -> int:
         """Get the block position in a region."""
@@ -763,11 +1794,15 @@ class Region:
             block_idx = self.get_block_index(block)
         else:
             block_idx = block
-            op = self.blocks[block_idx]
+            block = self.blocks[block_idx]
         if block.parent is not self:
             raise Exception("Cannot detach block from a different region.")
+        _notify_ir_removed(block)
         block.parent = None
         self.blocks = self.blocks[:block_idx] + self.blocks[block_idx + 1:]
+        self._cfg_version += 1
+        if self.parent is not None:
+            self.parent.mark_dirty()
         return block
 
     def erase_block(self, block: Union[int, Block], safe_erase=True) -> None:
@@ -778,10 +1813,69 @@ class Region:
         block = self.detach_block(block)
         block.erase(safe_erase=safe_erase)
 
-    def walk(self, fun: Callable[[Operation], None]) -> None:
-        """Call a function on all operations contained in the region."""
+    def clone_into(self,
+                   dest: Region,
+                   index: Optional[int] = None,
+                   value_mapper: Optional[Dict[SSAValue, SSAValue]] = None,
+                   block_mapper: Optional[Dict[Block, Block]] = None) -> None:
+        """
+        Clone the blocks of the region into another region, at a given block
+        index, or at the end of the region. The cloning is done in time linear
+        in the size of the region, and the attributes are shared with the
+        original operations.
+        Operands and successors are replaced by their value in the mappers,
+        and kept otherwise. The mappers are updated with the blocks, the
+        block arguments and the operation results of the clone, so that the
+        uses of the original values can be rewired.
+        """
+        if value_mapper is None:
+            value_mapper = {}
+        if block_mapper is None:
+            block_mapper = {}
+        unmapped_operands: List[Tuple[Operation, int, SSAValue]] = []
+        blocks = self._clone_blocks(value_mapper, block_mapper,
+                                    unmapped_operands)
+        _map_forward_references(value_mapper, unmapped_operands)
+        if index is None:
+            index = len(dest.blocks)
+        dest.insert_block(blocks, index)
+
+    def _clone_blocks(
+        self, value_mapper: Dict[SSAValue,
+                                 SSAValue], block_mapper: Dict[Block, Block],
+        unmapped_operands: List[Tuple[Operation, int,
+                                      SSAValue]]) -> List[Block]:
+        """
+        Clone the blocks of the region, without attaching them to a region,
+        and record the operands that were not mapped yet.
+        """
+        # Map all the blocks first, as successors may refer to later blocks
+        new_blocks: List[Block] = []
         for block in self.blocks:
-            block.walk(fun)
+            new_block = Block.from_arg_types([arg.typ for arg in block.args])
+            block_mapper[block] = new_block
+            for arg, new_arg in zip(block.args, new_block.args):
+                value_mapper[arg] = new_arg
+            new_blocks.append(new_block)
+        for block, new_block in zip(self.blocks, new_blocks):
+            for op in block.ops:
+                new_block.add_op(
+                    op._clone(value_mapper, block_mapper, unmapped_operands))
+        return new_blocks
+
+    def walk(self,
+             fun: Optional[Union[Callable[[Operation], None],
+                                 WalkOpType]] = None,
+             *,
+             reverse: bool = False,
+             post_order: bool = False) -> Optional[OpWalker]:
+        """
+        Iterate over the operations contained in the region. If an operation
+        type or a tuple of operation types is given, only the operations of
+        these types are yielded.
+        If a function is given instead, call it on all the operations.
+        """
+        return _walk(fun, _region_ops(self, reverse), reverse, post_order)
 
     def verify(self) -> None:
         for block in self.blocks:
@@ -809,10 +1903,18 @@ class Region:
 
     def move_blocks(self, region: Region) -> None:
         """Move the blocks of this region to another region. Leave no blocks in this region."""
+        for block in self.blocks:
+            _notify_ir_removed(block)
         region.blocks = self.blocks
         self.blocks = []
+        self._cfg_version += 1
+        region._cfg_version += 1
         for block in region.blocks:
             block.parent = region
+            _notify_ir_added(block)
+        if self.parent is not None:
+            self.parent.mark_dirty()
+        region._mark_parent_dirty()
 
     def get_toplevel_object(self) -> Union[Operation, Block, Region]:
         """Get the operation, block, or region ancestor that has no parents."""
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import inspect
+import operator
+import weakref
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Union, TypeVar
+from typing import Callable, List, Sequence, Tuple, Optional, Union, TypeVar
 from inspect import isclass
 import typing
 
-from xdsl.ir import Operation, Attribute, ParametrizedAttribute, SSAValue, Data, Region, Block
+from xdsl.ir import (Operation, Attribute, ParametrizedAttribute, SSAValue,
+                     Data, Region, Block, _slotted_dataclass)
 from xdsl import util
 
 from xdsl.diagnostic import Diagnostic
@@ -225,7 +228,7 @@ class OptResultDef(VarResultDef, OptionalDef):
     """An IRDL optional result definition."""
 
 
-@dataclass
+@_slotted_dataclass()
 class RegionDef(Region):
     """
     An IRDL region definition.
@@ -235,7 +238,7 @@ class RegionDef(Region):
     blocks: List[Block] = field(default_factory=list)
 
 
-@dataclass
+@_slotted_dataclass()
 class SingleBlockRegionDef(RegionDef):
     """An IRDL region definition that expects exactly one block."""
     pass
@@ -264,14 +267,38 @@ class OptAttributeDef(AttributeDef):
         super().__init__(typ)
 
 
-def get_variadic_sizes(op: Operation, is_operand: bool) -> List[int]:
-    """Get variadic sizes of operands or results."""
+def get_segment_sizes(op: Operation, size_attribute_name: str,
+                      num_defs: int) -> List[int]:
+    """
+    Get the sizes of the operand or result definitions of an operation,
+    stored in the given segment sizes attribute.
+    """
 
     # We need irdl to define DenseIntOrFPElementsAttr, but here we need
     # DenseIntOrFPElementsAttr.
     # So we have a circular dependency that we solve by importing in this function.
     from xdsl.dialects.builtin import DenseIntOrFPElementsAttr
 
+    attribute = op.attributes.get(size_attribute_name)
+    if attribute is None:
+        raise Exception(
+            f"Expected {size_attribute_name} attribute in {op.name} operation."
+        )
+    if not isinstance(attribute, DenseIntOrFPElementsAttr):
+        raise Exception(
+            f"{size_attribute_name} attribute is expected to be a DenseIntOrFPElementsAttr."
+        )
+    sizes = attribute.get_values()
+    if len(sizes) != num_defs:
+        raise Exception(
+            f"expected {num_defs} values in {size_attribute_name}, but got {len(sizes)}"
+        )
+    return sizes
+
+
+def get_variadic_sizes(op: Operation, is_operand: bool) -> List[int]:
+    """Get variadic sizes of operands or results."""
+
     operand_or_result_defs = op.irdl_operand_defs if is_operand else op.irdl_result_defs
     variadic_defs = [(arg_name, arg_def)
                      for arg_name, arg_def in operand_or_result_defs
@@ -285,24 +312,8 @@ def get_variadic_sizes(op: Operation, is_operand: bool) -> List[int]:
     attribute_option = AttrSizedOperandSegments(
     ) if is_operand else AttrSizedResultSegments()
     if attribute_option in options:
-        size_attribute_name = AttrSizedOperandSegments.attribute_name if is_operand else AttrSizedResultSegments.attribute_name
-        if size_attribute_name not in op.attributes:
-            raise Exception(
-                f"Expected {size_attribute_name} attribute in {op.name} operation."
-            )
-        attribute = op.attributes[size_attribute_name]
-        if not isinstance(attribute, DenseIntOrFPElementsAttr):
-            raise Exception(
-                f"{size_attribute_name} attribute is expected to be a DenseIntOrFPElementsAttr."
-            )
-        variadic_sizes = [
-            size_attr.value.data for size_attr in attribute.data.data
-        ]
-        if len(variadic_sizes) != len(operand_or_result_defs):
-            raise Exception(
-                f"expected {len(operand_or_result_defs)} values in {size_attribute_name}, but got {len(variadic_sizes)}"
-            )
-        return variadic_sizes
+        return get_segment_sizes(op, attribute_option.attribute_name,
+                                 len(operand_or_result_defs))
 
     # If there are no variadics arguments, we just check that we have the right number of arguments
     if len(variadic_defs) == 0:
@@ -316,7 +327,7 @@ def get_variadic_sizes(op: Operation, is_operand: bool) -> List[int]:
     if len(variadic_defs) == 1:
         if len(op_defs) - len(operand_or_result_defs) + 1 < 0:
             raise Exception(
-                f"Expected at least {len(operand_or_result_defs) - 1} {def_type_name}s, got {len(operand_or_result_defs)}"
+                f"Expected at least {len(operand_or_result_defs) - 1} {def_type_name}s, got {len(op_defs)}"
             )
         return [len(op_defs) - len(operand_or_result_defs) + 1]
 
@@ -325,116 +336,323 @@ def get_variadic_sizes(op: Operation, is_operand: bool) -> List[int]:
     assert False
 
 
-def get_operand_or_result(
-        op: Operation, arg_def_idx: int, previous_var_args: int,
-        is_operand: bool
-) -> Union[SSAValue, Optional[SSAValue], List[SSAValue]]:
+def irdl_build_accessors(defs: Sequence[Tuple[str, OperandOrResultDef]],
+                         is_operand: bool,
+                         options: Sequence[IRDLOption]) -> List[property]:
     """
-    Get an operand or a result.
-    In the case of a variadic operand or result definition, return a list of operand or results.
-    :param op: The operation we want to get the operand or result of.
-    :param arg_def_idx: The operand or result index in the irdl definition.
-    :param previous_var_args: The number of previous variadic operands or results definition before this definition.
-    :param is_operand: Do we get the operand or the result.
-    :return:
+    Build the properties accessing the operands or results of an operation by
+    the name of their definition.
+    Without a segment sizes attribute, the definitions before the variadic
+    one are accessed with a constant index, and the ones after it with a
+    constant index from the end.
+    Otherwise, the segment offsets are computed once per segment sizes
+    attribute, and cached until the attribute is replaced.
     """
-    argument_defs = op.irdl_operand_defs if is_operand else op.irdl_result_defs
-    op_arguments = op.operands if is_operand else op.results
+    num_defs = len(defs)
+    values_name = "_operands" if is_operand else "results"
+    get_values = operator.attrgetter(values_name)
+
+    attribute_option = AttrSizedOperandSegments(
+    ) if is_operand else AttrSizedResultSegments()
+    if attribute_option in options:
+        size_attribute_name = attribute_option.attribute_name
+        # Attributes are immutable, so the offsets of a segment sizes
+        # attribute never change.
+        offsets_cache: weakref.WeakKeyDictionary[
+            Attribute, List[int]] = weakref.WeakKeyDictionary()
+
+        def get_offsets(op: Operation) -> List[int]:
+            attribute = op.attributes.get(size_attribute_name)
+            if attribute is not None:
+                offsets = offsets_cache.get(attribute)
+                if offsets is not None:
+                    return offsets
+            offsets = [0]
+            for size in get_segment_sizes(op, size_attribute_name, num_defs):
+                offsets.append(offsets[-1] + size)
+            offsets_cache[attribute] = offsets
+            return offsets
+
+        def segment_accessor(idx: int, def_: OperandOrResultDef) -> property:
+            if isinstance(def_, OptionalDef):
+
+                def get_optional(op: Operation) -> Optional[SSAValue]:
+                    offsets = get_offsets(op)
+                    if offsets[idx] == offsets[idx + 1]:
+                        return None
+                    return get_values(op)[offsets[idx]]
+
+                return property(get_optional)
+            if isinstance(def_, VariadicDef):
+
+                def get_variadic(op: Operation) -> List[SSAValue]:
+                    offsets = get_offsets(op)
+                    return get_values(op)[offsets[idx]:offsets[idx + 1]]
+
+                return property(get_variadic)
+            return property(lambda op: get_values(op)[get_offsets(op)[idx]])
+
+        return [
+            segment_accessor(idx, def_) for idx, (_, def_) in enumerate(defs)
+        ]
 
-    variadic_sizes = get_variadic_sizes(op, is_operand)
+    variadic_indices = [
+        idx for idx, (_, def_) in enumerate(defs)
+        if isinstance(def_, VariadicDef)
+    ]
+    if len(variadic_indices) > 1:
+        raise Exception(
+            f"Operation defines more than two variadic {'operands' if is_operand else 'results'}, "
+            f"but do not define the {type(attribute_option).__name__} option")
+    variadic_idx = variadic_indices[0] if variadic_indices else num_defs
+    num_after = num_defs - variadic_idx - 1
 
-    begin_arg = arg_def_idx - previous_var_args + sum(
-        variadic_sizes[:previous_var_args])
-    if isinstance(argument_defs[arg_def_idx][1], OptionalDef):
-        arg_size = variadic_sizes[previous_var_args]
-        if arg_size == 0:
-            return None
-        else:
-            return op_arguments[begin_arg]
-    if isinstance(argument_defs[arg_def_idx][1], VariadicDef):
-        arg_size = variadic_sizes[previous_var_args]
-        return op_arguments[begin_arg:begin_arg + arg_size]
-    else:
-        return op_arguments[begin_arg]
+    def accessor(idx: int, def_: OperandOrResultDef) -> property:
+        if idx != variadic_idx:
+            position = idx if idx < variadic_idx else idx - num_defs
+            if is_operand:
+                return property(lambda op: op._operands[position])
+            return property(lambda op: op.results[position])
+        if isinstance(def_, OptionalDef):
 
+            def get_optional(op: Operation) -> Optional[SSAValue]:
+                values = get_values(op)
+                if len(values) != num_defs:
+                    return None
+                return values[idx]
 
-def irdl_op_verify(op: Operation, operands: List[Tuple[str, OperandDef]],
-                   results: List[Tuple[str, ResultDef]],
-                   regions: List[Tuple[str, RegionDef]],
-                   attributes: List[Tuple[str, AttributeDef]]) -> None:
-    """Given an IRDL definition, verify that an operation satisfies its invariants."""
-
-    # Verify operands.
-    # get_variadic_sizes already verify that the variadic operand sizes match the number of operands.
-    operand_sizes = get_variadic_sizes(op, is_operand=True)
-    current_operand = 0
-    current_var_operand = 0
-    for operand_name, operand_def in operands:
-        if isinstance(operand_def, VarOperandDef):
-            for i in range(operand_sizes[current_var_operand]):
-                operand_def.constr.verify(op.operands[current_operand].typ)
-                current_operand += 1
-        else:
-            try:
-                operand_def.constr.verify(op.operands[current_operand].typ)
-            except Exception as e:
-                error(
-                    op,
-                    f"Operand {operand_name} at operand position {current_operand} (counted from zero) does not verify!\n{e}"
-                )
+            return property(get_optional)
 
-            current_operand += 1
-
-    # Verify results
-    # get_variadic_sizes already verify that the variadic result sizes match the number of results.
-    result_sizes = get_variadic_sizes(op, is_operand=False)
-    current_result = 0
-    current_var_result = 0
-    for result_name, result_def in results:
-        if isinstance(result_def, VarResultDef):
-            for i in range(result_sizes[current_var_result]):
-                result_def.constr.verify(op.results[current_result].typ)
-                current_result += 1
-        else:
-            result_def.constr.verify(op.results[current_result].typ)
-            current_result += 1
+        def get_variadic(op: Operation) -> List[SSAValue]:
+            values = get_values(op)
+            return values[idx:len(values) - num_after]
 
-    if len(regions) != len(op.regions):
-        raise Exception(
-            f"op has {len(op.regions)} regions, but {len(regions)} were expected"
-        )
+        return property(get_variadic)
 
-    for idx, (region_name, region_def) in enumerate(regions):
-        if isinstance(
-                region_def,
-                SingleBlockRegionDef) and len(op.regions[idx].blocks) != 1:
-            raise Exception(
-                f"region {region_name} at position {idx} should have a single block, but got {len(op.regions[idx].blocks)} blocks"
+    return [accessor(idx, def_) for idx, (_, def_) in enumerate(defs)]
+
+
+def get_constraint_verifier(
+        constr: AttrConstraint) -> Optional[Callable[[Attribute], None]]:
+    """
+    Get the function checking that an attribute satisfies a constraint,
+    or None if the constraint is satisfied by all attributes.
+    """
+    if type(constr) is AnyAttr:
+        return None
+
+    if type(constr) is BaseAttr:
+        # Cache the attribute types satisfying the constraint, to avoid
+        # the cost of isinstance on abstract classes.
+        satisfying_types = set()
+
+        def verify_base(attr: Attribute) -> None:
+            if type(attr) not in satisfying_types:
+                constr.verify(attr)
+                satisfying_types.add(type(attr))
+
+        return verify_base
+
+    if type(constr) is EqAttrConstraint:
+        expected = constr.attr
+
+        def verify_eq(attr: Attribute) -> None:
+            if attr is not expected:
+                constr.verify(attr)
+
+        return verify_eq
+
+    return constr.verify
+
+
+def irdl_operands_or_results_verifier(
+        defs: Sequence[Tuple[str, OperandOrResultDef]], is_operand: bool,
+        options: Sequence[IRDLOption]) -> Callable[[Operation], None]:
+    """
+    Generate the function verifying the operands or results of an operation
+    against their IRDL definitions.
+    The position of each definition is computed when generating the function,
+    unless the sizes are given by a segment sizes attribute.
+    """
+    def_type_name = "operand" if is_operand else "result"
+    num_defs = len(defs)
+    checks = [(name, get_constraint_verifier(def_.constr),
+               isinstance(def_, VariadicDef), isinstance(def_, OptionalDef))
+              for name, def_ in defs]
+
+    def verify_value(op: Operation, name: str, position: int,
+                     verify: Callable[[Attribute],
+                                      None], value: SSAValue) -> None:
+        try:
+            verify(value.typ)
+        except Exception as e:
+            if not is_operand:
+                raise
+            error(
+                op,
+                f"Operand {name} at operand position {position} (counted from zero) does not verify!\n{e}"
             )
-        if region_def.block_args is not None:
-            if len(op.regions[idx].blocks) == 0:
+
+    attribute_option = AttrSizedOperandSegments(
+    ) if is_operand else AttrSizedResultSegments()
+    if attribute_option in options:
+        size_attribute_name = attribute_option.attribute_name
+
+        def verify_segments(op: Operation) -> None:
+            values = op.operands if is_operand else op.results
+            sizes = get_segment_sizes(op, size_attribute_name, num_defs)
+            if sum(sizes) != len(values):
                 raise Exception(
-                    f"region {region_name} at position {idx} should have at least one block"
+                    f"Expected {sum(sizes)} {def_type_name}s from {size_attribute_name}, but got {len(values)}"
                 )
-            expected_num_args = len(region_def.block_args)
-            num_args = len(op.regions[idx].blocks[0].args)
-            if num_args != expected_num_args:
+            begin = 0
+            for (name, verify, is_variadic,
+                 is_optional), size in zip(checks, sizes):
+                if (not is_variadic and size != 1) or (is_optional
+                                                       and size > 1):
+                    raise Exception(
+                        f"{def_type_name} {name} expects {'at most' if is_optional else 'exactly'} one value, but {size_attribute_name} gives {size}"
+                    )
+                if verify is not None:
+                    for position in range(begin, begin + size):
+                        verify_value(op, name, position, verify,
+                                     values[position])
+                begin += size
+
+        return verify_segments
+
+    variadic_indices = [
+        idx for idx, (_, _, is_variadic, _) in enumerate(checks) if is_variadic
+    ]
+
+    if not variadic_indices:
+        # The values are at the position of their definition.
+        fixed_checks = [(idx, name, verify)
+                        for idx, (name, verify, _, _) in enumerate(checks)
+                        if verify is not None]
+
+        def verify_fixed(op: Operation) -> None:
+            values = op.operands if is_operand else op.results
+            if len(values) != num_defs:
+                raise Exception(
+                    f"Expected {num_defs} {def_type_name}s, but got {len(values)}"
+                )
+            for idx, name, verify in fixed_checks:
+                try:
+                    verify(values[idx].typ)
+                except Exception as e:
+                    if not is_operand:
+                        raise
+                    error(
+                        op,
+                        f"Operand {name} at operand position {idx} (counted from zero) does not verify!\n{e}"
+                    )
+
+        return verify_fixed
+
+    # There is a single variadic definition, which takes all the values that
+    # are not taken by the other definitions. The values after it are
+    # indexed from the end.
+    variadic_idx, = variadic_indices
+    num_after = num_defs - variadic_idx - 1
+    _, variadic_verify, _, _ = checks[variadic_idx]
+    single_checks = [(idx if idx < variadic_idx else idx - num_defs, name,
+                      verify)
+                     for idx, (name, verify, _, _) in enumerate(checks)
+                     if idx != variadic_idx and verify is not None]
+
+    def verify_variadic(op: Operation) -> None:
+        values = op.operands if is_operand else op.results
+        num_values = len(values)
+        if num_values < num_defs - 1:
+            raise Exception(
+                f"Expected at least {num_defs - 1} {def_type_name}s, got {num_values}"
+            )
+        for idx, name, verify in single_checks:
+            verify_value(op, name, idx % num_values, verify, values[idx])
+        if variadic_verify is not None:
+            for value in values[variadic_idx:num_values - num_after]:
+                variadic_verify(value.typ)
+
+    return verify_variadic
+
+
+def irdl_op_verifier(
+        operands: Sequence[Tuple[str, OperandDef]],
+        results: Sequence[Tuple[str, ResultDef]],
+        regions: Sequence[Tuple[str, RegionDef]],
+        attributes: Sequence[Tuple[str, AttributeDef]],
+        options: Sequence[IRDLOption]) -> Callable[[Operation], None]:
+    """
+    Given an IRDL definition, generate the function verifying that an
+    operation satisfies its invariants.
+    """
+    verify_operands = irdl_operands_or_results_verifier(
+        operands, True, options)
+    verify_results = irdl_operands_or_results_verifier(results, False, options)
+
+    num_regions = len(regions)
+    region_checks = [
+        (idx, region_name, isinstance(region_def, SingleBlockRegionDef),
+         None if region_def.block_args is None else len(region_def.block_args))
+        for idx, (region_name, region_def) in enumerate(regions)
+        if isinstance(region_def, SingleBlockRegionDef)
+        or region_def.block_args is not None
+    ]
+
+    attribute_checks = [(attr_name, get_constraint_verifier(attr_def.constr),
+                         isinstance(attr_def, OptAttributeDef))
+                        for attr_name, attr_def in attributes]
+
+    def verify(op: Operation) -> None:
+        verify_operands(op)
+        verify_results(op)
+
+        op_regions = op.regions
+        if len(op_regions) != num_regions:
+            raise Exception(
+                f"op has {len(op_regions)} regions, but {num_regions} were expected"
+            )
+        for idx, region_name, single_block, num_block_args in region_checks:
+            blocks = op_regions[idx].blocks
+            if single_block and len(blocks) != 1:
                 raise Exception(
-                    f"region {region_name} at position {idx} should have {expected_num_args} argument, but got {num_args}"
+                    f"region {region_name} at position {idx} should have a single block, but got {len(blocks)} blocks"
                 )
-            for arg_idx, arg_type in enumerate(op.regions[idx].blocks[0].args):
-                typ = op.regions[idx].blocks[0].args[arg_idx]
-                if arg_type != typ:
+            if num_block_args is not None:
+                if len(blocks) == 0:
                     raise Exception(
-                        f"argument at position {arg_idx} in region {region_name} at position {idx} should be of type {arg_type}, but {typ}"
+                        f"region {region_name} at position {idx} should have at least one block"
+                    )
+                num_args = len(blocks[0].args)
+                if num_args != num_block_args:
+                    raise Exception(
+                        f"region {region_name} at position {idx} should have {num_block_args} argument, but got {num_args}"
                     )
 
-    for attr_name, attr_def in attributes:
-        if attr_name not in op.attributes:
-            if isinstance(attr_def, OptAttributeDef):
-                continue
-            raise Exception(f"attribute {attr_name} expected")
-        attr_def.constr.verify(op.attributes[attr_name])
+        op_attributes = op.attributes
+        for attr_name, verify_attr, is_optional in attribute_checks:
+            attr = op_attributes.get(attr_name)
+            if attr is None:
+                if is_optional:
+                    continue
+                raise Exception(f"attribute {attr_name} expected")
+            if verify_attr is not None:
+                verify_attr(attr)
+
+    return verify
+
+
+def irdl_op_verify(op: Operation, operands: List[Tuple[str, OperandDef]],
+                   results: List[Tuple[str, ResultDef]],
+                   regions: List[Tuple[str, RegionDef]],
+                   attributes: List[Tuple[str, AttributeDef]]) -> None:
+    """
+    Given an IRDL definition, verify that an operation satisfies its invariants.
+    Operation definitions use a verifier generated once by `irdl_op_verifier`.
+    """
+    irdl_op_verifier(operands, results, regions, attributes,
+                     op.irdl_options)(op)
 
 
 def irdl_build_attribute(irdl_def: AttrConstraint, result) -> Attribute:
@@ -567,30 +785,17 @@ def irdl_op_definition(
     options = clsdict.get("irdl_options", [])
     new_attrs = dict()
 
-    # Add operand access fields
-    previous_variadics = 0
-    for operand_idx, (operand_name, operand_def) in enumerate(operand_defs):
-        new_attrs[operand_name] = property(
-            lambda self, idx=operand_idx, previous_vars=previous_variadics:
-            get_operand_or_result(self, idx, previous_vars, True))
-        if isinstance(operand_def, VarOperandDef):
-            previous_variadics += 1
-    if previous_variadics > 1 and AttrSizedOperandSegments() not in options:
-        raise Exception(
-            "Operation defines more than two variadic operands, "
-            "but do not define the AttrSizedOperandSegments option")
-
-    # Add result access fields
-    previous_variadics = 0
-    for result_idx, (result_name, result_def) in enumerate(result_defs):
-        new_attrs[result_name] = property(
-            lambda self, idx=result_idx, previous_vars=previous_variadics:
-            get_operand_or_result(self, idx, previous_vars, False))
-        if isinstance(result_def, VarResultDef):
-            previous_variadics += 1
-    if previous_variadics > 1 and AttrSizedResultSegments() not in options:
-        raise Exception("Operation defines more than two variadic results, "
-                        "but do not define the AttrSizedResultSegments option")
+    # Add operand and result access fields
+    for (operand_name,
+         _), accessor in zip(operand_defs,
+                             irdl_build_accessors(operand_defs, True,
+                                                  options)):
+        new_attrs[operand_name] = accessor
+    for (result_name,
+         _), accessor in zip(result_defs,
+                             irdl_build_accessors(result_defs, False,
+                                                  options)):
+        new_attrs[result_name] = accessor
 
     for region_idx, (region_name, _) in enumerate(region_defs):
         new_attrs[region_name] = property(
@@ -612,18 +817,18 @@ def irdl_op_definition(
     new_attrs["irdl_attribute_defs"] = attr_defs
     new_attrs["irdl_options"] = options
 
-    new_attrs["verify_"] = lambda op: irdl_op_verify(
-        op, operand_defs, result_defs, region_defs, attr_defs)
+    irdl_verifier = irdl_op_verifier(operand_defs, result_defs, region_defs,
+                                     attr_defs, options)
     if "verify_" in clsdict:
         custom_verifier = clsdict["verify_"]
 
-        def new_verifier(verifier, op):
-            verifier(op)
+        def verify_(op):
+            irdl_verifier(op)
             custom_verifier(op)
 
-        new_attrs["verify_"] = (
-            lambda verifier: lambda op: new_verifier(verifier, op))(
-                new_attrs["verify_"])
+        new_attrs["verify_"] = verify_
+    else:
+        new_attrs["verify_"] = irdl_verifier
 
     def builder(cls,
                 operands=[],
@@ -637,7 +842,31 @@ def irdl_op_definition(
 
     new_attrs["build"] = classmethod(builder)
 
-    return type(cls.__name__, cls.__mro__, {**cls.__dict__, **new_attrs})
+    # The generated class replaces the decorated class, and has no instance
+    # dictionary if its bases have none. This is not possible if a method
+    # refers to the decorated class through `super()`.
+    uses_super = any(
+        _uses_class_cell(member) for member in cls.__dict__.values())
+    if uses_super or "__slots__" in cls.__dict__:
+        return type(cls.__name__, cls.__mro__, {**cls.__dict__, **new_attrs})
+    cls_dict = {
+        name: member
+        for name, member in cls.__dict__.items()
+        if name not in ("__dict__", "__weakref__")
+    }
+    return type(cls.__name__, cls.__bases__, {
+        **cls_dict,
+        **new_attrs, "__slots__": ()
+    })
+
+
+def _uses_class_cell(member: Any) -> bool:
+    """Does a class member refer to its class through `super()` or `__class__`."""
+    member = getattr(member, "__func__", member)
+    if isinstance(member, property):
+        member = member.fget
+    code = getattr(member, "__code__", None)
+    return code is not None and "__class__" in code.co_freevars
 
 
 @dataclass
@@ -685,12 +914,26 @@ def irdl_get_builders(cls) -> List[typing.Callable]:
     return builders
 
 
+_builder_signatures: typing.Dict[typing.Callable, Tuple[List, List, int]] = {}
+"""Cache of the parameter hints, defaults and number of non-defaults of builders."""
+
+
+def irdl_get_builder_signature(builder) -> Tuple[List, List, int]:
+    """Get the parameter hints and defaults of a builder."""
+    signature = _builder_signatures.get(builder)
+    if signature is None:
+        params_dict = typing.get_type_hints(builder)
+        builder_params = inspect.signature(builder).parameters
+        params = [params_dict[param.name] for param in builder_params.values()]
+        defaults = [param.default for param in builder_params.values()]
+        num_non_defaults = defaults.count(inspect.Signature.empty)
+        signature = params, defaults, num_non_defaults
+        _builder_signatures[builder] = signature
+    return signature
+
+
 def irdl_attr_try_builder(builder, *args):
-    params_dict = typing.get_type_hints(builder)
-    builder_params = inspect.signature(builder).parameters
-    params = [params_dict[param.name] for param in builder_params.values()]
-    defaults = [param.default for param in builder_params.values()]
-    num_non_defaults = defaults.count(inspect.Signature.empty)
+    params, defaults, num_non_defaults = irdl_get_builder_signature(builder)
     if num_non_defaults > len(args):
         return None
     for arg, param in zip(args, params[:num_non_defaults]):
@@ -722,7 +965,7 @@ def irdl_data_definition(cls: typing.Type[T]) -> typing.Type[T]:
         )
     new_attrs = dict()
     new_attrs["build"] = lambda *args: irdl_attr_builder(cls, builders, *args)
-    return dataclass(frozen=True)(type(cls.__name__, (cls, ), {
+    return dataclass(frozen=True, eq=False)(type(cls.__name__, (cls, ), {
         **cls.__dict__,
         **new_attrs
     }))
@@ -765,7 +1008,7 @@ def irdl_param_attr_definition(
         )
     new_attrs["build"] = lambda *args: irdl_attr_builder(cls, builders, *args)
 
-    return dataclass(frozen=True)(type(cls.__name__, (cls, ), {
+    return dataclass(frozen=True, eq=False)(type(cls.__name__, (cls, ), {
         **cls.__dict__,
         **new_attrs
     }))
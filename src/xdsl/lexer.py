@@ -0,0 +1,161 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from enum import Enum
+import mmap
+import re
+from typing import Tuple, Union
+
+
+class TokenKind(Enum):
+    BARE_IDENT = "bare_ident"
+    """An identifier such as `arith.addi`."""
+
+    PERCENT_IDENT = "percent_ident"
+    """An SSA value name such as `%0`."""
+
+    CARET_IDENT = "caret_ident"
+    """A block name such as `^bb0`."""
+
+    AT_IDENT = "at_ident"
+    """A symbol reference such as `@main`."""
+
+    EXCLAMATION_IDENT = "exclamation_ident"
+    """An attribute name such as `!i32`."""
+
+    INTEGER = "integer"
+    """A possibly negative decimal integer literal."""
+
+    STRING = "string"
+    """
+    A double-quoted string literal. Escape sequences are kept as is, and are
+    validated by the parser.
+    """
+
+    PUNCTUATION = "punctuation"
+    """Any other single character, including an unterminated `"`."""
+
+    EOF = "eof"
+    """The end of the input."""
+
+
+Input = Union[str, bytes, bytearray, mmap.mmap]
+"""
+The inputs accepted by the lexer: a string, or a UTF-8 encoded binary
+buffer.
+"""
+
+
+@dataclass
+class Token:
+    __slots__ = ("kind", "text", "start")
+
+    kind: TokenKind
+    text: str
+    """The text of the token, including its prefix or quotes."""
+
+    start: int
+    """
+    The offset of the first character of the token in the input, in bytes
+    for binary inputs.
+    """
+
+    @property
+    def end(self) -> int:
+        """The offset right after the token, for string inputs."""
+        return self.start + len(self.text)
+
+
+_token_re = re.compile(
+    r"""
+    \s*(?://[^\n]*\s*)*
+    (?:
+      (?P<punctuation>[()\[\]{}<>,:=])
+    | (?P<string>"(?:[^"\\]|\\[\s\S])*")
+    | (?P<integer>-?\d+)
+    | (?P<bare_ident>[^\W\d][\w.]*)
+    | (?P<percent_ident>%[\w.]+)
+    | (?P<caret_ident>\^[\w.]+)
+    | (?P<at_ident>@[\w.]+)
+    | (?P<exclamation_ident>![\w.]+)
+    | (?P<other_punctuation>.)
+    | (?P<eof>\Z)
+    )
+""", re.VERBOSE | re.DOTALL)
+"""
+Match the next token, after skipping whitespaces and `//` comments.
+The name of the matched group is the value of the token kind. The most
+common punctuation is matched first, as alternatives are tried in order.
+"""
+
+_binary_token_re = re.compile(
+    _token_re.pattern.replace(r"[^\W\d]", r"[a-zA-Z_\x80-\xff]").replace(
+        r"[\w.]", r"[\w.\x80-\xff]").encode(), re.VERBOSE | re.DOTALL)
+"""
+Match the next token of a UTF-8 encoded input. Bytes regular expressions
+only recognize ASCII letters, so the bytes of non-ASCII characters are
+considered letters, and are never split between tokens.
+"""
+
+_token_kinds = {kind.value: kind for kind in TokenKind}
+_token_kinds["other_punctuation"] = TokenKind.PUNCTUATION
+
+
+class Lexer:
+    """
+    Split an input into tokens, one compiled regular expression match per
+    token. Whitespaces and `//` comments are skipped.
+    The input is either a string, or a UTF-8 encoded binary buffer, such as
+    a memory-mapped file. Binary inputs are decoded one token at a time, and
+    their offsets are in bytes.
+    """
+
+    def __init__(self, input: Input, pos: int = 0):
+        self.input: Input = input
+        self._is_binary: bool = not isinstance(input, str)
+        self._token_re = _binary_token_re if self._is_binary else _token_re
+        self._matches = self._token_re.finditer(input, pos)
+        self.pos: int = pos
+        """The offset right after the last lexed token."""
+
+    def reset(self, pos: int) -> None:
+        """Restart lexing at the given offset."""
+        self._matches = self._token_re.finditer(self.input, pos)
+        self.pos = pos
+
+    def get_text(self, start: int, end: int) -> str:
+        """Get the text of the input between two offsets."""
+        if self._is_binary:
+            return self.input[start:end].decode()
+        return self.input[start:end]
+
+    def get_char(self, pos: int) -> Tuple[str, int]:
+        """
+        Get the character at an offset of the input, and the offset of the
+        next character.
+        """
+        if not self._is_binary:
+            return self.input[pos], pos + 1
+        # The leading byte of a UTF-8 sequence gives its length
+        lead = self.input[pos]
+        size = 1 if lead < 0xc0 else 2 if lead < 0xe0 else 3 if lead < 0xf0 else 4
+        return self.input[pos:pos + size].decode(), pos + size
+
+    def lex(self) -> Token:
+        """Return the next token of the input, and advance past it."""
+        match = next(self._matches, None)
+        if match is None:
+            return Token(TokenKind.EOF, "", len(self.input))
+        group = match.lastgroup
+        self.pos = end = match.end()
+        start = match.start(group)
+        text = self.input[start:end]
+        if self._is_binary:
+            text = text.decode()
+        return Token(_token_kinds[group], text, start)
+
+    def __iter__(self):
+        """Iterate over the remaining tokens, excluding the EOF token."""
+        token = self.lex()
+        while token.kind is not TokenKind.EOF:
+            yield token
+            token = self.lex()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from typing import Dict, List, Type, TypeVar, Union, overload
+
+from xdsl.ir import (IRListener, Operation, add_ir_listener, get_ir_listeners,
+                     remove_ir_listener)
+
+OperationInvT = TypeVar('OperationInvT', bound=Operation)
+
+
+class OperationIndex(IRListener):
+    """
+    An index of the operations nested at any depth below a root operation,
+    by operation type. The index is kept up to date as operations are
+    attached and detached below the root, and lists all the operations of a
+    kind in time proportional to their number and to the number of indexed
+    operation types.
+    Operations modified in place are not reindexed, as their type and name
+    cannot change.
+    """
+
+    _ops_by_type: Dict[Type[Operation], Dict[Operation, None]]
+    """
+    The indexed operations, by operation type. Each operation set is a
+    dictionary, to keep the operations in insertion order.
+    """
+
+    def __init__(self) -> None:
+        self._ops_by_type = {}
+
+    @staticmethod
+    def get(root: Operation) -> OperationIndex:
+        """
+        Get the index of the operations nested in an operation, creating it
+        if it does not exist yet.
+        """
+        for listener in get_ir_listeners(root):
+            if isinstance(listener, OperationIndex):
+                return listener
+        index = OperationIndex()
+        for region in root.regions:
+            for op in region.walk():
+                index.operation_added(op)
+        add_ir_listener(root, index)
+        return index
+
+    def remove(self, root: Operation) -> None:
+        """Stop maintaining the index of the operations nested in `root`."""
+        remove_ir_listener(root, self)
+
+    def operation_added(self, op: Operation) -> None:
+        ops = self._ops_by_type.get(type(op))
+        if ops is None:
+            ops = self._ops_by_type[type(op)] = {}
+        ops[op] = None
+
+    def operation_removed(self, op: Operation) -> None:
+        ops = self._ops_by_type.get(type(op))
+        if ops is not None:
+            ops.pop(op, None)
+
+    @overload
+    def get_ops(self, kind: Type[OperationInvT]) -> List[OperationInvT]:
+        ...
+
+    @overload
+    def get_ops(self, kind: str) -> List[Operation]:
+        ...
+
+    def get_ops(self, kind: Union[Type[Operation], str]) -> List[Operation]:
+        """
+        Get the operations of a given type or of its subclasses, or with a
+        given name. The operations of a type are returned in the order they
+        were attached.
+        """
+        if isinstance(kind, str):
+            return [
+                op for op_type, ops in self._ops_by_type.items()
+                if op_type.name == kind for op in ops
+            ]
+        # The index is only looked up by type, as there are few operation
+        # types compared to operations.
+        return [
+            op for op_type, ops in self._ops_by_type.items()
+            if issubclass(op_type, kind) for op in ops
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(ops) for ops in self._ops_by_type.values())
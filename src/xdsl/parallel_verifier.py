@@ -0,0 +1,126 @@
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Tuple
+import multiprocessing
+import os
+import sys
+
+from xdsl.diagnostic import Diagnostic
+from xdsl.ir import Operation
+
+_verified_ops: List[Operation] = []
+"""
+The operations verified by the worker processes. They are inherited by
+forking, rather than pickled.
+"""
+
+
+def is_free_threaded() -> bool:
+    """Is the interpreter running without the global interpreter lock."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _get_error_message(e: Exception) -> str:
+    # Operation verifiers print the entire IR after the message, which is
+    # not repeated for every failure.
+    return str(e).split("\n\n", 1)[0]
+
+
+def _verify_ops(ops: List[Operation], begin: int,
+                end: int) -> List[Tuple[int, str]]:
+    """
+    Verify the operations in a range, and return the index and the error
+    message of those that do not verify.
+    """
+    failures: List[Tuple[int, str]] = []
+    for idx in range(begin, end):
+        try:
+            ops[idx].verify()
+        except Exception as e:
+            failures.append((idx, _get_error_message(e)))
+    return failures
+
+
+def _verify_forked_ops(begin: int, end: int) -> List[Tuple[int, str]]:
+    return _verify_ops(_verified_ops, begin, end)
+
+
+def verify_parallel(op: Operation,
+                    num_workers: Optional[int] = None,
+                    use_threads: Optional[bool] = None) -> None:
+    """
+    Verify an operation, verifying the operations nested directly in its
+    regions in parallel. Each of these operations is verified independently
+    of the others.
+    The operations are verified by forked worker processes, or by threads
+    if `use_threads` is set. By default, threads are only used on
+    free-threaded builds. Operations are verified sequentially if neither
+    forking nor free threading is available.
+    All the failures are reported in a single exception.
+    Operations verified by worker processes are still considered modified by
+    `Operation.verify_incremental`.
+    """
+    global _verified_ops
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if use_threads is None:
+        use_threads = is_free_threaded()
+
+    diagnostic = Diagnostic()
+    try:
+        op.verify(verify_nested_ops=False)
+    except Exception as e:
+        diagnostic.add_message(op, _get_error_message(e))
+
+    ops: List[Operation] = []
+    for region in op.regions:
+        for block in region.blocks:
+            if block.parent is not region:
+                raise Exception(
+                    "Parent pointer of block does not refer to containing region"
+                )
+            for nested_op in block.ops:
+                if nested_op.parent is not block:
+                    raise Exception(
+                        "Parent pointer of operation does not refer to containing region"
+                    )
+                ops.append(nested_op)
+
+    # Use a few chunks per worker, to balance the work
+    num_chunks = min(len(ops), num_workers * 4)
+
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+    if num_workers <= 1 or num_chunks <= 1 or not (use_threads or can_fork):
+        failures = _verify_ops(ops, 0, len(ops))
+    else:
+        bounds = [len(ops) * i // num_chunks for i in range(num_chunks + 1)]
+        begins, ends = bounds[:-1], bounds[1:]
+        executor: Executor
+        if use_threads:
+            executor = ThreadPoolExecutor(max_workers=num_workers)
+            verify_chunk = partial(_verify_ops, ops)
+        else:
+            _verified_ops = ops
+            executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("fork"))
+            verify_chunk = _verify_forked_ops
+        try:
+            with executor:
+                failures = [
+                    failure for chunk_failures in executor.map(
+                        verify_chunk, begins, ends)
+                    for failure in chunk_failures
+                ]
+        finally:
+            _verified_ops = []
+
+    for idx, message in failures:
+        diagnostic.add_message(ops[idx], message)
+    if diagnostic.op_messages:
+        num_failures = sum(
+            len(messages) for messages in diagnostic.op_messages.values())
+        diagnostic.raise_exception(
+            f"{num_failures} operation(s) do not verify", op)
@@ -1,51 +1,101 @@
 from __future__ import annotations
 from xdsl.dialects.builtin import *
-from typing import TypeVar
+from typing import IO, TypeVar
+import mmap
+import os
+import re
+import stat
+from xdsl.lexer import Input, Lexer, Token, TokenKind
 
 indentNumSpaces = 2
 
+_integer_type_re = re.compile(r"i(\d+)")
+"""The `!i32` shorthand for integer types."""
 
-class Parser:
+_invalid_escape_re = re.compile(r'\\[^\\ntr"]')
+
+
+def map_file(f: IO) -> Input:
+    """
+    Get the contents of an opened file, from its current position.
+    A regular file that was not read yet is memory-mapped, so that the file
+    is paged in while it is parsed instead of being copied in memory. Other
+    files, such as pipes or partly read files, are read until their end.
+    """
+    try:
+        if f.tell() == 0 and stat.S_ISREG(os.fstat(f.fileno()).st_mode):
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Empty files cannot be mapped, and streams may have no descriptor
+        # or position
+        pass
+    return f.read()
 
-    def __init__(self, ctx: MLContext, _str: str):
+
+class Parser:
+    """
+    Parse the textual xDSL format.
+    The input is split into tokens by a `Lexer`, and the parser only looks at
+    the next token to decide what to parse.
+    The input is a string, a UTF-8 encoded binary buffer, or the path of a
+    file, which is memory-mapped. The mapping is released with the parser.
+    """
+
+    def __init__(self, ctx: MLContext, _str: Union[Input, os.PathLike]):
+        if isinstance(_str, os.PathLike):
+            with open(_str, "rb") as f:
+                _str = map_file(f)
         self._ctx: MLContext = ctx
-        self._str: str = _str
-        self._idx: int = 0
+        self._str: Input = _str
+        self._lexer: Lexer = Lexer(_str)
+        self._prev_end: int = 0
+        self._current: Token = self._lexer.lex()
         self._ssaValues: Dict[str, SSAValue] = dict()
         self._blocks: Dict[str, Block] = dict()
+        self._integer_types: Dict[str, IntegerType] = dict()
+        """Integer types parsed with the `!iN` shorthand, which are uniqued."""
+
+    def _consume(self) -> Token:
+        """Return the current token, and advance to the next one."""
+        token = self._current
+        self._prev_end = self._lexer.pos
+        self._current = self._lexer.lex()
+        return token
+
+    def _reset_to(self, idx: int) -> None:
+        """Restart lexing at the given offset of the input."""
+        self._lexer.reset(idx)
+        self._prev_end = idx
+        self._current = self._lexer.lex()
 
     def skip_white_space(self) -> None:
-        while self._idx < len(self._str):
-            if self._str[self._idx].isspace():
-                self._idx += 1
-            # TODO: rewrite this hack to support comments
-            elif self._idx < len(self._str) - 1 and self._str[
-                    self._idx] == self._str[self._idx + 1] == '/':
-                self.parse_while(lambda x: x != '\n', False)
-
-            else:
-                return
+        self._prev_end = self._current.start
 
     def parse_while(self,
                     cond: Callable[[str], bool],
                     skip_white_space=True) -> str:
-        if skip_white_space:
-            self.skip_white_space()
-        start_idx = self._idx
-        while self._idx < len(self._str):
-            char = self._str[self._idx]
+        """
+        Parse characters while they satisfy the condition.
+        This works at the character level, and is only kept for the parsing
+        of custom attributes. Prefer the token-based functions.
+        """
+        start_idx = self._current.start if skip_white_space else self._prev_end
+        idx = start_idx
+        while idx < len(self._str):
+            char, next_idx = self._lexer.get_char(idx)
             if not cond(char):
-                return self._str[start_idx:self._idx]
-            self._idx += 1
-        return self._str[start_idx:]
+                break
+            idx = next_idx
+        if idx != start_idx:
+            self._reset_to(idx)
+        return self._lexer.get_text(start_idx, idx)
 
-    # TODO why two different functions, no nums in ident?
     def parse_optional_ident(self, skip_white_space=True) -> Optional[str]:
-        res = self.parse_while(lambda x: x.isalpha() or x == "_" or x == ".",
-                               skip_white_space=skip_white_space)
-        if len(res) == 0:
+        if not skip_white_space and self._current.start != self._prev_end:
             return None
-        return res
+        if self._current.kind is not TokenKind.BARE_IDENT:
+            return None
+        return self._consume().text
 
     def parse_ident(self, skip_white_space=True) -> str:
         res = self.parse_optional_ident(skip_white_space=skip_white_space)
@@ -61,28 +111,18 @@ class Parser:
         return res
 
     def parse_optional_str_literal(self) -> Optional[str]:
-        parsed = self.parse_optional_char('"')
-        if parsed is None:
+        token = self._current
+        if token.kind is not TokenKind.STRING:
+            if token.text == '"':
+                raise Exception("Unexpected end of file")
             return None
-        start_idx = self._idx
-        while self._idx < len(self._str):
-            char = self._str[self._idx]
-            if char == '\\':
-                if self._idx + 1 < len(self._str):
-                    if self._str[self._idx + 1] in ['\\', 'n', 't', 'r', '"']:
-                        self._idx += 1
-                    else:
-                        raise Exception(
-                            f"Unrecognized escaped character: \\{self._str[self._idx + 1]}"
-                        )
-                else:
-                    raise Exception("Unexpected end of file")
-            elif char == '"':
-                break
-            self._idx += 1
-        res = self._str[start_idx:self._idx]
-        self.parse_char('"')
-        return res
+        self._consume()
+        if '\\' in token.text:
+            invalid = _invalid_escape_re.search(token.text)
+            if invalid is not None:
+                raise Exception(
+                    f"Unrecognized escaped character: {invalid.group()}")
+        return token.text[1:-1]
 
     def parse_str_literal(self) -> str:
         res = self.parse_optional_str_literal()
@@ -91,13 +131,11 @@ class Parser:
         return res
 
     def parse_optional_int_literal(self) -> Optional[int]:
-        is_negative = self.parse_optional_char("-")
-        res = self.parse_while(lambda char: char.isnumeric())
-        if len(res) == 0:
-            if is_negative is not None:
+        if self._current.kind is not TokenKind.INTEGER:
+            if self._current.text == "-":
                 raise Exception("int literal expected")
             return None
-        return int(res) if is_negative is None else -int(res)
+        return int(self._consume().text)
 
     def parse_int_literal(self) -> int:
         res = self.parse_optional_int_literal()
@@ -106,19 +144,31 @@ class Parser:
         return res
 
     def peek_char(self, char: str) -> Optional[bool]:
-        self.skip_white_space()
-        if self._idx == len(self._str):
-            return None
-        if self._str[self._idx] == char:
+        if self._current.text[:1] == char:
             return True
         return None
 
+    def _parse_optional_prefixed_ident(self, kind: TokenKind) -> Optional[str]:
+        """
+        Parse an identifier with a prefix character, such as `%0`, and
+        return it without its prefix.
+        """
+        if self._current.kind is not kind:
+            return None
+        return self._consume().text[1:]
+
     def parse_optional_char(self, char: str) -> Optional[bool]:
         assert (len(char) == 1)
-        res = self.peek_char(char)
-        if res:
-            self._idx += 1
-        return res
+        token = self._current
+        if token.text == char and token.kind is TokenKind.PUNCTUATION:
+            self._consume()
+            return True
+        if token.text[:1] != char:
+            return None
+        # The character is the prefix of a longer token, such as the '%' of
+        # an SSA value name. Split the token to only consume the character.
+        self._reset_to(token.start + 1)
+        return True
 
     def parse_char(self, char: str) -> bool:
         assert (len(char) == 1)
@@ -128,12 +178,19 @@ class Parser:
         return True
 
     def parse_string(self, contents: List[str]) -> bool:
-        self.skip_white_space()
+        """
+        Parse the given characters, after skipping whitespaces.
+        This works at the character level, so the characters may span
+        several tokens, or only a part of one.
+        """
+        idx = self._current.start
         for char in contents:
-            if self._idx >= len(self._str):
-                raise Exception("'%s' expected" % str)
-            if self._str[self._idx] == char:
-                self._idx += 1
+            if idx >= len(self._str):
+                raise Exception(f"'{''.join(contents)}' expected")
+            input_char, idx = self._lexer.get_char(idx)
+            if input_char != char:
+                raise Exception(f"'{''.join(contents)}' expected")
+        self._reset_to(idx)
         return True
 
     T = TypeVar('T')
@@ -165,12 +222,11 @@ class Parser:
         return name, BlockArgument(typ, None, 0)
 
     def parse_optional_named_block(self) -> Optional[Block]:
-        if self.parse_optional_char("^") is None:
+        block_name = self._parse_optional_prefixed_ident(TokenKind.CARET_IDENT)
+        if block_name is None:
             return None
-        block_name = self.parse_alpha_num(skip_white_space=False)
-        if block_name in self._blocks:
-            block = self._blocks[block_name]
-        else:
+        block = self._blocks.get(block_name)
+        if block is None:
             block = Block()
             self._blocks[block_name] = block
 
@@ -199,7 +255,7 @@ class Parser:
             return None
         region = Region()
 
-        if self.peek_char("^"):
+        if self._current.kind is TokenKind.CARET_IDENT:
             for block in self.parse_list(self.parse_optional_named_block,
                                          delimiter=""):
                 region.add_block(block)
@@ -211,18 +267,16 @@ class Parser:
         return region
 
     def parse_optional_ssa_name(self) -> Optional[str]:
-        if self.parse_optional_char("%") is None:
-            return None
-        name = self.parse_alpha_num()
-        return name
+        return self._parse_optional_prefixed_ident(TokenKind.PERCENT_IDENT)
 
     def parse_optional_ssa_value(self) -> Optional[SSAValue]:
         name = self.parse_optional_ssa_name()
         if name is None:
             return None
-        if name not in self._ssaValues:
+        value = self._ssaValues.get(name)
+        if value is None:
             raise Exception("name '%s' does not refer to a SSA value" % name)
-        return self._ssaValues[name]
+        return value
 
     def parse_optional_result(self) -> Optional[Tuple[str, Attribute]]:
         name = self.parse_optional_ssa_name()
@@ -267,48 +321,46 @@ class Parser:
         return res
 
     def parse_optional_attribute(self) -> Optional[Attribute]:
+        kind = self._current.kind
+
         # Shorthand for StringAttr
-        string_lit = self.parse_optional_str_literal()
-        if string_lit is not None:
-            return StringAttr.from_str(string_lit)
+        if kind is TokenKind.STRING:
+            return StringAttr.from_str(self.parse_str_literal())
 
         # Shorthand for IntegerAttr
-        integer_lit = self.parse_optional_int_literal()
-        if integer_lit is not None:
-            if self.peek_char(":"):
-                self.parse_char(":")
+        if kind is TokenKind.INTEGER:
+            integer_lit = self.parse_int_literal()
+            if self.parse_optional_char(":"):
                 typ = self.parse_attribute()
             else:
                 typ = IntegerType.from_width(64)
             return IntegerAttr.from_params(integer_lit, typ)
 
         # Shorthand for ArrayAttr
-        parse_bracket = self.parse_optional_char("[")
-        if parse_bracket:
+        if self.parse_optional_char("["):
             array = self.parse_list(self.parse_optional_attribute)
             self.parse_char("]")
             return ArrayAttr.from_list(array)
 
         # Shorthand for FlatSymbolRefAttr
-        parse_at = self.parse_optional_char("@")
-        if parse_at:
-            symbol_name = self.parse_alpha_num(skip_white_space=False)
-            return FlatSymbolRefAttr.from_str(symbol_name)
+        if kind is TokenKind.AT_IDENT:
+            return FlatSymbolRefAttr.from_str(self._consume().text[1:])
 
-        parsed = self.parse_optional_char("!")
-        if parsed is None:
+        if kind is not TokenKind.EXCLAMATION_IDENT:
+            if self._current.text == '"':
+                raise Exception("Unexpected end of file")
             return None
-
-        parsed = self.parse_optional_char("i")
+        attr_def_name = self._consume().text[1:]
 
         # shorthand for integer types
-        if parsed:
-            num = self.parse_optional_int_literal()
-            if num:
-                return IntegerType.from_width(num)
-            attr_def_name = "i" + self.parse_alpha_num(skip_white_space=True)
-        else:
-            attr_def_name = self.parse_alpha_num(skip_white_space=True)
+        integer_type = self._integer_types.get(attr_def_name)
+        if integer_type is not None:
+            return integer_type
+        width = _integer_type_re.fullmatch(attr_def_name)
+        if width is not None and int(width.group(1)) != 0:
+            integer_type = IntegerType.from_width(int(width.group(1)))
+            self._integer_types[attr_def_name] = integer_type
+            return integer_type
 
         attr_def = self._ctx.get_attr(attr_def_name)
         if self.parse_optional_char("<") is None:
@@ -346,14 +398,11 @@ class Parser:
         return {name: attr for (name, attr) in attrs_with_names}
 
     def parse_optional_successor(self) -> Optional[Block]:
-        parsed = self.parse_optional_char("^")
-        if parsed is None:
+        bb_name = self._parse_optional_prefixed_ident(TokenKind.CARET_IDENT)
+        if bb_name is None:
             return None
-        bb_name = self.parse_alpha_num(skip_white_space=False)
-        if bb_name in self._blocks:
-            block = self._blocks[bb_name]
-            pass
-        else:
+        block = self._blocks.get(bb_name)
+        if block is None:
             block = Block()
             self._blocks[bb_name] = block
         return block
@@ -377,7 +426,7 @@ class Parser:
                 return None
             results = []
         else:
-            op_name = self.parse_alpha_num()
+            op_name = self.parse_ident()
 
         operands = self.parse_operands()
         successors = self.parse_successors()
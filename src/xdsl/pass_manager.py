@@ -0,0 +1,189 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, asdict
+from typing import Callable, List, Optional, Type, TextIO
+import json
+import time
+import tracemalloc
+
+from xdsl.dominance import verify_dominance
+from xdsl.ir import MLContext, Operation
+from xdsl.parallel_verifier import verify_parallel
+
+
+@dataclass
+class PassTiming:
+    """The resources used by a single step of a pass manager run."""
+
+    name: str
+    """The name of the pass, or of the verification step."""
+
+    wall_time: float
+    """The elapsed wall-clock time, in seconds."""
+
+    cpu_time: float
+    """The CPU time used by the process, in seconds."""
+
+    peak_memory: int
+    """
+    The peak of memory allocated during the step, in bytes, relative to the
+    memory allocated when the step started.
+    """
+
+
+@dataclass
+class Pass:
+    """A named pass, that can be applied on nested operations."""
+
+    name: str
+    """The name of the pass, used in reports."""
+
+    apply: Callable[[MLContext, Operation], None]
+    """The function applying the pass on an operation."""
+
+    nested_op_type: Optional[Type[Operation]] = field(default=None)
+    """
+    If set, the pass is applied on each operation of this type nested in the
+    operation the pass manager runs on, instead of on the operation itself.
+    """
+
+
+@dataclass(eq=False, repr=False)
+class PassManager:
+    """
+    Run a pipeline of passes on an operation, and optionally verify the
+    operation and record the time and memory used by each step.
+    """
+
+    ctx: MLContext
+
+    passes: List[Pass] = field(default_factory=list)
+    """The passes to run, in order."""
+
+    verify_each: bool = field(default=True)
+    """Verify the operation before the first pass, and after each pass."""
+
+    verify_incremental: bool = field(default=False)
+    """
+    After each pass, only verify the operations that the pass modified through
+    the IR methods, instead of the entire operation.
+    """
+
+    verify_dominance: bool = field(default=False)
+    """
+    When verifying, also check that the definition of every value dominates
+    its uses.
+    """
+
+    verify_jobs: int = field(default=1)
+    """
+    The number of workers verifying the operations nested in the operation
+    in parallel, when verifying the entire operation.
+    """
+
+    time_passes: bool = field(default=False)
+    """
+    Record the wall time, CPU time and peak memory of each pass and each
+    verification. Memory is measured with tracemalloc, which slows down
+    the passes.
+    """
+
+    after_pass: Optional[Callable[[str, Operation],
+                                  None]] = field(default=None)
+    """A function called with the pass name and the operation after each pass."""
+
+    timings: List[PassTiming] = field(default_factory=list, init=False)
+    """The recorded timings of the last run."""
+
+    def add_pass(self,
+                 name: str,
+                 apply: Callable[[MLContext, Operation], None],
+                 nested_op_type: Optional[Type[Operation]] = None) -> None:
+        """Add a pass at the end of the pipeline."""
+        self.passes.append(Pass(name, apply, nested_op_type))
+
+    def run(self, op: Operation) -> None:
+        """Run the pipeline on an operation."""
+        self.timings = []
+        start_tracing = self.time_passes and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+        try:
+            if self.verify_each:
+                self._run_step("verify", lambda: self._verify(op))
+            for pass_ in self.passes:
+                self._run_step(pass_.name, lambda: self._apply_pass(pass_, op))
+                if self.verify_each:
+                    self._run_step(
+                        f"verify after {pass_.name}",
+                        lambda: self._verify(op, self.verify_incremental))
+                if self.after_pass is not None:
+                    self.after_pass(pass_.name, op)
+        finally:
+            if start_tracing:
+                tracemalloc.stop()
+
+    def _verify(self, op: Operation, incremental: bool = False) -> None:
+        if incremental:
+            op.verify_incremental()
+        elif self.verify_jobs > 1:
+            verify_parallel(op, self.verify_jobs)
+        else:
+            op.verify()
+        if self.verify_dominance:
+            verify_dominance(op)
+
+    def _apply_pass(self, pass_: Pass, op: Operation) -> None:
+        if pass_.nested_op_type is None:
+            pass_.apply(self.ctx, op)
+            return
+        # Collect the operations first, since the pass may modify them
+        nested_ops = list(op.walk(pass_.nested_op_type))
+        for nested_op in nested_ops:
+            pass_.apply(self.ctx, nested_op)
+
+    def _run_step(self, name: str, step: Callable[[], None]) -> None:
+        """Run a step of the pipeline, and record its timing if requested."""
+        if not self.time_passes:
+            step()
+            return
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        step()
+        cpu_time = time.process_time() - start_cpu
+        wall_time = time.perf_counter() - start_wall
+        peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+        self.timings.append(
+            PassTiming(name, wall_time, cpu_time, max(peak_memory, 0)))
+
+    def print_timings(self, stream: TextIO, format: str = "table") -> None:
+        """Print the recorded timings, either as a table or as JSON."""
+        total_wall = sum(timing.wall_time for timing in self.timings)
+        total_cpu = sum(timing.cpu_time for timing in self.timings)
+        if format == "json":
+            json.dump(
+                {
+                    "passes": [asdict(timing) for timing in self.timings],
+                    "total": {
+                        "wall_time": total_wall,
+                        "cpu_time": total_cpu
+                    }
+                },
+                stream,
+                indent=2)
+            stream.write("\n")
+            return
+        if format != "table":
+            raise ValueError(f"Unknown pass timing format '{format}'")
+
+        stream.write("Pass execution timing report\n")
+        stream.write(f"{'Wall (s)':>10}  {'CPU (s)':>10}  "
+                     f"{'Peak (KiB)':>10}  Name\n")
+        for timing in self.timings:
+            stream.write(f"{timing.wall_time:>10.4f}  {timing.cpu_time:>10.4f}"
+                         f"  {timing.peak_memory / 1024:>10.1f}  "
+                         f"{timing.name}\n")
+        stream.write(f"{total_wall:>10.4f}  {total_cpu:>10.4f}  "
+                     f"{'':>10}  Total\n")
@@ -2,7 +2,7 @@ from __future__ import annotations
 import inspect
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, Callable, Union, Tuple
+from typing import Dict, List, Optional, Callable, Set, Type, Union, Tuple
 
 from xdsl.dialects.builtin import ModuleOp
 from xdsl.ir import Operation, OpResult, Region, Block, BlockArgument, Attribute
@@ -33,6 +33,40 @@ class PatternRewriter:
     has_done_action: bool = field(default=False, init=False)
     """Has the rewriter done any action during the current match."""
 
+    affected_operations: List[Operation] = field(default_factory=list,
+                                                 init=False)
+    """
+    The operations added or moved by the rewriter, and the operand producers
+    and result users of the replaced or erased operations.
+    Patterns may match these operations again after the rewrite.
+    """
+
+    inserted_operations: List[Operation] = field(default_factory=list,
+                                                 init=False)
+    """
+    The operations inserted by the rewriter, including the replacing
+    operations. Patterns may match their nested operations as well.
+    """
+
+    def notify_op_modified(self, op: Operation) -> None:
+        """
+        Notify the rewriter that an operation was modified in place, for
+        instance its attributes, so that its operand producers and result
+        users are recorded as affected operations.
+        """
+        self.has_done_action = True
+        op.mark_dirty()
+        self._add_affected_neighbours(op)
+
+    def _add_affected_neighbours(self, op: Operation) -> None:
+        """Record the operand producers and the result users of an operation."""
+        for operand in op.operands:
+            if isinstance(operand, OpResult):
+                self.affected_operations.append(operand.op)
+        for result in op.results:
+            self.affected_operations.extend(use.operation
+                                            for use in result.uses)
+
     def _can_modify_op(self, op: Operation) -> bool:
         """Check if the operation and its children can be modified by this rewriter."""
         if op == self.current_operation:
@@ -64,9 +98,10 @@ class PatternRewriter:
         op = op if isinstance(op, list) else [op]
         if len(op) == 0:
             return
-        op_idx = block.get_operation_index(self.current_operation)
-        block.insert_op(op, op_idx)
+        block.insert_op_before(op, self.current_operation)
         self.added_operations_before += op
+        self.affected_operations += op
+        self.inserted_operations += op
 
     def insert_op_after_matched_op(self, op: Union[Operation,
                                                    List[Operation]]):
@@ -79,9 +114,10 @@ class PatternRewriter:
         op = op if isinstance(op, list) else [op]
         if len(op) == 0:
             return
-        op_idx = block.get_operation_index(self.current_operation)
-        block.insert_op(op, op_idx + 1)
+        block.insert_op_after(op, self.current_operation)
         self.added_operations_after += op
+        self.affected_operations += op
+        self.inserted_operations += op
 
     def insert_op_at_pos(self, op: Union[Operation, List[Operation]],
                          block: Block, pos: int):
@@ -93,6 +129,8 @@ class PatternRewriter:
         if len(op) == 0:
             return
         block.insert_op(op, pos)
+        self.affected_operations += op
+        self.inserted_operations += op
 
     def insert_op_before(self, op: Union[Operation, List[Operation]],
                          target_op: Operation):
@@ -107,8 +145,9 @@ class PatternRewriter:
         op = op if isinstance(op, list) else [op]
         if len(op) == 0:
             return
-        target_op.parent.insert_op(op,
-                                   target_block.get_operation_index(target_op))
+        target_block.insert_op_before(op, target_op)
+        self.affected_operations += op
+        self.inserted_operations += op
 
     def insert_op_after(self, op: Union[Operation, List[Operation]],
                         target_op: Operation):
@@ -123,9 +162,9 @@ class PatternRewriter:
         op = op if isinstance(op, list) else [op]
         if len(op) == 0:
             return
-        target_op.parent.insert_op(
-            op,
-            target_block.get_operation_index(target_op) + 1)
+        target_block.insert_op_after(op, target_op)
+        self.affected_operations += op
+        self.inserted_operations += op
 
     def erase_matched_op(self, safe_erase: bool = True):
         """
@@ -135,6 +174,7 @@ class PatternRewriter:
         """
         self.has_done_action = True
         self.has_erased_matched_operation = True
+        self._add_affected_neighbours(self.current_operation)
         Rewriter.erase_op(self.current_operation, safe_erase=safe_erase)
 
     def erase_op(self, op: Operation, safe_erase: bool = True):
@@ -150,6 +190,7 @@ class PatternRewriter:
             raise Exception(
                 "PatternRewriter can only erase operations that are the matched operation"
                 ", or that are contained in the matched operation.")
+        self._add_affected_neighbours(op)
         Rewriter.erase_op(op, safe_erase=safe_erase)
 
     def replace_matched_op(
@@ -167,11 +208,14 @@ class PatternRewriter:
         if not isinstance(new_ops, list):
             new_ops = [new_ops]
         self.has_erased_matched_operation = True
+        self._add_affected_neighbours(self.current_operation)
         Rewriter.replace_op(self.current_operation,
                             new_ops,
                             new_results,
                             safe_erase=safe_erase)
         self.added_operations_before += new_ops
+        self.affected_operations += new_ops
+        self.inserted_operations += new_ops
 
     def replace_op(self,
                    op: Operation,
@@ -192,7 +236,12 @@ class PatternRewriter:
             raise Exception(
                 "PatternRewriter can only replace operations that are the matched operation"
                 ", or that are contained in the matched operation.")
+        if not isinstance(new_ops, list):
+            new_ops = [new_ops]
+        self._add_affected_neighbours(op)
         Rewriter.replace_op(op, new_ops, new_results, safe_erase=safe_erase)
+        self.affected_operations += new_ops
+        self.inserted_operations += new_ops
 
     def modify_block_argument_type(self, arg: BlockArgument,
                                    new_type: Attribute):
@@ -206,6 +255,10 @@ class PatternRewriter:
             )
         self.has_done_action = True
         arg.typ = new_type
+        self.affected_operations.extend(use.operation for use in arg.uses)
+        for use in arg.uses:
+            use.operation.mark_dirty()
+        arg.block._mark_parent_op_dirty()
 
     def insert_block_argument(self, block: Block, index: int,
                               typ: Attribute) -> BlockArgument:
@@ -234,6 +287,7 @@ class PatternRewriter:
                 "Cannot modify blocks that are not contained in the matched operation"
             )
         self.has_done_action = True
+        self.affected_operations.extend(use.operation for use in arg.uses)
         arg.block.erase_arg(arg, safe_erase=safe_erase)
 
     def inline_block_at_pos(self, block: Block, target_block: Block, pos: int):
@@ -248,6 +302,7 @@ class PatternRewriter:
             raise Exception(
                 "Cannot modify blocks that are not contained in the matched operation."
             )
+        self.affected_operations += block.ops
         Rewriter.inline_block_at_pos(block, target_block, pos)
 
     def inline_block_before_matched_op(self, block: Block):
@@ -261,6 +316,7 @@ class PatternRewriter:
                 "Cannot move blocks that are not contained in the matched operation."
             )
         self.added_operations_before += block.ops
+        self.affected_operations += block.ops
         Rewriter.inline_block_before(block, self.current_operation)
 
     def inline_block_before(self, block: Block, op: Operation):
@@ -280,6 +336,7 @@ class PatternRewriter:
             raise Exception(
                 "Cannot move block elsewhere than before the matched operation,"
                 " or before an operation child")
+        self.affected_operations += block.ops
         Rewriter.inline_block_before(block, op)
 
     def inline_block_after(self, block: Block, op: Operation):
@@ -296,6 +353,7 @@ class PatternRewriter:
             raise Exception(
                 "Cannot move blocks that are not contained in the matched operation."
             )
+        self.affected_operations += block.ops
         Rewriter.inline_block_after(block, op)
 
     def move_region_contents_to_new_regions(self, region: Region) -> Region:
@@ -323,6 +381,15 @@ class RewritePattern(ABC):
         """
         ...
 
+    def root_operations(self) -> Optional[Tuple[Type[Operation], ...]]:
+        """
+        The operation types this pattern can match on, or None if it can
+        match on any operation.
+        By default, this is the type given to op_type_rewrite_pattern if it
+        decorates match_and_rewrite, and None otherwise.
+        """
+        return getattr(self.match_and_rewrite, "root_operations", None)
+
 
 @dataclass(eq=False, repr=False)
 class AnonymousRewritePattern(RewritePattern):
@@ -335,11 +402,15 @@ class AnonymousRewritePattern(RewritePattern):
                           rewriter: PatternRewriter) -> None:
         self.func(op, rewriter)
 
+    def root_operations(self) -> Optional[Tuple[Type[Operation], ...]]:
+        return getattr(self.func, "root_operations", None)
+
 
 def op_type_rewrite_pattern(func):
     """
     This function is intended to be used as a decorator on a RewritePatter method.
     It uses type hints to match on a specific operation type before calling the decorated function.
+    The operation type is also exposed as the pattern root operation.
     """
     # Get the operation argument and check that it is a subclass of Operation
     params = [param for param in inspect.signature(func).parameters.values()]
@@ -372,6 +443,8 @@ def op_type_rewrite_pattern(func):
                 return None
             func(op, rewriter)
 
+        op_type_rewrite_pattern_static_wrapper.root_operations = (
+            expected_type, )
         return op_type_rewrite_pattern_static_wrapper
 
     def op_type_rewrite_pattern_method_wrapper(
@@ -380,19 +453,48 @@ def op_type_rewrite_pattern(func):
             return None
         func(self, op, rewriter)
 
+    op_type_rewrite_pattern_method_wrapper.root_operations = (expected_type, )
     return op_type_rewrite_pattern_method_wrapper
 
 
 @dataclass(eq=False, repr=False)
 class GreedyRewritePatternApplier(RewritePattern):
-    """Apply a list of patterns in order until one pattern matches, and then use this rewrite."""
+    """
+    Apply a list of patterns in order until one pattern matches, and then use this rewrite.
+    Only the patterns that can match on the operation type are tried.
+    """
 
     rewrite_patterns: List[RewritePattern]
     """The list of rewrites to apply in order."""
 
+    _patterns_by_op_type: Dict[Type[Operation], List[RewritePattern]] = field(
+        default_factory=dict, init=False)
+    """For each operation type, the patterns that can match on it, in order."""
+
+    def _get_patterns(self, op_type: Type[Operation]) -> List[RewritePattern]:
+        """Get the patterns that can match on an operation type."""
+        patterns = self._patterns_by_op_type.get(op_type)
+        if patterns is None:
+            patterns = []
+            for pattern in self.rewrite_patterns:
+                roots = pattern.root_operations()
+                if roots is None or issubclass(op_type, roots):
+                    patterns.append(pattern)
+            self._patterns_by_op_type[op_type] = patterns
+        return patterns
+
+    def root_operations(self) -> Optional[Tuple[Type[Operation], ...]]:
+        roots: List[Type[Operation]] = []
+        for pattern in self.rewrite_patterns:
+            pattern_roots = pattern.root_operations()
+            if pattern_roots is None:
+                return None
+            roots.extend(pattern_roots)
+        return tuple(roots)
+
     def match_and_rewrite(self, op: Operation,
                           rewriter: PatternRewriter) -> None:
-        for pattern in self.rewrite_patterns:
+        for pattern in self._get_patterns(type(op)):
             pattern.match_and_rewrite(op, rewriter)
             if rewriter.has_done_action:
                 return
@@ -424,10 +526,11 @@ class PatternRewriteWalker:
         """Rewrite an entire module operation."""
         self._rewrite_op(op)
 
-    def _rewrite_op(self, op: Operation) -> int:
+    def _rewrite_op(self, op: Operation) -> bool:
         """
         Rewrite an operation, along with its regions.
-        Returns by how much operations the walker should move.
+        Returns True if the walker should walk again on the operations that
+        are now at the position of the rewritten operation.
         """
         # First, we rewrite the regions if needed
         if self.walk_regions_first:
@@ -438,12 +541,13 @@ class PatternRewriteWalker:
         self.pattern.match_and_rewrite(op, rewriter)
 
         if rewriter.has_done_action:
+            # The pattern may have modified the operation in place
+            if not rewriter.has_erased_matched_operation:
+                op.mark_dirty()
+
             # If we produce new operations, we rewrite them recursively if requested
             if self.apply_recursively:
-                return len(rewriter.added_operations_before) + len(
-                    rewriter.added_operations_after) - int(
-                        rewriter.has_erased_matched_operation
-                    ) if self.walk_reverse else 0
+                return True
             # Else, we rewrite only their regions if they are supposed to be rewritten after
             else:
                 if not self.walk_regions_first:
@@ -453,27 +557,151 @@ class PatternRewriteWalker:
                         self._rewrite_op_regions(op)
                     for new_op in rewriter.added_operations_after:
                         self._rewrite_op_regions(new_op)
-                return -1 if self.walk_reverse else len(
-                    rewriter.added_operations_before) + len(
-                        rewriter.added_operations_after) + int(
-                            not rewriter.has_erased_matched_operation)
+                return False
 
         # Otherwise, we only rewrite the regions of the operation if needed
         if not self.walk_regions_first:
             self._rewrite_op_regions(op)
-        return -1 if self.walk_reverse else 1
+        return False
+
+    def _rewrite_block(self, block: Block):
+        """
+        Rewrite the operations of a block.
+        The rewriter can only modify the matched operation, its children, and
+        insert operations around it, so the neighbours of the matched operation
+        are used to find the next operation to walk on.
+        """
+        if not self.walk_reverse:
+            op = block.first_op
+            while op is not None:
+                prev_op, next_op = op.prev_op, op.next_op
+                if self._rewrite_op(op):
+                    # Walk on the first operation that replaced the matched one
+                    op = block.first_op if prev_op is None else prev_op.next_op
+                else:
+                    op = next_op
+        else:
+            op = block.last_op
+            while op is not None:
+                prev_op, next_op = op.prev_op, op.next_op
+                if self._rewrite_op(op):
+                    # Walk on the last operation that replaced the matched one
+                    op = block.last_op if next_op is None else next_op.prev_op
+                else:
+                    op = prev_op
 
     def _rewrite_op_regions(self, op: Operation):
         """Rewrite the regions of an operation, and update the operation with the new regions."""
         if not self.walk_reverse:
             for region in op.regions:
                 for block in region.blocks:
-                    idx = 0
-                    while idx < len(block.ops):
-                        idx += self._rewrite_op(block.ops[idx])
+                    self._rewrite_block(block)
         else:
             for region in op.regions:
                 for block in reversed(region.blocks):
-                    idx = len(block.ops) - 1
-                    while idx >= 0:
-                        idx += self._rewrite_op(block.ops[idx])
+                    self._rewrite_block(block)
+
+
+@dataclass(eq=False, repr=False)
+class PatternRewriteWorklistDriver:
+    """
+    Rewrite the IR in place until no pattern matches anymore.
+    All operations are first added to a worklist. Each time a pattern
+    rewrites an operation, the operations affected by the rewrite are added
+    back to the worklist, so the work done depends on what was changed, and
+    not on the size of the IR. These are the operations recorded by the
+    rewriter, with the nested operations of the inserted ones, and the
+    operand producers and result users of an operation modified in place.
+    Previous references to the rewritten operations are invalid after the
+    rewrite.
+    """
+
+    pattern: RewritePattern
+    """Pattern to apply on the worklist operations."""
+
+    walk_regions_first: bool = field(default=False)
+    """Choose if the operation regions are first added to the worklist, or the operation itself."""
+
+    max_iterations: Optional[int] = field(default=None)
+    """
+    The maximal number of rewrites to apply, to stop patterns that would
+    otherwise rewrite the IR forever. None means no limit.
+    """
+
+    _worklist: List[Operation] = field(default_factory=list, init=False)
+    """The operations to rewrite, the last one is rewritten first."""
+
+    _worklist_ops: Set[Operation] = field(default_factory=set, init=False)
+    """The operations in the worklist, to avoid adding them twice."""
+
+    def rewrite_module(self, op: ModuleOp) -> bool:
+        """
+        Rewrite an entire module operation.
+        Returns True if no pattern matches anymore, and False if the rewrite
+        stopped because the maximal number of iterations was reached.
+        """
+        self._worklist.clear()
+        self._worklist_ops.clear()
+        self._add_to_worklist(op, nested_ops=True)
+
+        num_rewrites = 0
+        while len(self._worklist) != 0:
+            current_op = self._worklist.pop()
+            self._worklist_ops.remove(current_op)
+            # Skip the operations that were erased by a previous rewrite
+            if current_op.get_toplevel_object() is not op:
+                continue
+
+            if (self.max_iterations is not None
+                    and num_rewrites == self.max_iterations):
+                self._worklist.clear()
+                self._worklist_ops.clear()
+                return False
+
+            rewriter = PatternRewriter(current_op)
+            self.pattern.match_and_rewrite(current_op, rewriter)
+            if not rewriter.has_done_action:
+                continue
+            num_rewrites += 1
+            # The pattern may have modified the operation in place, which
+            # may enable rewrites of its operand producers and result users
+            if not rewriter.has_erased_matched_operation:
+                rewriter.notify_op_modified(current_op)
+
+            # The affected operations are rewritten before the remaining
+            # ones, in the order they were recorded. The nested operations
+            # of the inserted operations were never rewritten, so they are
+            # added as well.
+            inserted_ops = set(rewriter.inserted_operations)
+            for affected_op in reversed(rewriter.affected_operations):
+                self._add_to_worklist(affected_op,
+                                      nested_ops=affected_op in inserted_ops)
+            if not rewriter.has_erased_matched_operation:
+                self._add_to_worklist(current_op)
+        return True
+
+    def _add_to_worklist(self, op: Operation, nested_ops: bool = False):
+        """
+        Add an operation to the worklist, and optionally its nested
+        operations, so they are rewritten in walk order.
+        """
+        ops: List[Operation] = []
+        if nested_ops:
+            self._collect_ops(op, ops)
+        else:
+            ops.append(op)
+        for nested_op in reversed(ops):
+            if nested_op not in self._worklist_ops:
+                self._worklist_ops.add(nested_op)
+                self._worklist.append(nested_op)
+
+    def _collect_ops(self, op: Operation, ops: List[Operation]):
+        """Collect an operation and its nested operations in walk order."""
+        if not self.walk_regions_first:
+            ops.append(op)
+        for region in op.regions:
+            for block in region.blocks:
+                for nested_op in block.ops:
+                    self._collect_ops(nested_op, ops)
+        if self.walk_regions_first:
+            ops.append(op)
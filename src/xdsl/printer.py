@@ -1,11 +1,16 @@
 from __future__ import annotations
 from xdsl.dialects.builtin import *
 from xdsl.diagnostic import *
-from typing import TypeVar
+from typing import Iterator, TypeVar
+import sys
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 indentNumSpaces = 2
 
+_flush_threshold = 1 << 16
+"""Number of buffered characters after which the printer writes to the stream."""
+
 
 @dataclass(eq=False, repr=False)
 class Printer:
@@ -14,6 +19,11 @@ class Printer:
     print_operand_types: bool = field(default=True)
     print_result_types: bool = field(default=True)
     diagnostic: Diagnostic = field(default_factory=Diagnostic)
+    name_forward_references: bool = field(default=False)
+    """
+    Name the values used before their definition, instead of raising an
+    exception. This is used to print the IR of dominance errors.
+    """
     _indent: int = field(default=0, init=False)
     _ssa_values: Dict[SSAValue, str] = field(default_factory=dict, init=False)
     _ssa_names: Dict[str, int] = field(default_factory=dict, init=False)
@@ -21,19 +31,64 @@ class Printer:
     _next_valid_name_id: int = field(default=0, init=False)
     _next_valid_block_id: int = field(default=0, init=False)
     _current_line: int = field(default=0, init=False)
-    _current_column: int = field(default=0, init=False)
+    _num_printed: int = field(default=0, init=False)
+    """Number of characters printed, including the buffered ones."""
+    _line_begin: int = field(default=0, init=False)
+    """Number of characters printed before the current line."""
     _next_line_callback: List[Callable[[], None]] = field(default_factory=list,
                                                           init=False)
 
+    _buffer: List[str] = field(default_factory=list, init=False)
+    _buffer_begin: int = field(default=0, init=False)
+    """Number of characters printed before the buffered ones."""
+    _is_buffered: bool = field(default=False, init=False)
+    """
+    Is the printed text buffered, rather than written to the stream as soon
+    as it is printed.
+    """
+
+    @property
+    def _current_column(self) -> int:
+        return self._num_printed - self._line_begin
+
     def _print(self, text: Any):
-        text = str(text)
-        lines = text.split('\n')
-        if len(lines) != 1:
-            self._current_line += len(lines) - 1
-            self._current_column = len(lines[-1])
-        else:
-            self._current_column += len(lines[-1])
-        print(text, end='', file=self.stream)
+        if type(text) is not str:
+            text = str(text)
+        self._num_printed += len(text)
+        if '\n' in text:
+            self._current_line += text.count('\n')
+            self._line_begin = self._num_printed - len(text) + text.rfind(
+                '\n') + 1
+        self._buffer.append(text)
+        if not self._is_buffered or (self._num_printed - self._buffer_begin >=
+                                     _flush_threshold):
+            self.flush()
+
+    @contextmanager
+    def _buffered(self) -> Iterator[None]:
+        """
+        Buffer the text printed in the context, and write it to the stream
+        in large chunks. The remaining text is written when leaving the
+        outermost context.
+        """
+        if self._is_buffered:
+            yield
+            return
+        self._is_buffered = True
+        try:
+            yield
+        finally:
+            self._is_buffered = False
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered text to the stream."""
+        if len(self._buffer) == 0:
+            return
+        stream = sys.stdout if self.stream is None else self.stream
+        stream.write(''.join(self._buffer))
+        self._buffer.clear()
+        self._buffer_begin = self._num_printed
 
     def print_string(self, string) -> None:
         self._print(string)
@@ -102,7 +157,6 @@ class Printer:
 
     def _print_result_value(self, op: Operation, idx: int) -> None:
         val = op.results[idx]
-        self._print("%")
         if val in self._ssa_values.keys():
             name = self._ssa_values[val]
         elif val.name:
@@ -113,7 +167,7 @@ class Printer:
         else:
             name = self._get_new_valid_name_id()
             self._ssa_values[val] = name
-        self._print("%s" % name)
+        self._print("%" + name)
         if self.print_result_types:
             self._print(" : ")
             self.print_attribute(val.typ)
@@ -140,12 +194,18 @@ class Printer:
 
     def _print_operand(self, operand: SSAValue) -> None:
         if (self._ssa_values.get(operand) == None):
-            raise KeyError(
-                "SSAValue is not part of the IR, are you sure all operations are added before their uses?"
-            )
-        self._print("%")
-
-        self._print("%s" % self._ssa_values[operand])
+            # Values used before their definition are printed with a fresh
+            # name, that their definition reuses.
+            if self.name_forward_references and (
+                    isinstance(operand, OpResult) and operand.op.parent
+                    is not None or isinstance(operand, BlockArgument)
+                    and operand.block.parent is not None):
+                self._ssa_values[operand] = self._get_new_valid_name_id()
+            else:
+                raise KeyError(
+                    "SSAValue is not part of the IR, are you sure all operations are added before their uses?"
+                )
+        self._print("%" + self._ssa_values[operand])
 
         if self.print_operand_types:
             self._print(" : ")
@@ -180,8 +240,10 @@ class Printer:
 
     def _print_block_arg(self, arg: BlockArgument) -> None:
         self._print("%")
-        name = self._get_new_valid_name_id()
-        self._ssa_values[arg] = name
+        name = self._ssa_values.get(arg)
+        if name is None:
+            name = self._get_new_valid_name_id()
+            self._ssa_values[arg] = name
         self._print("%s : " % name)
         self.print_attribute(arg.typ)
 
@@ -237,8 +299,7 @@ class Printer:
             width = attribute.parameters[0]
             typ = attribute.parameters[1]
             assert (isinstance(width, IntAttr))
-            self._print(width.data)
-            self._print(" : ")
+            self._print(f"{width.data} : ")
             self.print_attribute(typ)
             return
 
@@ -273,11 +334,8 @@ class Printer:
         if len(attributes) == 0:
             return
 
-        self._print(" ")
-        self._print("[")
-
         attribute_list = [p for p in attributes.items()]
-        self._print("\"%s\" = " % attribute_list[0][0])
+        self._print(" [\"%s\" = " % attribute_list[0][0])
         self.print_attribute(attribute_list[0][1])
         for (attr_name, attr) in attribute_list[1:]:
             self._print(", \"%s\" = " % attr_name)
@@ -299,5 +357,6 @@ class Printer:
         self._print_regions(op.regions)
 
     def print_op(self, op: Operation) -> None:
-        self._print_op(op)
-        self._print_new_line()
+        with self._buffered():
+            self._print_op(op)
+            self._print_new_line()
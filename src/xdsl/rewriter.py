@@ -50,17 +50,17 @@ class Rewriter:
             else:
                 old_result.replace_by(new_result)
 
-        op_idx = block.get_operation_index(op)
-        block.erase_op(op_idx, safe_erase=safe_erase)
         if len(op.results) == 0:
-            block.insert_op(new_ops, op_idx)
-            return
-        block.insert_op(new_ops, op_idx, op.results[0].name)
+            block.insert_op_before(new_ops, op)
+        else:
+            block.insert_op_before(new_ops, op, op.results[0].name)
+        block.erase_op(op, safe_erase=safe_erase)
 
     @staticmethod
-    def inline_block_at_pos(block: Block, target_block: Block, pos: int):
+    def _detach_ops_to_inline(block: Block,
+                              target_block: Block) -> List[Operation]:
         """
-        Move the block operations to a given position in another block.
+        Detach the block operations so they can be inlined in another block.
         This block should not be a parent of the block to move to.
         The block operations should not use the block arguments.
         """
@@ -76,6 +76,16 @@ class Rewriter:
         ops = block.ops.copy()
         for op in ops:
             op.detach()
+        return ops
+
+    @staticmethod
+    def inline_block_at_pos(block: Block, target_block: Block, pos: int):
+        """
+        Move the block operations to a given position in another block.
+        This block should not be a parent of the block to move to.
+        The block operations should not use the block arguments.
+        """
+        ops = Rewriter._detach_ops_to_inline(block, target_block)
         target_block.insert_op(ops, pos)
 
     @staticmethod
@@ -89,8 +99,8 @@ class Rewriter:
             raise Exception(
                 "Cannot inline a block before a toplevel operation")
         op_block = op.parent
-        op_pos = op_block.get_operation_index(op)
-        Rewriter.inline_block_at_pos(block, op_block, op_pos)
+        ops = Rewriter._detach_ops_to_inline(block, op_block)
+        op_block.insert_op_before(ops, op)
 
     @staticmethod
     def inline_block_after(block: Block, op: Operation):
@@ -103,8 +113,8 @@ class Rewriter:
             raise Exception(
                 "Cannot inline a block before a toplevel operation")
         op_block = op.parent
-        op_pos = op_block.get_operation_index(op)
-        Rewriter.inline_block_at_pos(block, op_block, op_pos + 1)
+        ops = Rewriter._detach_ops_to_inline(block, op_block)
+        op_block.insert_op_after(ops, op)
 
     @staticmethod
     def insert_block_after(block: Union[Block, List[Block]], target: Block):
@@ -140,8 +150,5 @@ class Rewriter:
     def move_region_contents_to_new_regions(region: Region) -> Region:
         """Move the region blocks to a new region."""
         new_region = Region()
-        for block in region.blocks:
-            block.parent = None
-            new_region.add_block(block)
-        region.blocks = []
+        region.move_blocks(new_region)
         return new_region
@@ -0,0 +1,221 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Union
+import weakref
+
+from xdsl.dialects.builtin import FlatSymbolRefAttr, StringAttr
+from xdsl.ir import (IRListener, Operation, add_ir_listener, get_ir_listeners,
+                     remove_ir_listener)
+
+SYMBOL_ATTR_NAME = "sym_name"
+"""The name of the attribute holding the name of a symbol."""
+
+
+def get_symbol_name(op: Operation) -> Optional[str]:
+    """Get the name of the symbol defined by an operation, if any."""
+    name = op.attributes.get(SYMBOL_ATTR_NAME)
+    if isinstance(name, StringAttr):
+        return name.data
+    return None
+
+
+def get_symbol_references(op: Operation) -> List[str]:
+    """Get the names of the symbols referenced by the attributes of an operation."""
+    return [
+        attr.data.data for attr in op.attributes.values()
+        if isinstance(attr, FlatSymbolRefAttr)
+    ]
+
+
+class SymbolTable(IRListener):
+    """
+    The symbols defined by the operations nested directly in the regions of
+    a root operation, such as the `func.func` and `memref.global` operations
+    of a module, and the operations referencing them at any depth below the
+    root, such as `func.call` and `memref.get_global`.
+    The table is kept up to date as operations are attached and detached
+    below the root. Symbols are renamed with `rename`, which also updates
+    their references; other changes to the `sym_name` attribute or to the
+    symbol references of an operation are not tracked.
+    When several operations define the same symbol, the first one attached
+    is returned by `lookup`, and the next one replaces it once it is
+    detached.
+    """
+
+    _root: weakref.ref[Operation]
+    """
+    The root operation. It is not held strongly, as the table is kept alive
+    by the root.
+    """
+
+    _symbols: Dict[str, Operation]
+    """The operations defining each symbol."""
+
+    _duplicates: Dict[str, Dict[Operation, None]]
+    """
+    The other operations defining each symbol, in the order they were
+    attached.
+    """
+
+    _users: Dict[str, Dict[Operation, None]]
+    """
+    The operations referencing each symbol. Each operation set is a
+    dictionary, to keep the operations in insertion order.
+    """
+
+    _version: int = 0
+    """
+    Incremented each time a symbol is defined, removed, or renamed, so that
+    the analyses resolving symbols can check if their results are still
+    valid.
+    """
+
+    def __init__(self, root: Operation) -> None:
+        self._root = weakref.ref(root)
+        self._symbols = {}
+        self._duplicates = {}
+        self._users = {}
+
+    @staticmethod
+    def get(root: Operation) -> SymbolTable:
+        """
+        Get the symbol table of an operation, creating it if it does not
+        exist yet.
+        """
+        for listener in get_ir_listeners(root):
+            if isinstance(listener, SymbolTable):
+                return listener
+        table = SymbolTable(root)
+        for region in root.regions:
+            for op in region.walk():
+                table.operation_added(op)
+        add_ir_listener(root, table)
+        return table
+
+    def remove(self) -> None:
+        """Stop maintaining the symbol table."""
+        root = self._root()
+        if root is not None:
+            remove_ir_listener(root, self)
+
+    def operation_added(self, op: Operation) -> None:
+        if op.parent_op() is self._root():
+            name = get_symbol_name(op)
+            if name is not None:
+                if name not in self._symbols:
+                    self._symbols[name] = op
+                    self._version += 1
+                else:
+                    self._duplicates.setdefault(name, {})[op] = None
+        for name in get_symbol_references(op):
+            self._users.setdefault(name, {})[op] = None
+
+    def operation_removed(self, op: Operation) -> None:
+        name = get_symbol_name(op)
+        if name is not None:
+            if self._symbols.get(name) is op:
+                self._remove_definition(name)
+            else:
+                duplicates = self._duplicates.get(name)
+                if duplicates is not None:
+                    duplicates.pop(op, None)
+                    if not duplicates:
+                        del self._duplicates[name]
+        for name in get_symbol_references(op):
+            users = self._users.get(name)
+            if users is not None:
+                users.pop(op, None)
+                if not users:
+                    del self._users[name]
+
+    def _remove_definition(self, name: str) -> None:
+        """
+        Remove the operation defining a symbol, and replace it by the next
+        operation defining the same symbol, if any.
+        """
+        del self._symbols[name]
+        self._version += 1
+        duplicates = self._duplicates.get(name)
+        if duplicates is not None:
+            op = next(iter(duplicates))
+            del duplicates[op]
+            if not duplicates:
+                del self._duplicates[name]
+            self._symbols[name] = op
+
+    def lookup(
+        self, name: Union[str, StringAttr,
+                          FlatSymbolRefAttr]) -> Optional[Operation]:
+        """Get the operation defining a symbol, if any."""
+        return self._symbols.get(_get_name(name))
+
+    def __contains__(self, name: Union[str, StringAttr,
+                                       FlatSymbolRefAttr]) -> bool:
+        return _get_name(name) in self._symbols
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def get_users(
+            self, name: Union[str, StringAttr,
+                              FlatSymbolRefAttr]) -> List[Operation]:
+        """Get the operations referencing a symbol, in the order they were attached."""
+        return list(self._users.get(_get_name(name), ()))
+
+    def insert(self, op: Operation) -> None:
+        """
+        Add an operation defining a new symbol at the end of the first block
+        of the root.
+        """
+        name = get_symbol_name(op)
+        if name is None:
+            raise Exception(
+                f"Operation {op.name} does not define a symbol, as it has no "
+                f"'{SYMBOL_ATTR_NAME}' attribute")
+        if name in self._symbols:
+            raise Exception(f"Symbol '{name}' is already defined")
+        root = self._root()
+        assert root is not None
+        root.regions[0].blocks[0].add_op(op)
+
+    def erase(self, name: Union[str, StringAttr, FlatSymbolRefAttr]) -> None:
+        """Erase the operation defining a symbol."""
+        op = self.lookup(name)
+        if op is None:
+            raise Exception(f"Symbol '{_get_name(name)}' is not defined")
+        op.parent.erase_op(op)
+
+    def rename(self, name: Union[str, StringAttr, FlatSymbolRefAttr],
+               new_name: str) -> None:
+        """Rename a symbol, and update the operations referencing it."""
+        name = _get_name(name)
+        op = self._symbols.get(name)
+        if op is None:
+            raise Exception(f"Symbol '{name}' is not defined")
+        if new_name in self._symbols:
+            raise Exception(f"Symbol '{new_name}' is already defined")
+
+        self._remove_definition(name)
+        op.attributes[SYMBOL_ATTR_NAME] = StringAttr(new_name)
+        op.mark_dirty()
+        self._symbols[new_name] = op
+        self._version += 1
+
+        users = self._users.pop(name, None)
+        if users is None:
+            return
+        new_ref = FlatSymbolRefAttr.from_str(new_name)
+        for user in users:
+            for attr_name, attr in user.attributes.items():
+                if isinstance(attr,
+                              FlatSymbolRefAttr) and attr.data.data == name:
+                    user.attributes[attr_name] = new_ref
+            user.mark_dirty()
+        self._users.setdefault(new_name, {}).update(users)
+
+
+def _get_name(name: Union[str, StringAttr, FlatSymbolRefAttr]) -> str:
+    if isinstance(name, FlatSymbolRefAttr):
+        return name.data.data
+    if isinstance(name, StringAttr):
+        return name.data
+    return name
@@ -1,10 +1,15 @@
 import argparse
+import multiprocessing
 import sys
 import os
+from typing import Sequence, Type
+from concurrent.futures import ProcessPoolExecutor
 from io import IOBase
 from xdsl.ir import *
 from xdsl.parser import *
 from xdsl.printer import *
+from xdsl.pass_manager import PassManager
+from xdsl.dominance import verify_dominance
 from xdsl.dialects.func import *
 from xdsl.dialects.scf import *
 from xdsl.dialects.arith import *
@@ -42,7 +47,14 @@ class xDSLOptMain:
     pipeline: List[Tuple[str, Callable[[ModuleOp], None]]]
     """ The pass-pipeline to be applied. """
 
-    def __init__(self, description='xDSL modular optimizer driver'):
+    def __init__(self,
+                 description='xDSL modular optimizer driver',
+                 args: Optional[Sequence[str]] = None):
+        """
+        Create the driver, and parse the command line arguments.
+        If args is not given, the arguments of the process are used.
+        """
+        self.argv = list(sys.argv[1:] if args is None else args)
         self.ctx = MLContext()
         self.register_all_dialects()
         self.register_all_frontends()
@@ -52,7 +64,7 @@ class xDSLOptMain:
         # arg handling
         arg_parser = argparse.ArgumentParser(description=description)
         self.register_all_arguments(arg_parser)
-        self.args = arg_parser.parse_args()
+        self.args = arg_parser.parse_args(self.argv)
 
         self.setup_pipeline()
 
@@ -90,6 +102,24 @@ class xDSLOptMain:
         arg_parser.add_argument("--disable-verify",
                                 default=False,
                                 action='store_true')
+        arg_parser.add_argument(
+            "--verify-incremental",
+            default=False,
+            action='store_true',
+            help="After each pass, only verify the operations modified by "
+            "the pass")
+        arg_parser.add_argument(
+            "--verify-dominance",
+            default=False,
+            action='store_true',
+            help="Also check that the definition of every value dominates "
+            "its uses")
+        arg_parser.add_argument(
+            "--verify-jobs",
+            type=int,
+            default=1,
+            help="Number of workers verifying the top-level operations in "
+            "parallel")
         arg_parser.add_argument("-o",
                                 "--output-file",
                                 type=str,
@@ -111,6 +141,45 @@ class xDSLOptMain:
                                 action='store_true',
                                 help="Print the IR between each pass")
 
+        arg_parser.add_argument(
+            "--time-passes",
+            default=False,
+            action='store_true',
+            help="Report the time and memory used by each pass and each "
+            "verification on stderr")
+
+        arg_parser.add_argument("--time-passes-format",
+                                choices=["table", "json"],
+                                default="table",
+                                help="Format of the report of --time-passes")
+
+        arg_parser.add_argument(
+            "--batch",
+            type=str,
+            nargs="+",
+            default=[],
+            metavar="INPUT_FILE",
+            help="Process many input files, writing one output file for each")
+        arg_parser.add_argument(
+            "--batch-manifest",
+            type=str,
+            required=False,
+            help="File listing the input files to process in batch mode, "
+            "one per line")
+        arg_parser.add_argument(
+            "--output-dir",
+            type=str,
+            required=False,
+            help="Directory of the output files in batch mode. By default, "
+            "each output file is written next to its input file, with an "
+            "'.out' suffix added to the file name")
+        arg_parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes used in batch mode")
+
     def register_all_dialects(self):
         """
         Register all dialects that can be used.
@@ -133,11 +202,14 @@ class xDSLOptMain:
         """
 
         def parse_xdsl(f: IOBase):
-            input_str = f.read()
-            parser = Parser(self.ctx, input_str)
+            # Files are memory-mapped rather than read, so that large inputs
+            # are not held in memory while they are parsed
+            parser = Parser(self.ctx, map_file(f))
             module = parser.parse_op()
             if not self.args.disable_verify:
                 module.verify()
+                if self.args.verify_dominance:
+                    verify_dominance(module)
             if not (isinstance(module, ModuleOp)):
                 raise Exception(
                     "Expected module or program as toplevel operation")
@@ -194,18 +266,19 @@ class xDSLOptMain:
         self.pipeline = [(p, lambda op, p=p: self.available_passes[p]
                           (self.ctx, op)) for p in pipeline]
 
-    def parse_input(self) -> ModuleOp:
+    def parse_input(self, input_file: Optional[str] = None) -> ModuleOp:
         """
         Parse the input file by invoking the parser specified by the `parser` 
         argument. If not set, the parser registered for this file extension 
         is used.
+        The input file defaults to the `input_file` argument, or to stdin.
         """
-        if self.args.input_file is None:
-            f = sys.stdin
+        if input_file is None:
+            input_file = self.args.input_file
+        if input_file is None:
             file_extension = 'xdsl'
         else:
-            f = open(self.args.input_file, mode='r')
-            _, file_extension = os.path.splitext(self.args.input_file)
+            _, file_extension = os.path.splitext(input_file)
             file_extension = file_extension.replace(".", "")
 
         if self.args.frontend is not None:
@@ -214,24 +287,42 @@ class xDSLOptMain:
         if file_extension not in self.available_frontends:
             raise Exception(f"Unrecognized file extension '{file_extension}'")
 
-        return self.available_frontends[file_extension](f)
+        frontend = self.available_frontends[file_extension]
+        if input_file is None:
+            return frontend(sys.stdin)
+        # The file is parsed before it is closed. A memory-mapped file stays
+        # valid after it is closed, until the parser releases it.
+        with open(input_file, mode='r') as f:
+            return frontend(f)
 
     def apply_passes(self, prog: ModuleOp):
         """Apply passes in order."""
         assert isinstance(prog, ModuleOp)
-        if not self.args.disable_verify:
-            prog.verify()
-        for pass_name, p in self.pipeline:
-            p(prog)
-            assert isinstance(prog, ModuleOp)
-            if not self.args.disable_verify:
-                prog.verify()
+
+        def print_after_pass(pass_name: str, op: Operation):
+            assert isinstance(op, ModuleOp)
             if self.args.print_between_passes:
                 print(f"IR after {pass_name}:")
                 printer = Printer(stream=sys.stdout)
-                printer.print_op(prog)
+                printer.print_op(op)
                 print("\n\n")
 
+        pass_manager = PassManager(
+            self.ctx,
+            verify_each=not self.args.disable_verify,
+            verify_incremental=self.args.verify_incremental,
+            verify_dominance=self.args.verify_dominance,
+            verify_jobs=self.args.verify_jobs,
+            time_passes=self.args.time_passes,
+            after_pass=print_after_pass)
+        for pass_name, p in self.pipeline:
+            pass_manager.add_pass(pass_name, lambda ctx, op, p=p: p(op))
+        pass_manager.run(prog)
+
+        if self.args.time_passes:
+            pass_manager.print_timings(sys.stderr,
+                                       self.args.time_passes_format)
+
     def output_resulting_program(self, prog: ModuleOp) -> str:
         """Get the resulting program."""
         output = StringIO()
@@ -248,3 +339,111 @@ class xDSLOptMain:
         else:
             output_stream = open(self.args.output_file, 'w')
             output_stream.write(contents)
+
+    def is_batch_mode(self) -> bool:
+        """Check if many input files should be processed in batch mode."""
+        return len(
+            self.args.batch) != 0 or self.args.batch_manifest is not None
+
+    def get_batch_input_files(self) -> List[str]:
+        """Get the input files of batch mode, in order."""
+        input_files = list(self.args.batch)
+        if self.args.batch_manifest is not None:
+            with open(self.args.batch_manifest) as manifest:
+                input_files += [
+                    line.strip() for line in manifest if len(line.strip()) > 0
+                ]
+        return input_files
+
+    def get_batch_output_file(self, input_file: str) -> str:
+        """Get the path of the output file of an input file in batch mode."""
+        input_dir, input_name = os.path.split(input_file)
+        stem, _ = os.path.splitext(input_name)
+        if self.args.output_dir is not None:
+            return os.path.join(self.args.output_dir,
+                                f"{stem}.{self.args.target}")
+        return os.path.join(input_dir, f"{stem}.out.{self.args.target}")
+
+    def process_file(self, input_file: str, output_file: str) -> None:
+        """Parse an input file, apply the passes, and write the result."""
+        module = self.parse_input(input_file)
+        self.apply_passes(module)
+        contents = self.output_resulting_program(module)
+        with open(output_file, 'w') as output_stream:
+            output_stream.write(contents)
+
+    def run_batch(self) -> int:
+        """
+        Process all input files of batch mode, each one in a worker process.
+        A failure is reported on stderr and does not stop the other files.
+        Returns the number of files that failed.
+        The workers are forked when the platform supports it, so the driver
+        class may be defined in the main script, as in xdsl-opt. Otherwise,
+        each worker imports the driver class, which should then be defined in
+        an importable module.
+        """
+        input_files = self.get_batch_input_files()
+        output_files = [self.get_batch_output_file(f) for f in input_files]
+        if self.args.output_dir is not None:
+            os.makedirs(self.args.output_dir, exist_ok=True)
+
+        if self.args.jobs <= 1:
+            _init_batch_worker(self)
+            errors = list(map(_process_batch_file, input_files, output_files))
+        else:
+            with ProcessPoolExecutor(max_workers=self.args.jobs,
+                                     mp_context=self._get_batch_context(),
+                                     initializer=_init_batch_worker,
+                                     initargs=(type(self),
+                                               self.argv)) as executor:
+                errors = list(
+                    executor.map(_process_batch_file, input_files,
+                                 output_files))
+
+        num_failures = 0
+        for input_file, error in zip(input_files, errors):
+            if error is not None:
+                num_failures += 1
+                print(f"{input_file}: error: {error}", file=sys.stderr)
+        print(f"Processed {len(input_files)} files, {num_failures} failed.",
+              file=sys.stderr)
+        return num_failures
+
+    def _get_batch_context(self) -> multiprocessing.context.BaseContext:
+        """Get the context used to start the batch mode worker processes."""
+        if "fork" in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context("fork")
+        if type(self).__module__ == "__main__":
+            raise Exception(
+                f"Batch mode with several jobs cannot start workers for "
+                f"{type(self).__name__}, which is defined in the main script, "
+                "as the 'fork' start method is not available. Define it in an "
+                "importable module, or use '--jobs 1'.")
+        return multiprocessing.get_context()
+
+
+_batch_worker_main: Optional[xDSLOptMain] = None
+"""The driver of the current batch mode worker process."""
+
+
+def _init_batch_worker(main: Union[xDSLOptMain, Type[xDSLOptMain]],
+                       args: Optional[List[str]] = None) -> None:
+    """
+    Initialize a batch mode worker. The driver is created once per worker, so
+    the dialects and passes are registered only once.
+    """
+    global _batch_worker_main
+    _batch_worker_main = main if isinstance(main, xDSLOptMain) else main(
+        args=args)
+
+
+def _process_batch_file(input_file: str, output_file: str) -> Optional[str]:
+    """
+    Process a file in a batch mode worker.
+    Returns None on success, or the error message otherwise.
+    """
+    try:
+        _batch_worker_main.process_file(input_file, output_file)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pickle
+from typing import List
+
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import *
+from xdsl.ir import Data, MLContext
+from xdsl.irdl import irdl_attr_definition
+from xdsl.parser import Parser
+from xdsl.printer import Printer
+
+
+def test_structurally_equal_attributes_are_identical():
+    """Test that equal attributes built in different ways are the same object."""
+    assert IntegerType.from_width(64) is i64
+    assert IntegerType([IntAttr(64)]) is i64
+    assert IntegerType(parameters=[IntAttr.from_int(64)]) is i64
+    assert IntegerAttr.from_params(3, 32) is IntegerAttr([IntAttr(3), i32])
+    assert ArrayAttr.from_list([i32, i64]) is ArrayAttr([i32, i64])
+    assert IntegerType.from_width(32) != i64
+    assert hash(IntegerType.from_width(64)) == hash(i64)
+
+
+def test_parameters_are_tuples():
+    """Test that the attribute parameters are stored in tuples."""
+    attr = IntegerAttr.from_params(3, 32)
+    assert attr.parameters == (IntAttr(3), i32)
+    assert ArrayAttr.from_list([i32]).data == (i32, )
+
+
+def test_parsed_attributes_are_uniqued():
+    """Test that the parser returns the uniqued attributes."""
+    ctx = MLContext()
+    Builtin(ctx)
+    Arith(ctx)
+
+    prog = \
+"""module() {
+  %0 : !i32 = arith.constant() ["value" = 42 : !i32]
+  %1 : !i32 = arith.constant() ["value" = 42 : !i32]
+}"""
+    module = Parser(ctx, prog).parse_op()
+    first, second = module.ops
+    assert first.results[0].typ is i32
+    assert first.attributes["value"] is second.attributes["value"]
+
+
+def test_pickled_attributes_are_uniqued():
+    """Test that unpickling an attribute returns the uniqued attribute."""
+    attr = FunctionType.from_lists([i32], [i64])
+    assert pickle.loads(pickle.dumps(attr)) is attr
+
+
+@irdl_attr_definition
+class ListData(Data):
+    name = "test.list_data"
+    data: List[List[int]]
+
+    @staticmethod
+    def parse(parser: Parser) -> ListData:
+        pass
+
+    def print(self, printer: Printer) -> None:
+        pass
+
+
+def test_unhashable_data_is_not_uniqued():
+    """Test that attributes with unhashable storage still compare structurally."""
+    first = ListData([[0, 1]])
+    second = ListData([[0, 1]])
+    assert first is not second
+    assert first == second
+    assert first != ListData([[1]])
@@ -0,0 +1,132 @@
+import weakref
+
+import pytest
+
+from xdsl.dialects.arith import Constant
+from xdsl.dialects.builtin import i32
+from xdsl.ir import Block, ErasedSSAValue, Region
+from xdsl.irdl import RegionDef, SingleBlockRegionDef
+
+
+def get_constants(num: int):
+    return [Constant.from_int_constant(i, i32) for i in range(num)]
+
+
+def test_block_ops_view():
+    """Test that the operation view of a block behaves like a list."""
+    ops = get_constants(4)
+    block = Block.from_ops(ops)
+
+    assert len(block.ops) == 4
+    assert list(block.ops) == ops
+    assert block.ops == ops
+    assert list(reversed(block.ops)) == ops[::-1]
+    assert block.ops[1] is ops[1]
+    assert block.ops[-1] is ops[3]
+    assert block.ops[1:3] == ops[1:3]
+    assert block.first_op is ops[0]
+    assert block.last_op is ops[3]
+    assert ops[1].prev_op is ops[0]
+    assert ops[1].next_op is ops[2]
+    assert ops[2] in block.ops
+    with pytest.raises(IndexError):
+        block.ops[4]
+
+
+def test_block_insert_before_after():
+    """Test the insertion of operations around an existing operation."""
+    ops = get_constants(5)
+    block = Block.from_ops([ops[1], ops[3]])
+
+    block.insert_op_before(ops[0], ops[1])
+    block.insert_op_after(ops[2], ops[1])
+    block.insert_op_after([ops[4]], ops[3])
+    assert block.ops == ops
+    assert block.last_op is ops[4]
+    assert [block.get_operation_index(op) for op in ops] == list(range(5))
+
+
+def test_block_detach_while_iterating():
+    """Test that operations can be detached while iterating on a block."""
+    ops = get_constants(4)
+    block = Block.from_ops(ops)
+
+    for op in block.ops:
+        if op is not ops[2]:
+            block.detach_op(op)
+
+    assert block.ops == [ops[2]]
+    assert block.first_op is block.last_op is ops[2]
+    assert ops[0].parent is None
+    assert ops[0].next_op is None and ops[3].prev_op is None
+
+
+def test_block_insert_index():
+    """Test the index-based insertion and detach functions."""
+    ops = get_constants(4)
+    block = Block.from_ops([ops[0], ops[3]])
+
+    block.insert_op([ops[1], ops[2]], 1)
+    assert block.ops == ops
+    assert block.detach_op(0) is ops[0]
+    assert block.ops == ops[1:]
+    with pytest.raises(ValueError):
+        block.insert_op(ops[0], 4)
+
+
+def test_is_before_in_block():
+    """Test the lazily computed operation order in a block."""
+    ops = get_constants(3)
+    block = Block.from_ops(ops)
+
+    assert ops[0].is_before_in_block(ops[2])
+    assert not ops[2].is_before_in_block(ops[1])
+    assert not ops[1].is_before_in_block(ops[1])
+
+    # Insert many operations at the same position to exhaust the index gaps
+    new_ops = get_constants(20)
+    for new_op in new_ops:
+        block.insert_op_after(new_op, ops[0])
+        assert ops[0].is_before_in_block(new_op)
+        assert new_op.is_before_in_block(ops[1])
+    for first, second in zip(new_ops[1:], new_ops[:-1]):
+        assert first.is_before_in_block(second)
+
+    first = Constant.from_int_constant(0, i32)
+    block.insert_op_before(first, ops[0])
+    assert first.is_before_in_block(ops[0])
+    assert all(first.is_before_in_block(op) for op in ops + new_ops)
+
+    with pytest.raises(Exception):
+        ops[0].is_before_in_block(Constant.from_int_constant(0, i32))
+
+
+def test_ir_slots():
+    """Test that the IR classes have no instance dictionary."""
+    ops = get_constants(1)
+    block = Block.from_ops(ops)
+    region = Region.from_block_list([block])
+    block.insert_arg(i32, 0)
+    for ir in [ops[0], ops[0].results[0], block, block.args[0], region]:
+        assert not hasattr(ir, "__dict__")
+        assert weakref.ref(ir)() is ir
+
+
+def test_slotted_subclasses():
+    """
+    Test that the fields inherited by the subclasses of the IR classes are
+    initialized.
+    """
+    value = get_constants(1)[0].results[0]
+    erased = ErasedSSAValue(i32, value)
+    assert erased.name is None
+    assert not erased.uses
+    assert "ErasedSSAValue" in repr(erased)
+    assert not hasattr(erased, "__dict__")
+
+    for region_def in [RegionDef(), SingleBlockRegionDef(block_args=[i32])]:
+        assert region_def.parent is None
+        assert region_def.blocks == []
+        assert region_def._cfg_version == 0
+        assert "RegionDef" in repr(region_def)
+        assert not hasattr(region_def, "__dict__")
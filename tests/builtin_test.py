@@ -0,0 +1,115 @@
+import array
+import pickle
+from io import StringIO
+
+import pytest
+
+from xdsl.dialects.builtin import *
+from xdsl.ir import MLContext
+from xdsl.parser import Parser
+from xdsl.printer import Printer
+
+
+def test_dense_attr_storage():
+    """Test that dense elements are stored in a contiguous buffer."""
+    attr = DenseIntOrFPElementsAttr.vector_from_list([1, 2, 3], i32)
+    assert len(attr.data) == 3
+    assert memoryview(attr.data).itemsize * 8 >= 32
+    assert attr.get_values() == [1, 2, 3]
+
+    i1_attr = DenseIntOrFPElementsAttr.vector_from_list([0, 1], i1)
+    assert memoryview(i1_attr.data).itemsize == 1
+
+    with pytest.raises(Exception):
+        DenseIntOrFPElementsAttr.vector_from_list([1], f32)
+
+
+def test_dense_attr_uniquing():
+    """Test that dense elements are uniqued by type and contents."""
+    typ = VectorType.from_type_and_list(i32, [3])
+    attr = DenseIntOrFPElementsAttr.from_list(typ, [1, 2, 3])
+    assert DenseIntOrFPElementsAttr.vector_from_list([1, 2, 3], i32) is attr
+    assert DenseIntOrFPElementsAttr.from_list(
+        typ, [IntegerAttr.from_int_and_width(i, 32)
+              for i in [1, 2, 3]]) is attr
+    assert DenseIntOrFPElementsAttr(typ, array.array("q", [1, 2, 3])) is attr
+    assert DenseIntOrFPElementsAttr.tensor_from_list([1, 2, 3], i32) != attr
+    assert DenseIntOrFPElementsAttr.vector_from_list([1, 2, 4], i32) != attr
+    assert pickle.loads(pickle.dumps(attr)) is attr
+
+
+def test_dense_attr_print_parse():
+    """Test that dense elements are printed with their element type."""
+    ctx = MLContext()
+    Builtin(ctx)
+    text = ("!dense<!vector<[3 : !i64], !i32>, "
+            "[1 : !i32, 2 : !i32, 3 : !i32]>")
+    attr = Parser(ctx, text).parse_attribute()
+    assert isinstance(attr, DenseIntOrFPElementsAttr)
+    assert attr.get_values() == [1, 2, 3]
+    assert Parser(ctx, text).parse_attribute() is attr
+
+    stream = StringIO()
+    printer = Printer(stream=stream)
+    printer.print_attribute(attr)
+    printer.flush()
+    assert stream.getvalue() == text
+
+    with pytest.raises(Exception):
+        Parser(
+            ctx,
+            "!dense<!vector<[1 : !i64], !i32>, [1 : !i64]>").parse_attribute()
+
+
+def test_dense_attr_unsigned_range():
+    """Test that signless dense elements may use their unsigned range."""
+    i8 = IntegerType.from_width(8)
+    attr = DenseIntOrFPElementsAttr.vector_from_list([255, 0], i8)
+    assert memoryview(attr.data).itemsize == 1
+    assert attr.get_values() == [255, 0]
+
+    # Negative and unsigned values are stored in a larger signed buffer
+    mixed = DenseIntOrFPElementsAttr.vector_from_list([-1, 255], i8)
+    assert mixed.get_values() == [-1, 255]
+    assert mixed != attr
+
+
+def test_dense_attr_wide_elements():
+    """Test that elements that do not fit in a buffer are stored in a tuple."""
+    ctx = MLContext()
+    Builtin(ctx)
+    i128 = IntegerType.from_width(128)
+    attr = DenseIntOrFPElementsAttr.vector_from_list([2**100, -1], i128)
+    assert attr.data == (2**100, -1)
+    assert attr.get_values() == [2**100, -1]
+    assert DenseIntOrFPElementsAttr.vector_from_list([2**100, -1],
+                                                     i128) is attr
+    assert pickle.loads(pickle.dumps(attr)) is attr
+
+    # Elements wider than the largest typecode are always stored in a tuple
+    small = DenseIntOrFPElementsAttr.vector_from_list([1, 2], i128)
+    assert small.data == (1, 2)
+
+    stream = StringIO()
+    printer = Printer(stream=stream)
+    printer.print_attribute(attr)
+    assert Parser(ctx, stream.getvalue()).parse_attribute() is attr
+
+
+def test_dense_attr_numpy_storage():
+    """Test that dense elements are stored in a read-only NumPy array."""
+    np = pytest.importorskip("numpy")
+    i8 = IntegerType.from_width(8)
+    attr = DenseIntOrFPElementsAttr.vector_from_list([255, 0], i8)
+    assert isinstance(attr.data, np.ndarray)
+    assert attr.data.dtype == np.uint8
+    assert not attr.data.flags.writeable
+    assert attr.get_values() == [255, 0]
+
+    typ = VectorType.from_type_and_list(i32, [3])
+    values = np.array([1, 2, 3], dtype=np.int64)
+    from_array = DenseIntOrFPElementsAttr(typ, values)
+    assert from_array is DenseIntOrFPElementsAttr.from_list(typ, [1, 2, 3])
+    # The array passed by the caller is copied, so it can still be modified
+    assert from_array.data is not values
+    assert pickle.loads(pickle.dumps(from_array)) is from_array
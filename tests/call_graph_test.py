@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from xdsl.call_graph import CallGraph
+from xdsl.dialects.builtin import ModuleOp
+from xdsl.dialects.func import Call, FuncOp, Return
+from xdsl.symbol_table import SymbolTable
+
+
+def get_func(name: str, *callees: str) -> FuncOp:
+    return FuncOp.from_callable(
+        name, [], [], lambda:
+        [*[Call.get(callee, [[]], [[]]) for callee in callees],
+         Return.get()])
+
+
+def test_call_graph_sccs():
+    """Test the bottom-up and top-down traversals of the call graph."""
+    main = get_func("main", "a", "printf")
+    a = get_func("a", "b", "c")
+    b = get_func("b", "a")
+    c = get_func("c", "c")
+    d = get_func("d")
+    module = ModuleOp.from_region_or_ops([main, a, b, c, d])
+    graph = CallGraph.get(module)
+
+    assert graph.get_callees(main) == [a]
+    assert graph.get_callees(a) == [b, c]
+    assert graph.get_callers(a) == [main, b]
+    assert graph.get_callers(main) == []
+
+    sccs = list(graph.bottom_up())
+    assert sccs == [[c], [a, b], [main], [d]]
+    assert list(graph.top_down()) == sccs[::-1]
+
+    assert graph.is_recursive(a)
+    assert graph.is_recursive(c)
+    assert not graph.is_recursive(main)
+    assert CallGraph.get(module) is graph
+
+
+def test_call_graph_updates():
+    """Test that the call graph is updated when calls are added or removed."""
+    a = get_func("a", "b")
+    b = get_func("b")
+    module = ModuleOp.from_region_or_ops([a, b])
+    graph = CallGraph.get(module)
+    assert graph.get_sccs() == [[b], [a]]
+
+    call = Call.get("a", [[]], [[]])
+    b.body.blocks[0].insert_op(call, 0)
+    assert graph.get_sccs() == [[a, b]]
+    assert graph.get_calls(b) == [call]
+
+    b.body.blocks[0].erase_op(call)
+    assert graph.get_sccs() == [[b], [a]]
+
+    c = get_func("c", "a")
+    module.body.blocks[0].add_op(c)
+    assert graph.get_sccs() == [[b], [a], [c]]
+    assert graph.get_callers(a) == [c]
+
+    module.body.blocks[0].erase_op(a)
+    assert graph.get_functions() == [b, c]
+    assert graph.get_sccs() == [[b], [c]]
+    assert graph.get_callees(c) == []
+
+
+def test_call_graph_deep_chain():
+    """Test that long call chains do not exhaust the recursion limit."""
+    num_funcs = 5000
+    funcs = [get_func(f"f{i}", f"f{i + 1}") for i in range(num_funcs)]
+    graph = CallGraph.get(ModuleOp.from_region_or_ops(funcs))
+    assert graph.get_sccs() == [[func] for func in reversed(funcs)]
+
+
+def test_call_graph_rename():
+    """Test that the call graph is updated when a function is renamed."""
+    a = get_func("a", "b")
+    c = get_func("c", "a")
+    module = ModuleOp.from_region_or_ops([a, c])
+    graph = CallGraph.get(module)
+    assert graph.get_sccs() == [[a], [c]]
+    assert not graph.is_recursive(a)
+
+    # The call to the undefined function b now calls c
+    SymbolTable.get(module).rename("c", "b")
+    assert graph.get_callees(a) == [c]
+    assert graph.get_sccs() == [[a, c]]
+    assert graph.is_recursive(a)
+
+    SymbolTable.get(module).rename("b", "d")
+    assert graph.get_sccs() == [[a, c]]
+    SymbolTable.get(module).rename("a", "e")
+    assert graph.get_sccs() == [[a, c]]
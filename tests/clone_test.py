@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import i1, i32
+from xdsl.dialects.cf import Branch, ConditionalBranch
+from xdsl.dialects.func import FuncOp, Return
+from xdsl.ir import Block, Region
+
+
+def get_function():
+    """
+    A function with a loop, using a value defined outside of the function,
+    and a value defined in a later block.
+    """
+    outer = Constant.from_int_constant(0, i32)
+    entry = Block.from_arg_types([i1])
+    loop = Block.from_arg_types([i32])
+    exit_block = Block()
+    cst = Constant.from_int_constant(1, i32)
+    entry.add_ops([cst, Branch.get(loop, cst)])
+    add = Addi.get(loop.args[0], outer)
+    loop.add_ops([
+        add,
+        ConditionalBranch.get(entry.args[0], loop, [add], exit_block, [])
+    ])
+    exit_block.add_op(Return.get())
+    func = FuncOp.from_region(
+        "f", [i1], [], Region.from_block_list([entry, loop, exit_block]))
+    return func, outer
+
+
+def test_clone():
+    """Test that an operation is cloned with its regions."""
+    func, outer = get_function()
+    value_mapper = {}
+    block_mapper = {}
+    clone = func.clone(value_mapper, block_mapper)
+
+    assert isinstance(clone, FuncOp)
+    assert clone.attributes == func.attributes
+    assert clone.attributes is not func.attributes
+    assert clone.attributes["function_type"] is func.attributes["function_type"]
+
+    entry, loop, exit_block = func.body.blocks
+    new_entry, new_loop, new_exit = clone.body.blocks
+    assert block_mapper == {
+        entry: new_entry,
+        loop: new_loop,
+        exit_block: new_exit
+    }
+    assert value_mapper[entry.args[0]] is new_entry.args[0]
+    assert value_mapper[loop.args[0]] is new_loop.args[0]
+
+    cst, branch = new_entry.ops
+    assert branch.successors == [new_loop]
+    assert branch.operands == [cst.results[0]]
+    add, cond_branch = new_loop.ops
+    assert value_mapper[loop.ops[0].results[0]] is add.results[0]
+    assert add.operands == [new_loop.args[0], outer.results[0]]
+    assert cond_branch.successors == [new_loop, new_exit]
+    assert cond_branch.operands == [new_entry.args[0], add.results[0]]
+
+    # The original operation is not modified
+    assert len(outer.results[0].uses) == 2
+    assert loop.ops[0].operands[0] is loop.args[0]
+
+
+def test_clone_forward_reference():
+    """Test that the uses of values defined later in the clone are mapped."""
+    func, outer = get_function()
+    entry, loop, _ = func.body.blocks
+    # Use the addition of the loop block in the entry block, which is
+    # cloned before it.
+    entry.ops[1].replace_operand(0, loop.ops[0].results[0])
+
+    clone = func.clone()
+    new_entry, new_loop, _ = clone.body.blocks
+    assert new_entry.ops[1].operands[0] is new_loop.ops[0].results[0]
+    assert len(new_loop.ops[0].results[0].uses) == 2
+
+
+def test_clone_mapped_values():
+    """Test that the values in the mappers are used in the clone."""
+    func, outer = get_function()
+    other = Constant.from_int_constant(2, i32)
+    clone = func.clone({outer.results[0]: other.results[0]})
+    assert clone.body.blocks[1].ops[0].operands[1] is other.results[0]
+    assert len(outer.results[0].uses) == 1
+
+
+def test_region_clone_into():
+    """Test that the blocks of a region are cloned into another region."""
+    func, _ = get_function()
+    dest = Region.from_block_list([Block()])
+    block_mapper = {}
+    func.body.clone_into(dest, 0, block_mapper=block_mapper)
+
+    assert len(dest.blocks) == 4
+    new_entry, new_loop, new_exit, _ = dest.blocks
+    assert block_mapper[func.body.blocks[0]] is new_entry
+    assert new_entry.parent is dest
+    assert new_loop.ops[1].successors == [new_loop, new_exit]
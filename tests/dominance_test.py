@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import pytest
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import ModuleOp, i1, i32
+from xdsl.dialects.cf import Branch, ConditionalBranch
+from xdsl.dominance import DominanceInfo, verify_dominance
+from xdsl.ir import Block, Region
+
+
+def get_diamond():
+    """
+    entry -> then, else -> exit, with a loop from exit back to then, and an
+    unreachable block.
+    """
+    entry = Block.from_arg_types([i1])
+    then_block = Block()
+    else_block = Block()
+    exit_block = Block()
+    dead_block = Block()
+    entry.add_ops([
+        Constant.from_int_constant(0, i32),
+        ConditionalBranch.get(entry.args[0], then_block, [], else_block, [])
+    ])
+    then_block.add_op(Branch.get(exit_block))
+    else_block.add_op(Branch.get(exit_block))
+    exit_block.add_op(
+        ConditionalBranch.get(entry.args[0], then_block, [], exit_block, []))
+    dead_block.add_op(Branch.get(exit_block))
+    region = Region.from_block_list(
+        [entry, then_block, else_block, exit_block, dead_block])
+    return region, entry, then_block, else_block, exit_block, dead_block
+
+
+def test_dominator_tree():
+    """Test the immediate dominators and the dominance of blocks."""
+    region, entry, then_block, else_block, exit_block, dead_block = get_diamond(
+    )
+    dom = DominanceInfo(region)
+
+    assert dom.get_idom(entry) is None
+    assert dom.get_idom(then_block) is entry
+    assert dom.get_idom(else_block) is entry
+    assert dom.get_idom(exit_block) is entry
+    assert set(dom.get_children(entry)) == {then_block, else_block, exit_block}
+
+    assert dom.dominates(entry, exit_block)
+    assert dom.dominates(exit_block, exit_block)
+    assert not dom.properly_dominates(exit_block, exit_block)
+    assert not dom.dominates(then_block, exit_block)
+    assert not dom.dominates(exit_block, then_block)
+
+    assert not dom.is_reachable(dead_block)
+    assert dom.dominates(exit_block, dead_block)
+    assert not dom.dominates(dead_block, exit_block)
+
+
+def test_dominance_frontier():
+    """Test the dominance frontiers of the blocks."""
+    region, entry, then_block, else_block, exit_block, _ = get_diamond()
+    dom = DominanceInfo(region)
+
+    assert dom.get_dominance_frontier(entry) == []
+    assert dom.get_dominance_frontier(then_block) == [exit_block]
+    assert dom.get_dominance_frontier(else_block) == [exit_block]
+    assert set(
+        dom.get_dominance_frontier(exit_block)) == {then_block, exit_block}
+
+
+def test_operation_dominance():
+    """Test the dominance of operations, in the same block or not."""
+    region, entry, then_block, _, exit_block, _ = get_diamond()
+    dom = DominanceInfo(region)
+    cst = entry.first_op
+    add = Addi.get(cst, cst)
+    then_block.insert_op(add, 0)
+
+    assert dom.dominates(cst, add)
+    assert dom.properly_dominates(cst, entry.last_op)
+    assert not dom.properly_dominates(entry.last_op, cst)
+    assert not dom.dominates(add, exit_block.first_op)
+    assert dom.dominates(add, then_block.last_op)
+
+
+def test_dominance_invalidation():
+    """Test that the dominator tree is recomputed when the CFG changes."""
+    region, entry, then_block, else_block, exit_block, _ = get_diamond()
+    dom = DominanceInfo(region)
+    assert dom.get_idom(exit_block) is entry
+
+    # Make the else block unreachable
+    then_block.erase_op(then_block.last_op)
+    cond_br = entry.last_op
+    entry.erase_op(cond_br)
+    entry.add_op(Branch.get(then_block))
+    then_block.add_op(Branch.get(exit_block))
+    assert dom.get_idom(exit_block) is then_block
+    assert not dom.is_reachable(else_block)
+
+    # Modifying the successors in place invalidates the analysis once the
+    # terminator is marked
+    entry.last_op.successors[0] = else_block
+    entry.last_op.mark_dirty()
+    assert dom.get_idom(exit_block) is else_block
+
+    new_block = Block.from_ops([Branch.get(exit_block)])
+    region.insert_block(new_block, 1)
+    entry.last_op.successors[0] = new_block
+    entry.last_op.mark_dirty()
+    assert dom.get_idom(exit_block) is new_block
+
+
+def test_verify_dominance():
+    """Test that uses that are not dominated by their definition are reported."""
+    region, entry, then_block, else_block, exit_block, dead_block = get_diamond(
+    )
+    cst = entry.first_op
+    then_add = Addi.get(cst, cst)
+    then_block.insert_op(then_add, 0)
+    exit_block.insert_op(Addi.get(cst, cst), 0)
+    dead_block.insert_op(Addi.get(then_add, then_add), 0)
+    op = ModuleOp.from_region_or_ops(region)
+    verify_dominance(op)
+
+    # Values of a block are not visible in its siblings
+    else_add = Addi.get(then_add, cst)
+    else_block.insert_op(else_add, 0)
+    with pytest.raises(Exception) as e:
+        verify_dominance(op)
+    assert str(e.value).startswith("1 operand(s) do not dominate their uses")
+    assert "operand #0 (result #0 of 'arith.addi') does not dominate" in str(
+        e.value)
+    else_block.erase_op(else_add)
+
+    # Uses before the definition in the same block, or in nested regions
+    late_cst = Constant.from_int_constant(1, i32)
+    exit_block.insert_op(
+        ModuleOp.from_region_or_ops([Addi.get(late_cst, late_cst)]), 0)
+    exit_block.insert_op(late_cst, 1)
+    with pytest.raises(Exception) as e:
+        verify_dominance(op)
+    assert str(e.value).startswith("2 operand(s) do not dominate their uses")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import weakref
+
+import pytest
+
+from xdsl.dialects.builtin import (DenseIntOrFPElementsAttr, IntegerType,
+                                   IndexType, StringAttr, i32, i64)
+from xdsl.ir import Block, Operation
+from xdsl.irdl import *
+
+
+@irdl_op_definition
+class VariadicOp(Operation):
+    name: str = "test.variadic"
+
+    first = OperandDef(IntegerType)
+    middle = VarOperandDef(IndexType)
+    last = OperandDef(i64)
+
+    res = VarResultDef(IntegerType)
+    attr = OptAttributeDef(StringAttr)
+
+
+@irdl_op_definition
+class SegmentsOp(Operation):
+    name: str = "test.segments"
+
+    lhs = VarOperandDef(IntegerType)
+    rhs = VarOperandDef(IndexType)
+
+    irdl_options = [AttrSizedOperandSegments()]
+
+
+def test_verify_single_variadic():
+    """Test the verification of operands around a variadic operand."""
+    block = Block.from_arg_types([i32, IndexType(), IndexType(), i64])
+    a, index0, index1, b = block.args
+
+    VariadicOp.create(operands=[a, index0, index1, b],
+                      result_types=[i32, i64]).verify()
+    VariadicOp.create(operands=[a, b]).verify()
+
+    with pytest.raises(Exception):
+        VariadicOp.create(operands=[a, index0, index1, a]).verify()
+    with pytest.raises(Exception):
+        VariadicOp.create(operands=[a, index0, a, b]).verify()
+    with pytest.raises(Exception) as e:
+        VariadicOp.create(operands=[a]).verify()
+    assert "Expected at least 2 operands, got 1" in str(e.value)
+    with pytest.raises(Exception):
+        VariadicOp.create(operands=[a, b], result_types=[IndexType()]).verify()
+    with pytest.raises(Exception):
+        VariadicOp.create(operands=[a, b], attributes={"attr": i32}).verify()
+
+
+def test_verify_segments():
+    """Test the verification of operands with segment sizes."""
+    block = Block.from_arg_types([i32, i32, IndexType()])
+    a, b, index = block.args
+
+    def create(operands, sizes):
+        return SegmentsOp.create(operands=operands,
+                                 attributes={
+                                     AttrSizedOperandSegments.attribute_name:
+                                     DenseIntOrFPElementsAttr.vector_from_list(
+                                         sizes, i32)
+                                 })
+
+    create([a, b, index], [2, 1]).verify()
+    create([], [0, 0]).verify()
+
+    with pytest.raises(Exception):
+        create([a, b, index], [1, 2]).verify()
+    with pytest.raises(Exception) as e:
+        create([a, b], [2, 1]).verify()
+    assert "Expected 3 operands from operand_segment_sizes, but got 2" in str(
+        e.value)
+    with pytest.raises(Exception):
+        SegmentsOp.create(operands=[a]).verify()
+
+
+@irdl_op_definition
+class OptionalOp(Operation):
+    name: str = "test.optional"
+
+    first = OperandDef(IntegerType)
+    opt = OptOperandDef(IndexType)
+    last = OperandDef(i64)
+
+
+def test_variadic_accessors():
+    """Test the accessors of operands around a variadic operand."""
+    block = Block.from_arg_types([i32, IndexType(), IndexType(), i64])
+    a, index0, index1, b = block.args
+
+    op = VariadicOp.create(operands=[a, index0, index1, b], result_types=[i32])
+    assert op.first is a
+    assert op.middle == [index0, index1]
+    assert op.last is b
+    assert op.res == [op.results[0]]
+
+    op = VariadicOp.create(operands=[a, b])
+    assert op.middle == []
+    assert op.last is b
+
+    assert OptionalOp.create(operands=[a, index0, b]).opt is index0
+    assert OptionalOp.create(operands=[a, b]).opt is None
+    assert OptionalOp.create(operands=[a, b]).last is b
+
+
+def test_segment_accessors():
+    """Test the accessors of operands with segment sizes."""
+    block = Block.from_arg_types([i32, i32, IndexType()])
+    a, b, index = block.args
+
+    op = SegmentsOp.create(operands=[a, b, index],
+                           attributes={
+                               AttrSizedOperandSegments.attribute_name:
+                               DenseIntOrFPElementsAttr.vector_from_list(
+                                   [2, 1], i32)
+                           })
+    assert op.lhs == [a, b]
+    assert op.rhs == [index]
+
+    op.attributes[AttrSizedOperandSegments.attribute_name] = \
+        DenseIntOrFPElementsAttr.vector_from_list([1, 2], i32)
+    assert op.lhs == [a]
+    assert op.rhs == [b, index]
+
+
+def test_op_slots():
+    """Test that operation definitions have no instance dictionary."""
+    block = Block.from_arg_types([i32, i64])
+    a, b = block.args
+    op = VariadicOp.create(operands=[a, b])
+    assert not hasattr(op, "__dict__")
+    assert weakref.ref(op)() is op
+    with pytest.raises(AttributeError):
+        op.unknown_field = 0
+
+
+@irdl_op_definition
+class SuperOp(Operation):
+    name: str = "test.super"
+
+    def verify_(self) -> None:
+        super().verify_()
+
+
+def test_op_slots_super():
+    """Test that operation definitions using super() are still supported."""
+    SuperOp.create().verify()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import ModuleOp, i32
+from xdsl.ir import Operation, Region, get_ir_listeners
+from xdsl.irdl import OperandDef, ResultDef, irdl_op_definition
+from xdsl.rewriter import Rewriter
+
+
+def test_op_index_lookup():
+    """Test that the index lists the operations nested at any depth."""
+    cst = Constant.from_int_constant(0, i32)
+    add = Addi.get(cst, cst)
+    inner_cst = Constant.from_int_constant(1, i32)
+    inner = ModuleOp.from_region_or_ops([inner_cst])
+    module = ModuleOp.from_region_or_ops([cst, add, inner])
+
+    assert module.get_ops(Constant) == [cst, inner_cst]
+    assert module.get_ops("arith.addi") == [add]
+    assert module.get_ops(ModuleOp) == [inner]
+    assert module.get_op_index() is module.get_op_index()
+
+
+def test_op_index_updates():
+    """Test that the index is updated when operations are added or removed."""
+    cst = Constant.from_int_constant(0, i32)
+    inner = ModuleOp.from_region_or_ops([])
+    module = ModuleOp.from_region_or_ops([cst, inner])
+    module.get_op_index()
+
+    add = Addi.get(cst, cst)
+    inner.body.blocks[0].add_op(add)
+    assert module.get_ops(Addi) == [add]
+
+    new_add = Addi.get(cst, cst)
+    Rewriter.replace_op(add, new_add)
+    assert module.get_ops(Addi) == [new_add]
+
+    # Detaching a whole region removes the operations nested in it
+    detached = inner.body.detach_block(0)
+    assert module.get_ops(Addi) == []
+    inner.body.add_block(detached)
+    assert module.get_ops(Addi) == [new_add]
+    moved = Rewriter.move_region_contents_to_new_regions(inner.body)
+    assert module.get_ops(Addi) == []
+    moved.move_blocks(inner.body)
+    assert module.get_ops(Addi) == [new_add]
+
+    module.body.blocks[0].erase_op(inner, safe_erase=False)
+    assert module.get_ops(Addi) == []
+    assert module.get_ops(ModuleOp) == []
+    assert module.get_ops(Constant) == [cst]
+
+    # Regions added to an operation are indexed
+    block = module.body.blocks[0]
+    block.add_op(ModuleOp.from_region_or_ops(Region.from_operation_list([])))
+    last_add = Addi.get(cst, cst)
+    block.ops[-1].add_region(Region.from_operation_list([last_add]))
+    assert module.get_ops(Addi) == [last_add]
+
+
+def test_op_index_remove():
+    """Test that a removed index is no longer updated."""
+    module = ModuleOp.from_region_or_ops([])
+    index = module.get_op_index()
+    index.remove(module)
+    assert get_ir_listeners(module) == []
+    module.body.blocks[0].add_op(Constant.from_int_constant(0, i32))
+    assert len(index) == 0
+    assert len(module.get_op_index()) == 1
+
+
+class BinaryOp(Operation):
+    """A base class of operation definitions."""
+
+
+@irdl_op_definition
+class AddOp(BinaryOp):
+    name = "test.add"
+    lhs = OperandDef(i32)
+    rhs = OperandDef(i32)
+    res = ResultDef(i32)
+
+
+@irdl_op_definition
+class SubOp(BinaryOp):
+    name = "test.sub"
+    lhs = OperandDef(i32)
+    rhs = OperandDef(i32)
+    res = ResultDef(i32)
+
+
+def test_op_index_subclasses():
+    """Test that the operations of the subclasses of a type are listed."""
+    cst = Constant.from_int_constant(0, i32)
+    add = AddOp.build(operands=[cst, cst], result_types=[i32])
+    sub = SubOp.build(operands=[add, cst], result_types=[i32])
+    module = ModuleOp.from_region_or_ops([cst, add, sub])
+
+    assert module.get_ops(BinaryOp) == [add, sub]
+    assert module.get_ops(AddOp) == [add]
+    assert module.get_ops(Operation) == [cst, add, sub]
@@ -0,0 +1,149 @@
+from io import StringIO
+
+import pytest
+
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import (Builtin, IntAttr, IntegerAttr, StringAttr,
+                                   i32, i64)
+from xdsl.ir import MLContext
+from xdsl.lexer import Lexer, TokenKind
+from xdsl.parser import Parser, map_file
+from xdsl.printer import Printer
+
+
+def get_context() -> MLContext:
+    ctx = MLContext()
+    Builtin(ctx)
+    Arith(ctx)
+    return ctx
+
+
+def test_lexer_tokens():
+    """Test that the lexer splits an operation into tokens."""
+    text = '''%0 : !i32 = arith.constant() ["value" = -1 : !i32] // comment
+    cf.br() (^bb0)'''
+    tokens = [(token.kind, token.text) for token in Lexer(text)]
+    assert tokens == [
+        (TokenKind.PERCENT_IDENT, "%0"),
+        (TokenKind.PUNCTUATION, ":"),
+        (TokenKind.EXCLAMATION_IDENT, "!i32"),
+        (TokenKind.PUNCTUATION, "="),
+        (TokenKind.BARE_IDENT, "arith.constant"),
+        (TokenKind.PUNCTUATION, "("),
+        (TokenKind.PUNCTUATION, ")"),
+        (TokenKind.PUNCTUATION, "["),
+        (TokenKind.STRING, '"value"'),
+        (TokenKind.PUNCTUATION, "="),
+        (TokenKind.INTEGER, "-1"),
+        (TokenKind.PUNCTUATION, ":"),
+        (TokenKind.EXCLAMATION_IDENT, "!i32"),
+        (TokenKind.PUNCTUATION, "]"),
+        (TokenKind.BARE_IDENT, "cf.br"),
+        (TokenKind.PUNCTUATION, "("),
+        (TokenKind.PUNCTUATION, ")"),
+        (TokenKind.PUNCTUATION, "("),
+        (TokenKind.CARET_IDENT, "^bb0"),
+        (TokenKind.PUNCTUATION, ")"),
+    ]
+
+
+def test_parse_attributes():
+    """Test the parsing of the attribute shorthands."""
+    ctx = get_context()
+    assert Parser(ctx,
+                  '"a\\"b"').parse_attribute() == StringAttr.from_str('a\\"b')
+    assert Parser(ctx, "!i32").parse_attribute() == i32
+    assert Parser(ctx,
+                  "3").parse_attribute() == IntegerAttr.from_params(3, i64)
+    assert Parser(ctx, "-3 : !i32").parse_attribute() == \
+        IntegerAttr.from_params(-3, i32)
+    assert Parser(ctx, "!int<4>").parse_attribute() == IntAttr.from_int(4)
+
+    with pytest.raises(Exception, match="Unrecognized escaped character"):
+        Parser(ctx, '"\\q"').parse_attribute()
+    with pytest.raises(Exception, match="Unexpected end of file"):
+        Parser(ctx, '"abc').parse_attribute()
+
+
+def test_parse_string():
+    """Test that characters spanning several tokens are parsed."""
+    ctx = get_context()
+    for input in ['  ->!i32', b'  ->!i32']:
+        parser = Parser(ctx, input)
+        assert parser.parse_string("->!")
+        assert parser.parse_ident() == "i32"
+
+    with pytest.raises(Exception, match="'->' expected"):
+        Parser(ctx, "-<").parse_string("->")
+    with pytest.raises(Exception, match="'->' expected"):
+        Parser(ctx, "-").parse_string("->")
+
+
+def test_parse_print_round_trip():
+    """Test that a parsed module prints back to the same text."""
+    text = \
+"""module() {
+  %0 : !i32 = arith.constant() ["value" = 1 : !i32]
+  %1 : !i32 = arith.addi(%0 : !i32, %0 : !i32)
+}"""
+    module = Parser(get_context(), text).parse_op()
+
+    stream = StringIO()
+    printer = Printer(stream=stream)
+    printer.print_op(module)
+    assert stream.getvalue().strip() == text
+
+
+def test_lexer_binary_input():
+    """Test that a binary input is split into the same tokens as a string."""
+    text = '%0 = "é→" é.x // é→\n^bb0 !int<4>'
+    tokens = [(token.kind, token.text) for token in Lexer(text.encode())]
+    assert tokens == [
+        (TokenKind.PERCENT_IDENT, "%0"),
+        (TokenKind.PUNCTUATION, "="),
+        (TokenKind.STRING, '"é→"'),
+        (TokenKind.BARE_IDENT, "é.x"),
+        (TokenKind.CARET_IDENT, "^bb0"),
+        (TokenKind.EXCLAMATION_IDENT, "!int"),
+        (TokenKind.PUNCTUATION, "<"),
+        (TokenKind.INTEGER, "4"),
+        (TokenKind.PUNCTUATION, ">"),
+    ]
+
+
+def test_parse_file(tmp_path):
+    """Test that a module is parsed from a file path or a binary buffer."""
+    text = \
+"""module() {
+  %0 : !i32 = arith.constant() ["value" = 1 : !i32, "name" = "é"]
+  %1 : !i32 = arith.addi(%0 : !i32, %0 : !i32)
+}"""
+    path = tmp_path / "module.xdsl"
+    path.write_text(text, encoding="utf-8")
+
+    for input in [path, text.encode(), bytearray(text.encode())]:
+        module = Parser(get_context(), input).parse_op()
+        stream = StringIO()
+        Printer(stream=stream).print_op(module)
+        assert stream.getvalue().strip() == text
+    assert Parser(get_context(), b"!int<4>").parse_attribute() == \
+        IntAttr.from_int(4)
+
+
+def test_map_file(tmp_path):
+    """Test that a file is mapped or read from its current position."""
+    path = tmp_path / "module.xdsl"
+    path.write_text("module() {}\n!int<4>", encoding="utf-8")
+
+    with open(path, "rb") as f:
+        assert bytes(map_file(f)) == b"module() {}\n!int<4>"
+    with open(path, "rb") as f:
+        f.readline()
+        assert map_file(f) == b"!int<4>"
+    with open(path, "r") as f:
+        f.readline()
+        contents = map_file(f)
+        assert contents == "!int<4>"
+        assert Parser(get_context(), contents).parse_attribute() == \
+            IntAttr.from_int(4)
+    assert map_file(StringIO("!int<4>")) == "!int<4>"
@@ -0,0 +1,64 @@
+import json
+from io import StringIO
+
+from xdsl.dialects.arith import Constant
+from xdsl.dialects.builtin import ModuleOp, i32
+from xdsl.dialects.func import FuncOp
+from xdsl.ir import MLContext, Operation
+from xdsl.pass_manager import PassManager
+
+
+def get_module() -> ModuleOp:
+    return ModuleOp.from_region_or_ops([
+        FuncOp.from_region("f0", [], [], []),
+        FuncOp.from_region("f1", [], [], []),
+        Constant.from_int_constant(0, i32)
+    ])
+
+
+def test_pass_manager_run():
+    """Test that passes are applied in order, and on the nested operations."""
+    applied = []
+
+    def module_pass(ctx: MLContext, op: Operation):
+        applied.append(("module", op.name))
+
+    def func_pass(ctx: MLContext, op: Operation):
+        applied.append(("func", op.sym_name.data))
+
+    pass_manager = PassManager(MLContext())
+    pass_manager.add_pass("module-pass", module_pass)
+    pass_manager.add_pass("func-pass", func_pass, nested_op_type=FuncOp)
+    pass_manager.run(get_module())
+
+    assert applied == [("module", "module"), ("func", "f0"), ("func", "f1")]
+    assert pass_manager.timings == []
+
+
+def test_pass_manager_timings():
+    """Test that the time and memory of passes and verifications are recorded."""
+
+    def allocating_pass(ctx: MLContext, op: Operation):
+        op.attributes["data"] = [0] * 100000
+        del op.attributes["data"]
+
+    pass_manager = PassManager(MLContext(), time_passes=True)
+    pass_manager.add_pass("allocating-pass", allocating_pass)
+    pass_manager.run(get_module())
+
+    assert [timing.name for timing in pass_manager.timings
+            ] == ["verify", "allocating-pass", "verify after allocating-pass"]
+    assert pass_manager.timings[1].peak_memory >= 100000 * 8
+    assert all(timing.wall_time >= 0 and timing.cpu_time >= 0
+               for timing in pass_manager.timings)
+
+    table = StringIO()
+    pass_manager.print_timings(table)
+    assert "allocating-pass" in table.getvalue()
+    assert "Total" in table.getvalue()
+
+    report = StringIO()
+    pass_manager.print_timings(report, "json")
+    report = json.loads(report.getvalue())
+    assert [timing["name"] for timing in report["passes"]
+            ] == ["verify", "allocating-pass", "verify after allocating-pass"]
@@ -1,7 +1,7 @@
-from xdsl.dialects.scf import Scf, If
+from xdsl.dialects.scf import Scf, If, Yield
 
 from xdsl.printer import Printer
-from xdsl.dialects.builtin import Builtin, IntegerAttr, i32, i64
+from xdsl.dialects.builtin import Builtin, IntegerAttr, IntegerType, i32, i64
 from xdsl.parser import Parser
 from xdsl.dialects.arith import Arith, Constant, Addi, Muli
 from xdsl.ir import MLContext
@@ -797,3 +797,205 @@ def test_move_region_contents_to_new_regions():
         prog, expected,
         PatternRewriteWalker(AnonymousRewritePattern(match_and_rewrite),
                              apply_recursively=False))
+
+
+def test_worklist_driver_fixpoint():
+    """
+    Test that the worklist driver rewrites the operations affected by a
+    rewrite until no pattern applies anymore.
+    """
+
+    prog = \
+"""module() {
+  %0 : !i32 = arith.constant() ["value" = 1 : !i32]
+  %1 : !i32 = arith.constant() ["value" = 2 : !i32]
+  %2 : !i32 = arith.addi(%0 : !i32, %1 : !i32)
+  %3 : !i32 = arith.addi(%2 : !i32, %0 : !i32)
+  %4 : !i32 = arith.muli(%3 : !i32, %3 : !i32)
+}"""
+
+    expected = \
+"""module() {
+  %0 : !i32 = arith.constant() ["value" = 4 : !i32]
+  %1 : !i32 = arith.muli(%0 : !i32, %0 : !i32)
+}"""
+
+    @op_type_rewrite_pattern
+    def fold_addi(op: Addi, rewriter: PatternRewriter):
+        lhs, rhs = op.input1, op.input2
+        if not isinstance(lhs, OpResult) or not isinstance(rhs, OpResult):
+            return
+        if not isinstance(lhs.op, Constant) or not isinstance(
+                rhs.op, Constant):
+            return
+        value = lhs.op.value.parameters[0].data + rhs.op.value.parameters[
+            0].data
+        rewriter.replace_matched_op(Constant.from_int_constant(value, i32))
+
+    @op_type_rewrite_pattern
+    def erase_unused_constant(op: Constant, rewriter: PatternRewriter):
+        if len(op.output.uses) == 0:
+            rewriter.erase_matched_op()
+
+    driver = PatternRewriteWorklistDriver(
+        GreedyRewritePatternApplier([
+            AnonymousRewritePattern(fold_addi),
+            AnonymousRewritePattern(erase_unused_constant)
+        ]))
+    rewrite_and_compare(prog, expected, driver)
+
+
+def test_worklist_driver_in_place_rewrite():
+    """
+    Test that the users of an operation modified in place are rewritten
+    again in the same run.
+    """
+    cst = Constant.from_int_constant(1, i32)
+    cst.attributes["opaque"] = IntegerAttr.from_params(0, i32)
+    add = Addi.get(cst, cst)
+    # The user is placed first, so it is rewritten before the constant
+    module = ModuleOp.from_region_or_ops([add, cst])
+    matched_addis: List[Addi] = []
+
+    @op_type_rewrite_pattern
+    def fold_addi(op: Addi, rewriter: PatternRewriter):
+        matched_addis.append(op)
+        lhs = op.input1
+        if not isinstance(lhs, OpResult) or "opaque" in lhs.op.attributes:
+            return
+        value = lhs.op.value.parameters[0].data
+        rewriter.replace_matched_op(Constant.from_int_constant(2 * value, i32))
+
+    @op_type_rewrite_pattern
+    def reveal_constant(op: Constant, rewriter: PatternRewriter):
+        if "opaque" in op.attributes:
+            del op.attributes["opaque"]
+            rewriter.notify_op_modified(op)
+
+    driver = PatternRewriteWorklistDriver(
+        GreedyRewritePatternApplier([
+            AnonymousRewritePattern(fold_addi),
+            AnonymousRewritePattern(reveal_constant)
+        ]))
+    assert driver.rewrite_module(module)
+    assert matched_addis == [add, add]
+    folded, original = module.ops
+    assert isinstance(folded, Constant)
+    assert folded.value == IntegerAttr.from_params(2, i32)
+    assert original is cst
+
+
+def test_worklist_driver_nested_replacement():
+    """
+    Test that the nested operations of a replacing operation are rewritten
+    in the same run.
+    """
+    cond = Constant.from_int_constant(1, IntegerType.from_width(1))
+    cst = Constant.from_int_constant(7, i32)
+    cst.attributes["wrap"] = IntegerAttr.from_params(0, i32)
+    module = ModuleOp.from_region_or_ops([cond, cst])
+
+    @op_type_rewrite_pattern
+    def wrap_constant(op: Constant, rewriter: PatternRewriter):
+        if "wrap" not in op.attributes:
+            return
+        nested = Constant.from_int_constant(op.value.parameters[0].data, i32)
+        nested.attributes["increment"] = IntegerAttr.from_params(0, i32)
+        # The constant has no uses, so its result is not replaced
+        rewriter.replace_matched_op(
+            If.get(cond, [], [nested, Yield.get()], [Yield.get()]), [None])
+
+    @op_type_rewrite_pattern
+    def increment_constant(op: Constant, rewriter: PatternRewriter):
+        if "increment" not in op.attributes:
+            return
+        value = op.value.parameters[0].data
+        rewriter.replace_matched_op(Constant.from_int_constant(value + 1, i32))
+
+    driver = PatternRewriteWorklistDriver(
+        GreedyRewritePatternApplier([
+            AnonymousRewritePattern(wrap_constant),
+            AnonymousRewritePattern(increment_constant)
+        ]))
+    assert driver.rewrite_module(module)
+    _, if_op = module.ops
+    assert isinstance(if_op, If)
+    nested, _ = if_op.true_region.blocks[0].ops
+    assert isinstance(nested, Constant)
+    assert nested.value == IntegerAttr.from_params(8, i32)
+    assert "increment" not in nested.attributes
+
+
+def test_worklist_driver_max_iterations():
+    """Test that the worklist driver stops after the maximal number of rewrites."""
+
+    ctx = MLContext()
+    builtin = Builtin(ctx)
+    arith = Arith(ctx)
+
+    prog = \
+"""module() {
+  %0 : !i32 = arith.constant() ["value" = 42 : !i32]
+}"""
+
+    @op_type_rewrite_pattern
+    def increment_constant(op: Constant, rewriter: PatternRewriter):
+        value = op.value.parameters[0].data
+        rewriter.replace_matched_op(Constant.from_int_constant(value + 1, i32))
+
+    module = Parser(ctx, prog).parse_op()
+    driver = PatternRewriteWorklistDriver(
+        AnonymousRewritePattern(increment_constant), max_iterations=3)
+    assert not driver.rewrite_module(module)
+    assert module.ops[0].value == IntegerAttr.from_params(45, i32)
+
+
+def test_greedy_rewrite_pattern_applier_dispatch():
+    """
+    Test that GreedyRewritePatternApplier only calls the patterns that can
+    match on the operation type.
+    """
+    called: List[Tuple[str, str]] = []
+
+    @op_type_rewrite_pattern
+    def constant_pattern(op: Constant, rewriter: PatternRewriter):
+        called.append(("constant", op.name))
+
+    @op_type_rewrite_pattern
+    def addi_pattern(op: Addi, rewriter: PatternRewriter):
+        called.append(("addi", op.name))
+
+    class GenericPattern(RewritePattern):
+
+        def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
+            called.append(("generic", op.name))
+
+    class DeclaredPattern(RewritePattern):
+
+        def root_operations(self):
+            return (Muli, )
+
+        def match_and_rewrite(self, op: Operation, rewriter: PatternRewriter):
+            called.append(("declared", op.name))
+
+    applier = GreedyRewritePatternApplier([
+        AnonymousRewritePattern(constant_pattern),
+        GenericPattern(),
+        AnonymousRewritePattern(addi_pattern),
+        DeclaredPattern()
+    ])
+    assert applier.root_operations() is None
+    assert GreedyRewritePatternApplier(
+        [AnonymousRewritePattern(addi_pattern),
+         DeclaredPattern()]).root_operations() == (Addi, Muli)
+
+    cst = Constant.from_int_constant(1, i32)
+    add = Addi.get(cst, cst)
+    mul = Muli.get(cst, cst)
+    for op in [cst, add, mul]:
+        applier.match_and_rewrite(op, PatternRewriter(op))
+
+    assert called == [("constant", "arith.constant"),
+                      ("generic", "arith.constant"), ("generic", "arith.addi"),
+                      ("addi", "arith.addi"), ("generic", "arith.muli"),
+                      ("declared", "arith.muli")]
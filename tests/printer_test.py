@@ -1,8 +1,10 @@
 from io import StringIO
 
+import pytest
+
 from xdsl.printer import Printer
 from xdsl.parser import Parser
-from xdsl.dialects.builtin import Builtin
+from xdsl.dialects.builtin import ArrayAttr, Builtin, ModuleOp, i32, i64
 from xdsl.dialects.arith import *
 from xdsl.diagnostic import Diagnostic
 
@@ -264,3 +266,53 @@ module() {
     printer = Printer(stream=file)
     printer.print_op(module)
     assert file.getvalue().strip() == expected.strip()
+
+
+def test_print_buffered():
+    """
+    Test that the text printed while printing an operation is buffered, and
+    that line and column positions are still tracked.
+    """
+    file = StringIO("")
+    printer = Printer(stream=file)
+    with printer._buffered():
+        printer.print_string("module")
+        printer.print_string("() {\n  ")
+        assert file.getvalue() == ""
+        assert printer._current_line == 1
+        assert printer._current_column == 2
+        printer.print_string("}")
+    assert file.getvalue() == "module() {\n  }"
+    assert printer._current_column == 3
+
+
+def test_print_unbuffered():
+    """Test that the public print functions write to the stream directly."""
+    file = StringIO("")
+    printer = Printer(stream=file)
+    printer.print_attribute(i64)
+    assert file.getvalue() == "!i64"
+    printer.print_string(" ")
+    printer.print_attribute(ArrayAttr.from_list([i32, i64]))
+    assert file.getvalue() == "!i64 [!i32, !i64]"
+
+
+def test_print_forward_reference():
+    """
+    Test that values used before their definition are only named when
+    printing dominance errors.
+    """
+    cst = Constant.from_int_constant(0, i32)
+    add = Addi.get(cst, cst)
+    module = ModuleOp.from_region_or_ops([add, cst])
+
+    with pytest.raises(KeyError):
+        Printer(stream=StringIO()).print_op(module)
+
+    file = StringIO()
+    Printer(stream=file, name_forward_references=True).print_op(module)
+    assert file.getvalue() == """module() {
+  %0 : !i32 = arith.addi(%1 : !i32, %1 : !i32)
+  %1 : !i32 = arith.constant() ["value" = 0 : !i32]
+}
+"""
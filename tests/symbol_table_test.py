@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+from xdsl.dialects.builtin import DenseIntOrFPElementsAttr, ModuleOp, i32
+from xdsl.dialects.func import Call, FuncOp, Return
+from xdsl.dialects.memref import GetGlobal, Global, MemRefType
+from xdsl.symbol_table import SymbolTable
+
+
+def get_func(name: str, callee: str) -> FuncOp:
+    return FuncOp.from_callable(
+        name, [], [], lambda: [Call.get(callee, [[]], [[]]),
+                               Return.get()])
+
+
+def test_symbol_table_lookup():
+    """Test the lookup of symbols and of the operations referencing them."""
+    typ = MemRefType.from_type_and_list(i32, [4])
+    glob = Global.get("glob", typ,
+                      DenseIntOrFPElementsAttr.tensor_from_list([0], i32))
+    get_glob = GetGlobal.get("glob", typ)
+    f = get_func("f", "g")
+    g = get_func("g", "f")
+    module = ModuleOp.from_region_or_ops([glob, f, g, get_glob])
+    table = SymbolTable.get(module)
+
+    assert table.lookup("f") is f
+    assert table.lookup("g") is g
+    assert "h" not in table
+    assert len(table) == 3
+    assert table.get_users("f") == [g.body.blocks[0].ops[0]]
+    assert table.lookup("glob") is glob
+    assert table.get_users("g") == [f.body.blocks[0].ops[0]]
+    assert table.get_users("glob") == [get_glob]
+    assert SymbolTable.get(module) is table
+
+
+def test_symbol_table_updates():
+    """Test that the table is updated when symbols are added and removed."""
+    f = get_func("f", "g")
+    module = ModuleOp.from_region_or_ops([f])
+    table = SymbolTable.get(module)
+    assert table.lookup("g") is None
+
+    g = get_func("g", "f")
+    table.insert(g)
+    assert table.lookup("g") is g
+    assert table.get_users("f") == [g.body.blocks[0].ops[0]]
+    with pytest.raises(Exception):
+        table.insert(get_func("g", "f"))
+
+    call = Call.get("g", [[]], [[]])
+    f.body.blocks[0].insert_op(call, 0)
+    assert table.get_users("g") == [f.body.blocks[0].ops[1], call]
+
+    table.erase("g")
+    assert table.lookup("g") is None
+    assert table.get_users("f") == []
+
+    module.body.blocks[0].erase_op(f)
+    assert len(table) == 0
+    assert table.get_users("g") == []
+
+
+def test_symbol_table_rename():
+    """Test that renaming a symbol updates the operations referencing it."""
+    f = get_func("f", "g")
+    g = get_func("g", "g")
+    module = ModuleOp.from_region_or_ops([f, g])
+    table = SymbolTable.get(module)
+
+    table.rename("g", "h")
+    assert table.lookup("h") is g
+    assert table.lookup("g") is None
+    assert g.sym_name.data == "h"
+    calls = [f.body.blocks[0].ops[0], g.body.blocks[0].ops[0]]
+    assert table.get_users("h") == calls
+    assert all(call.callee.data.data == "h" for call in calls)
+    module.verify()
+
+    with pytest.raises(Exception):
+        table.rename("h", "f")
+
+
+def test_symbol_table_duplicates():
+    """Test that a duplicate definition replaces the erased definition."""
+    f0 = get_func("f", "g")
+    f1 = get_func("f", "h")
+    f2 = get_func("f", "i")
+    module = ModuleOp.from_region_or_ops([f0, f1, f2])
+    table = SymbolTable.get(module)
+    assert table.lookup("f") is f0
+    assert len(table) == 1
+
+    with pytest.raises(Exception, match="Symbol 'f' is already defined"):
+        table.insert(get_func("f", "g"))
+
+    module.body.blocks[0].detach_op(f1)
+    table.erase("f")
+    assert table.lookup("f") is f2
+
+    table.rename("f", "j")
+    assert table.lookup("j") is f2
+    assert "f" not in table
+    table.erase("j")
+    assert len(table) == 0
@@ -2,6 +2,7 @@ from xdsl.dialects.builtin import *
 from xdsl.parser import Parser
 from xdsl.printer import Printer
 from xdsl.dialects.arith import *
+from xdsl.rewriter import Rewriter
 
 test_prog = """
 module() {
@@ -27,3 +28,98 @@ def test_main():
     assert andi_op.results[0].uses == set()
 
     print("Done")
+
+
+def test_use_list():
+    """Test that the uses of a value are linked to the operands using it."""
+    a = Constant.from_int_constant(0, i32)
+    b = Constant.from_int_constant(1, i32)
+    add = Addi.get(a, b)
+    a_uses = a.results[0].uses
+    assert a_uses == {Use(add, 0)}
+    assert Use(add, 0) in a_uses
+    assert Use(add, 1) not in a_uses
+    assert len(b.results[0].uses) == 1
+
+    # The uses of the operands are kept when the operands change
+    use0, use1 = add._operand_uses
+    add.operands = [b.results[0], b.results[0]]
+    assert add._operand_uses == [use0, use1]
+    assert add._operand_uses[0] is use0
+    assert not a_uses
+    assert b.results[0].uses == {Use(add, 0), Use(add, 1)}
+
+    add.operands = [a.results[0]]
+    assert a_uses == {Use(add, 0)}
+    assert b.results[0].uses == set()
+
+    # Uses can be removed while iterating
+    other = Addi.get(a, a)
+    for use in a_uses:
+        a.results[0].remove_use(use)
+    assert len(a_uses) == 0
+    assert a_uses.copy() == set()
+    assert other.operands[0] is a.results[0]
+
+    # Removed uses are linked again when the operands are set
+    other.operands = other.operands
+    assert a_uses == {Use(other, 0), Use(other, 1)}
+
+
+def test_replace_operand():
+    """Test that replacing an operand only relinks the use of the operand."""
+    a = Constant.from_int_constant(0, i32)
+    b = Constant.from_int_constant(1, i32)
+    add = Addi.get(a, a)
+    use0, use1 = add._operand_uses
+    operands = add.operands
+
+    add.replace_operand(1, b.results[0])
+    assert add._operand_uses[1] is use1
+    assert add.operands == [a.results[0], b.results[0]]
+    assert operands == [a.results[0], a.results[0]]
+    assert a.results[0].uses == {Use(add, 0)}
+    assert b.results[0].uses == {Use(add, 1)}
+    assert add.input2 is b.results[0]
+
+
+def test_replace_all_uses_with():
+    """Test that all the uses of a value are moved to another value."""
+    a = Constant.from_int_constant(0, i32)
+    b = Constant.from_int_constant(1, i32)
+    add0 = Addi.get(a, a)
+    add1 = Addi.get(b, a)
+
+    a.results[0].replace_all_uses_with(b.results[0])
+    assert not a.results[0].uses
+    assert len(b.results[0].uses) == 4
+    assert b.results[0].uses == {
+        Use(add0, 0), Use(add0, 1),
+        Use(add1, 0), Use(add1, 1)
+    }
+    assert add0.operands == [b.results[0], b.results[0]]
+    assert add1.input1 is b.results[0] and add1.input2 is b.results[0]
+
+    # The spliced uses can still be removed individually
+    add1.replace_operand(0, a.results[0])
+    assert a.results[0].uses == {Use(add1, 0)}
+    assert len(b.results[0].uses) == 3
+
+
+def test_unsafe_erase():
+    """Test that the uses of an erased operation are replaced by erased values."""
+    a = Constant.from_int_constant(0, i32)
+    b = Constant.from_int_constant(1, i32)
+    add = Addi.get(a, b)
+    block = Block.from_ops([a, b, add])
+
+    block.erase_op(a, safe_erase=False)
+    erased = add.operands[0]
+    assert isinstance(erased, ErasedSSAValue)
+    assert erased.old_value is a.results[0]
+    assert erased.uses == {Use(add, 0)}
+    assert not a.results[0].uses
+
+    Rewriter.erase_op(b, safe_erase=False)
+    assert isinstance(add.operands[1], ErasedSSAValue)
+    assert list(block.ops) == [add]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import pytest
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import IntegerType, ModuleOp, StringAttr, i32, i64
+from xdsl.ir import Operation
+from xdsl.irdl import (AttributeDef, ResultDef, VarOperandDef,
+                       irdl_op_definition)
+from xdsl.parallel_verifier import verify_parallel
+from xdsl.rewriter import Rewriter
+
+verified_ops = []
+
+
+@irdl_op_definition
+class CountingOp(Operation):
+    name: str = "test.counting"
+    args = VarOperandDef(IntegerType)
+    res = ResultDef(IntegerType)
+    attr = AttributeDef(IntegerType)
+
+    def verify_(self) -> None:
+        verified_ops.append(self)
+
+
+def get_counting_op(*args: Operation) -> CountingOp:
+    return CountingOp.create(operands=[arg.results[0] for arg in args],
+                             result_types=[i32],
+                             attributes={"attr": i32})
+
+
+def test_verify_incremental_only_verifies_dirty_ops():
+    """Test that only the modified operations and their neighbours are verified."""
+    a = get_counting_op()
+    b = get_counting_op(a)
+    c = get_counting_op(b)
+    d = get_counting_op()
+    module = ModuleOp.from_region_or_ops([a, b, c, d])
+
+    verified_ops.clear()
+    module.verify_incremental()
+    assert set(verified_ops) == {a, b, c, d}
+
+    verified_ops.clear()
+    module.verify_incremental()
+    assert verified_ops == []
+
+    # The new operation, and the users of its result are verified again
+    Rewriter.replace_op(b, get_counting_op(a))
+    verified_ops.clear()
+    module.verify_incremental()
+    new_b = module.ops[1]
+    assert set(verified_ops) == {new_b, c}
+
+    # A full verification verifies everything
+    verified_ops.clear()
+    module.verify()
+    assert set(verified_ops) == {a, new_b, c, d}
+
+
+def test_verify_incremental_nested():
+    """Test that modified operations nested in regions are verified."""
+    cst = Constant.from_int_constant(0, i32)
+    inner = ModuleOp.from_region_or_ops([cst])
+    module = ModuleOp.from_region_or_ops([inner])
+    module.verify()
+
+    bad_cst = Constant.from_int_constant(0, i64)
+    inner.body.blocks[0].add_op(bad_cst)
+    inner.body.blocks[0].add_op(Addi.get(cst, bad_cst))
+    with pytest.raises(Exception):
+        module.verify_incremental()
+    # Failures are reported again until the module is fixed
+    with pytest.raises(Exception):
+        module.verify_incremental()
+
+
+def test_verify_incremental_mark_dirty():
+    """Test that in place modifications are verified after mark_dirty."""
+    op = get_counting_op()
+    module = ModuleOp.from_region_or_ops([op])
+    module.verify()
+
+    op.attributes["attr"] = StringAttr("attr")
+    module.verify_incremental()
+    op.mark_dirty()
+    with pytest.raises(Exception):
+        module.verify_incremental()
+
+
+@pytest.mark.parametrize("use_threads", [False, True])
+def test_verify_parallel_reports_all_failures(use_threads: bool):
+    """Test that parallel verification reports every failing operation."""
+    cst = Constant.from_int_constant(0, i32)
+    bad_cst = Constant.from_int_constant(0, i64)
+    ops = [cst, bad_cst]
+    for _ in range(10):
+        ops.append(Addi.get(cst, cst))
+    ops.append(Addi.get(cst, bad_cst))
+    ops.append(Addi.get(bad_cst, cst))
+    module = ModuleOp.from_region_or_ops(ops)
+
+    with pytest.raises(Exception) as e:
+        verify_parallel(module, num_workers=2, use_threads=use_threads)
+    assert str(e.value).startswith("2 operation(s) do not verify")
+    assert str(
+        e.value).count("expect all input and output types to be equal") == 2
+
+    module.body.blocks[0].erase_op(ops[-1])
+    module.body.blocks[0].erase_op(ops[-2])
+    verify_parallel(module, num_workers=2, use_threads=use_threads)
+
+
+@pytest.mark.parametrize("use_threads", [False, True])
+def test_verify_parallel_empty_module(use_threads: bool):
+    """Test that parallel verification accepts a module without operations."""
+    module = ModuleOp.from_region_or_ops([])
+    verify_parallel(module, num_workers=2, use_threads=use_threads)
@@ -0,0 +1,62 @@
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import ModuleOp, i32
+from xdsl.dialects.scf import If, Yield
+
+
+def get_module():
+    """Get a module with an scf.if nested in another one."""
+    cond = Constant.from_int_constant(1, 1)
+    cst = Constant.from_int_constant(0, i32)
+    inner_if = If.get(cond, [], [Addi.get(cst, cst), Yield.get()], [])
+    outer_if = If.get(cond, [], [inner_if, Yield.get()], [])
+    module = ModuleOp.from_region_or_ops([cond, cst, outer_if])
+    return module, cond, cst, outer_if, inner_if
+
+
+def test_walk_order():
+    """Test the operations order of the different walks."""
+    module, cond, cst, outer_if, inner_if = get_module()
+    addi = inner_if.true_region.ops[0]
+    inner_yield, outer_yield = inner_if.true_region.ops[
+        1], outer_if.true_region.ops[1]
+
+    assert list(module.walk()) == [
+        module, cond, cst, outer_if, inner_if, addi, inner_yield, outer_yield
+    ]
+    assert list(module.walk(post_order=True)) == [
+        cond, cst, addi, inner_yield, inner_if, outer_yield, outer_if, module
+    ]
+    assert list(module.walk(reverse=True)) == [
+        module, outer_if, outer_yield, inner_if, inner_yield, addi, cst, cond
+    ]
+    assert list(module.body.walk(If)) == [outer_if, inner_if]
+    assert list(module.body.blocks[0].walk(
+        (Addi, Yield), post_order=True)) == [addi, inner_yield, outer_yield]
+
+    # The legacy callback walk
+    walked = []
+    module.walk(walked.append)
+    assert walked == list(module.walk())
+
+
+def test_walk_skip_children():
+    """Test that the children of an operation can be skipped."""
+    module, cond, cst, outer_if, inner_if = get_module()
+    walker = module.walk()
+    walked = []
+    for op in walker:
+        walked.append(op)
+        if op is inner_if:
+            walker.skip_children()
+    assert walked == [
+        module, cond, cst, outer_if, inner_if, outer_if.true_region.ops[1]
+    ]
+
+
+def test_walk_deep_nesting():
+    """Test that deeply nested operations do not reach the recursion limit."""
+    op = ModuleOp.from_region_or_ops([])
+    for _ in range(5000):
+        op = ModuleOp.from_region_or_ops([op])
+    assert len(list(op.walk(post_order=True))) == 5001
+    assert sum(1 for _ in op.walk(ModuleOp)) == 5001
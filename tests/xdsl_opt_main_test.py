@@ -0,0 +1,97 @@
+import json
+import multiprocessing
+import os
+import warnings
+
+import pytest
+
+from xdsl.xdsl_opt_main import xDSLOptMain
+
+module_str = """module() {
+  %0 : !i32 = arith.constant() ["value" = 42 : !i32]
+}"""
+
+
+def test_batch_mode(tmp_path, capsys):
+    """
+    Test that batch mode writes one output per input file, and reports the
+    failures without stopping.
+    """
+    input_files = [str(tmp_path / f"in{i}.xdsl") for i in range(3)]
+    for input_file in input_files:
+        with open(input_file, "w") as f:
+            f.write(module_str)
+    bad_file = str(tmp_path / "bad.xdsl")
+    with open(bad_file, "w") as f:
+        f.write("module() { unknown.op() }")
+    manifest = str(tmp_path / "manifest.txt")
+    with open(manifest, "w") as f:
+        f.write("\n".join(input_files[1:]) + "\n")
+
+    output_dir = str(tmp_path / "out")
+    xdsl_main = xDSLOptMain(args=[
+        "--batch", input_files[0], bad_file, "--batch-manifest", manifest,
+        "--output-dir", output_dir, "-j", "2"
+    ])
+    assert xdsl_main.is_batch_mode()
+    assert xdsl_main.run_batch() == 1
+
+    assert sorted(
+        os.listdir(output_dir)) == ["in0.xdsl", "in1.xdsl", "in2.xdsl"]
+    for i in range(3):
+        with open(os.path.join(output_dir, f"in{i}.xdsl")) as f:
+            assert f.read().strip() == module_str
+    assert "bad.xdsl: error: " in capsys.readouterr().err
+
+
+def test_batch_mode_main_script(tmp_path, monkeypatch):
+    """
+    Test that batch mode reports an error when the workers cannot import a
+    driver class defined in the main script.
+    """
+    input_file = str(tmp_path / "in.xdsl")
+    with open(input_file, "w") as f:
+        f.write(module_str)
+
+    class OptMain(xDSLOptMain):
+        pass
+
+    OptMain.__module__ = "__main__"
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods",
+                        lambda: ["spawn"])
+    xdsl_main = OptMain(args=["--batch", input_file, "-j", "2"])
+    with pytest.raises(Exception, match="main script"):
+        xdsl_main.run_batch()
+
+
+def test_time_passes(tmp_path, capsys):
+    """Test that the input file is not taken as the format of the report."""
+    input_file = str(tmp_path / "in.xdsl")
+    with open(input_file, "w") as f:
+        f.write(module_str)
+
+    xdsl_main = xDSLOptMain(args=["--time-passes", input_file])
+    assert xdsl_main.args.time_passes
+    assert xdsl_main.args.input_file == input_file
+    xdsl_main.apply_passes(xdsl_main.parse_input())
+    assert "verify" in capsys.readouterr().err
+
+    xdsl_main = xDSLOptMain(
+        args=[input_file, "--time-passes", "--time-passes-format", "json"])
+    xdsl_main.apply_passes(xdsl_main.parse_input())
+    json.loads(capsys.readouterr().err)
+
+
+def test_parse_input_closes_file(tmp_path):
+    """Test that the input file is closed once it is parsed."""
+    input_file = str(tmp_path / "in.xdsl")
+    with open(input_file, "w") as f:
+        f.write(module_str)
+
+    xdsl_main = xDSLOptMain(args=[input_file])
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        module = xdsl_main.parse_input()
+    assert len(module.ops) == 1
+    assert not any(
+        issubclass(warning.category, ResourceWarning) for warning in caught)